@@ -0,0 +1 @@
+"""Framework microbenchmarks (run with `python -m benchmarks.run`)"""
@@ -0,0 +1,221 @@
+"""Microbenchmarks for the framework's hot paths.
+
+Every benchmark uses FakeLLM, so the numbers measure only the framework's
+own overhead: no network, no model latency.
+"""
+
+import asyncio
+import json
+import statistics
+import time
+from typing import Callable, Dict
+
+from src.core.action import Action, ActionRegistry
+from src.core.agent import Agent
+from src.core.agent_registry import AgentRegistry
+from src.core.environment import Environment
+from src.core.language import AgentFunctionCallingActionLanguage, Goal
+from src.core.memory import Memory
+from src.memory.policy import TokenBudgetRetentionPolicy
+from src.memory.tokens import TokenCounter, approximate_tokens
+from src.testing.fake_llm import FakeLLM, tool_call
+from src.tools.agent_tools import call_agent
+from src.tools.registry import PythonActionRegistry, register_tool, tools, unregister_tool
+
+GOALS = [
+    Goal(priority=1, name="Benchmark", description="Call noop until told to stop, then terminate."),
+    Goal(priority=2, name="Terminate", description="Call terminate with the final answer."),
+]
+
+
+def measure(fn: Callable[[], object], repeat: int = 5, number: int = 1) -> Dict[str, float]:
+    """Time fn; returns per-call statistics in microseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter_ns() - start) / number / 1000)
+    return {
+        "median_us": round(statistics.median(samples), 3),
+        "min_us": round(min(samples), 3),
+        "mean_us": round(statistics.fmean(samples), 3),
+        "repeat": repeat,
+        "number": number,
+    }
+
+
+def _registry() -> ActionRegistry:
+    registry = ActionRegistry()
+    registry.register(Action(
+        name="noop", function=lambda: "ok", description="Does nothing",
+        parameters={"type": "object", "properties": {}, "required": []},
+    ))
+    registry.register(Action(
+        name="terminate", function=lambda message: message, description="Finish",
+        parameters={"type": "object", "properties": {"message": {"type": "string"}}, "required": ["message"]},
+        terminal=True,
+    ))
+    return registry
+
+
+def _agent(llm: FakeLLM, name: str = "Bench", registry: ActionRegistry = None) -> Agent:
+    return Agent(
+        goals=GOALS,
+        agent_language=AgentFunctionCallingActionLanguage(),
+        action_registry=registry or _registry(),
+        generate_response=llm,
+        environment=Environment(),
+        name=name,
+        agenerate_response=llm.agenerate,
+    )
+
+
+def bench_agent_iteration(quick: bool = False) -> Dict:
+    """Per-iteration overhead of Agent.run / Agent.arun with a zero-latency LLM"""
+    iterations = 5 if quick else 13
+    script = [tool_call("noop")] * (iterations - 1) + [tool_call("terminate", message="done")]
+    agent = _agent(FakeLLM(script))
+    repeat = 3 if quick else 20
+
+    def per_iteration(stats):
+        return {k: round(v / iterations, 3) if k.endswith("_us") else v for k, v in stats.items()}
+
+    async def arun():
+        await agent.arun("benchmark task", max_iterations=iterations)
+
+    loop = asyncio.new_event_loop()
+    try:
+        async_stats = measure(lambda: loop.run_until_complete(arun()), repeat=repeat)
+    finally:
+        loop.close()
+
+    return {
+        "iterations": iterations,
+        "run": per_iteration(measure(lambda: agent.run("benchmark task", max_iterations=iterations), repeat=repeat)),
+        "arun": per_iteration(async_stats),
+    }
+
+
+def bench_format_memory(quick: bool = False) -> Dict:
+    """Prompt formatting cost as Memory grows.
+
+    The size keys format every item (a new formatter each round, as on the
+    first iteration of a run); ``cached`` is a later iteration served from
+    Memory.formatted(); ``retention`` builds the whole prompt through a
+    TokenBudgetRetentionPolicy, as the shipped agents do.
+    """
+    language = AgentFunctionCallingActionLanguage()
+    budgeted = AgentFunctionCallingActionLanguage(retention_policy=TokenBudgetRetentionPolicy(
+        max_tokens=32000, max_items=10 ** 6, max_tool_tokens=500,
+        counter=TokenCounter(tokenizer=approximate_tokens)
+    ))
+    prefix = budgeted.compile_prefix([], [Goal(priority=1, name="Bench", description="Benchmark goal")])
+    sizes = [10, 100, 1000] if quick else [10, 100, 1000, 10000]
+    repeat = 3 if quick else 7
+    results = {"cached": {}, "retention": {}}
+    for size in sizes:
+        memory = Memory()
+        memory.add_memory({"type": "user", "content": "task"})
+        for i in range(size - 1):
+            if i % 2:
+                memory.add_memory({"type": "environment", "content": json.dumps({"tool_executed": True, "result": "x" * 200})})
+            else:
+                memory.add_memory({"type": "assistant", "content": tool_call("noop")})
+        results[str(size)] = measure(lambda: memory.formatted(lambda item: language.format_item(item)), repeat=repeat)
+        results["cached"][str(size)] = measure(lambda: language.format_memory(memory), repeat=repeat)
+        results["retention"][str(size)] = measure(
+            lambda: budgeted.construct_prompt([], None, [], memory, prefix=prefix), repeat=repeat
+        )
+    return results
+
+
+def bench_registry_construction(quick: bool = False) -> Dict:
+    """PythonActionRegistry construction with many registered tools"""
+    count = 50 if quick else 500
+    names = [f"bench_tool_{i}" for i in range(count)]
+    try:
+        for i, name in enumerate(names):
+            def tool(value: str, limit: int = 10) -> str:
+                return value
+            tool.__doc__ = f"Benchmark tool {i}."
+            register_tool(tool_name=name, tags=[f"bench_{i % 10}"])(tool)
+
+        return {
+            "registered_tools": count,
+            "one_tag": measure(lambda: PythonActionRegistry(tags=["bench_0"]), repeat=5, number=10),
+            "all_tags": measure(lambda: PythonActionRegistry(tags=[f"bench_{i}" for i in range(10)]), repeat=5, number=10),
+            "snapshot": measure(lambda: PythonActionRegistry.snapshot(tags=["bench_0"]), repeat=5, number=10),
+        }
+    finally:
+        # Leave the global registry as the other benchmarks expect it
+        for name in names:
+            if name in tools:
+                unregister_tool(name)
+
+
+def bench_execute_action(quick: bool = False) -> Dict:
+    """Environment.execute_action / aexecute_action overhead around a no-op tool"""
+    environment = Environment()
+    action = _registry().get_action("noop")
+    number = 200 if quick else 2000
+
+    async def many():
+        for _ in range(number):
+            await environment.aexecute_action(action, {})
+
+    loop = asyncio.new_event_loop()
+    try:
+        async_stats = measure(lambda: loop.run_until_complete(many()), repeat=3)
+    finally:
+        loop.close()
+    async_stats = {k: round(v / number, 3) if k.endswith("_us") else v for k, v in async_stats.items()}
+    async_stats["number"] = number
+
+    return {
+        "direct_call": measure(lambda: action.execute(), repeat=5, number=number),
+        "execute_action": measure(lambda: environment.execute_action(action, {}), repeat=5, number=number),
+        "aexecute_action": async_stats,
+    }
+
+
+def bench_call_agent_nesting(quick: bool = False) -> Dict:
+    """End-to-end cost of call_agent chains of increasing depth"""
+    depths = [1, 2, 3] if quick else [1, 2, 4, 8]
+    results = {}
+    for depth in depths:
+        agent_registry = AgentRegistry()
+        agents = []
+        for level in range(depth + 1):
+            registry = _registry()
+            if level < depth:
+                child = f"Level{level + 1}"
+                registry.register(Action(
+                    name="delegate",
+                    function=lambda action_context, child=child: call_agent(action_context, child, "sub task"),
+                    description="Delegate", parameters={"type": "object", "properties": {}},
+                    accepts_action_context=True,
+                ))
+                script = [tool_call("delegate"), tool_call("terminate", message="done")]
+            else:
+                script = [tool_call("terminate", message="done")]
+            agent = _agent(FakeLLM(script), name=f"Level{level}", registry=registry)
+            agents.append(agent)
+            if level:
+                agent_registry.register_agent(agent.name, agent.run)
+
+        root = agents[0]
+        results[str(depth)] = measure(
+            lambda: root.run("task", action_context_props={"agent_registry": agent_registry}),
+            repeat=3 if quick else 10,
+        )
+    return results
+
+
+BENCHMARKS = {
+    "agent_iteration": bench_agent_iteration,
+    "format_memory": bench_format_memory,
+    "registry_construction": bench_registry_construction,
+    "execute_action": bench_execute_action,
+    "call_agent_nesting": bench_call_agent_nesting,
+}
@@ -0,0 +1,90 @@
+"""Run the framework microbenchmarks and store machine-readable results.
+
+    python -m benchmarks.run                      # writes bench_results/<commit>.json
+    python -m benchmarks.run --quick --only format_memory
+    python -m benchmarks.run --compare bench_results/a.json bench_results/b.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from .bench_framework import BENCHMARKS
+
+RESULTS_DIR = Path(__file__).resolve().parents[1] / "bench_results"
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(names=None, quick: bool = False) -> dict:
+    """Run the selected benchmarks and return a results document"""
+    results = {}
+    for name, bench in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        print(f"running {name}...", file=sys.stderr)
+        results[name] = bench(quick=quick)
+    return {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": quick,
+        "results": results,
+    }
+
+
+def _flatten(node, prefix=""):
+    """Yield (path, median_us) pairs from a results tree"""
+    if isinstance(node, dict):
+        if "median_us" in node:
+            yield prefix, node["median_us"]
+            return
+        for key, value in node.items():
+            yield from _flatten(value, f"{prefix}.{key}" if prefix else key)
+
+
+def compare(baseline_path: str, current_path: str) -> str:
+    """Render a median-to-median comparison of two result files"""
+    baseline = dict(_flatten(json.loads(Path(baseline_path).read_text())["results"]))
+    current = dict(_flatten(json.loads(Path(current_path).read_text())["results"]))
+    lines = [f"{'benchmark':60} {'before_us':>12} {'after_us':>12} {'ratio':>8}"]
+    for key in sorted(baseline.keys() & current.keys()):
+        before, after = baseline[key], current[key]
+        ratio = after / before if before else float("inf")
+        lines.append(f"{key:60} {before:12.3f} {after:12.3f} {ratio:8.2f}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="benchmarks to run")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes and fewer repeats")
+    parser.add_argument("--output", help="result file (default: bench_results/<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), help="compare two result files")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        print(compare(*args.compare))
+        return
+
+    document = run(args.only, quick=args.quick)
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{document['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(document, indent=2))
+    print(f"wrote {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
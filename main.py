@@ -3,13 +3,22 @@ Main entry point for the multiagent system.
 Demonstrates the file management agent reading and analyzing project files.
 """
 
+import logging
+
 from src.agents.file_management.agent import create_file_management_agent
 from src.agents.retrieval_worker.agent import create_retrieval_worker_agent
 from src.agents.orchestrator.agent import create_orchestrator_agent
+from src.config.config import LOG_LEVEL, TRACE_FILE, LLM_CASSETTE, LLM_CASSETTE_MODE, LLM_CASSETTE_TOOLS
 from src.core.agent_registry import AgentRegistry
+from src.core.cassette import Cassette
+from src.core.tracing import JsonlExporter, get_tracer
 
 def main(): 
     """Run the file management agent demo"""
+    logging.basicConfig(level=LOG_LEVEL, format="%(message)s")
+    if TRACE_FILE:
+        get_tracer().add_exporter(JsonlExporter(TRACE_FILE))
+
     print("=" * 80)
     print("MULTIAGENT SYSTEM - FILE MANAGEMENT AGENT DEMO")
     print("=" * 80)
@@ -20,6 +29,12 @@ def main():
     retrieval_worker_agent = create_retrieval_worker_agent()
     orchestrator_agent = create_orchestrator_agent()
 
+    if LLM_CASSETTE:
+        # Offline, repeatable runs: LLM calls and web fetches come from the cassette
+        cassette = Cassette(LLM_CASSETTE, LLM_CASSETTE_MODE)
+        for agent in (file_management_agent, retrieval_worker_agent, orchestrator_agent):
+            cassette.attach(agent, tools=LLM_CASSETTE_TOOLS)
+
     agent_registry = AgentRegistry()
     agent_registry.register_agent(file_management_agent.name, file_management_agent.run)
     agent_registry.register_agent(retrieval_worker_agent.name, retrieval_worker_agent.run)
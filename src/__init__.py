@@ -11,7 +11,7 @@ from .core.agent import Agent
 from .core.action import Action, ActionRegistry
 from .core.memory import Memory
 from .core.environment import Environment
-from .core.language import Goal, Prompt, AgentLanguage, AgentFunctionCallingActionLanguage
+from .core.language import Goal, Prompt, PromptPrefix, AgentLanguage, AgentFunctionCallingActionLanguage
 
 __all__ = [
     "Agent",
@@ -21,6 +21,7 @@ __all__ = [
     "Environment",
     "Goal",
     "Prompt",
+    "PromptPrefix",
     "AgentLanguage",
     "AgentFunctionCallingActionLanguage",
 ]
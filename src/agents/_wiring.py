@@ -0,0 +1,52 @@
+"""Shared construction for the agent factories"""
+
+from typing import List
+
+from ..config.config import (
+    AGENT_TIMEOUT, MAX_PARALLEL_TOOLS, STREAM_RESPONSES,
+    LLM_CACHE_PATH, LLM_CACHE_TTL, LLM_CACHE_MAX_ENTRIES, LLM_SINGLE_FLIGHT, get_agent_config,
+)
+from ..core.agent import Agent
+from ..core.artifacts import default_artifact_store
+from ..core.cascade import ModelCascade
+from ..core.environment import Environment
+from ..core.language import AgentFunctionCallingActionLanguage
+from ..core.response_cache import get_response_cache
+from ..core.singleflight import get_single_flight
+from ..memory.policy import TokenBudgetRetentionPolicy
+from ..tools.registry import PythonActionRegistry
+
+
+def build_agent(name: str, agent_key: str, goals, tags: List[str], llm=None, **agent_kwargs) -> Agent:
+    """Create an agent offering the tools tagged ``tags``, with the model(s),
+    prompt budget, streaming, timeout, speculation and LLM sharing
+    configured for ``agent_key`` (``llm`` overrides the configured model)"""
+    agent_config = get_agent_config(agent_key)
+    llm = llm or ModelCascade.from_config(agent_key)
+    artifacts = default_artifact_store()
+    if artifacts:
+        # read_artifact (tag "artifacts") is only offered when results can be spilled
+        tags = list(tags) + ["artifacts"]
+    max_prompt_tokens = agent_config.get("max_prompt_tokens") or llm.max_prompt_tokens()
+    retention_policy = TokenBudgetRetentionPolicy(
+        max_prompt_tokens, max_tool_tokens=agent_config.get("max_tool_tokens"), model=llm.model
+    ) if max_prompt_tokens else None
+    agent = Agent(
+        name=name,
+        goals=goals,
+        agent_language=AgentFunctionCallingActionLanguage(retention_policy=retention_policy),
+        action_registry=PythonActionRegistry.snapshot(tags=tags),
+        environment=Environment(max_workers=MAX_PARALLEL_TOOLS, artifacts=artifacts),
+        llm=llm,
+        stream_response=llm.astream if STREAM_RESPONSES else None,
+        timeout=agent_config.get("timeout", AGENT_TIMEOUT) or None,
+        speculate=agent_config.get("speculate", False),
+        **agent_kwargs
+    )
+
+    if LLM_SINGLE_FLIGHT:
+        get_single_flight().attach(agent, **llm.settings)
+    if agent_config.get("response_cache"):
+        cache = get_response_cache(LLM_CACHE_PATH, max_entries=LLM_CACHE_MAX_ENTRIES, ttl=LLM_CACHE_TTL)
+        cache.attach(agent, **llm.settings)
+    return agent
@@ -6,6 +6,7 @@ from pathlib import Path
 
 from ...core.action import ActionContext
 
+from ...tools.cache import file_mtime
 from ...tools.registry import register_tool
 
 
@@ -14,7 +15,14 @@ PROJECT_ROOT = Path(__file__).resolve().parents[3]
 DATA_DIR = PROJECT_ROOT / "data"
 
 
-@register_tool(tags=["file_operations", "read"])
+def _txt_path(filename: str) -> Path:
+    if not filename.endswith(".txt"):
+        filename = f"{filename}.txt"
+    return DATA_DIR / filename
+
+
+@register_tool(tags=["file_operations", "read"], idempotent=True,
+               cacheable=True, invalidate=lambda filename: file_mtime(_txt_path(filename)))
 def read_txt_file(action_context: ActionContext, filename: str) -> str:
     """Reads and returns the content of a specified .txt file from the data folder.
 
@@ -28,10 +36,7 @@ def read_txt_file(action_context: ActionContext, filename: str) -> str:
         The contents of the file as a string
     """
     # Ensure filename ends with .txt
-    if not filename.endswith(".txt"):
-        filename = f"{filename}.txt"
-    
-    file_path = DATA_DIR / filename
+    file_path = _txt_path(filename)
     
     if not file_path.exists():
         raise FileNotFoundError(f"File not found: {file_path}")
@@ -40,7 +45,8 @@ def read_txt_file(action_context: ActionContext, filename: str) -> str:
         return f.read()
 
 
-@register_tool(tags=["file_operations", "list"])
+@register_tool(tags=["file_operations", "list"], idempotent=True, speculate=[{}],
+               cacheable=True, invalidate=lambda: file_mtime(DATA_DIR))
 def list_txt_files(action_context: ActionContext) -> List[str]:
     """Lists all .txt files in the data folder.
 
@@ -6,15 +6,16 @@ ORCHESTRATOR_GOALS = [
         name="Collect Retrieval Data",
         description=(
             "Call the `run_retrieval_worker_agent` tool with the user’s web-information task. "
-            "Do not proceed until you have a successful response from the RetrievalWorker agent."
+            "Do not move on to synthesis until you have a successful response from the RetrievalWorker agent."
         ),
     ),
     Goal(
         priority=2,
         name="Collect File Data",
         description=(
-            "After gathering web results, call `run_file_management_agent`  "
-            "targeted at the user's request. Continue invoking it (with clarified instructions if needed) "
+            "Call `run_file_management_agent` targeted at the user's request. The web and file lookups are "
+            "independent, so request both delegation tools in the same turn to run them in parallel. "
+            "Continue invoking it (with clarified instructions if needed) "
             "until you receive a successful response from the FileManagementAgent."
         ),
     ),
@@ -2,9 +2,8 @@
 from typing import Optional
 import json
 from ...tools.registry import register_tool
-import requests
-from bs4 import BeautifulSoup
 from ...core.action import ActionContext
+from ...config.config import WEB_FETCH_TIMEOUT
 
 
 ALLOWED_URLS = {
@@ -12,8 +11,11 @@ ALLOWED_URLS = {
 }
 
 
-@register_tool(tags=["web_operations", "fetch"])
-def fetch_from_web(action_context: ActionContext,url: Optional[str] = None) -> str:
+# Runs in the shared worker-process pool so the HTML parse does not hold the
+# GIL against other sessions; results are still cached in this process
+@register_tool(tags=["web_operations", "fetch"], idempotent=True, speculate=[{}],
+               cacheable=True, ttl=3600, execution="process")
+def fetch_from_web(url: Optional[str] = None) -> str:
     """Fetches the first two paragraphs from approved Wikipedia articles.
 
     Opens the URL and extracts the first two non-empty paragraphs. If no URL is
@@ -22,6 +24,10 @@ def fetch_from_web(action_context: ActionContext,url: Optional[str] = None) -> s
     Returns:
         The first two paragraphs concatenated as a single string.
     """
+    # Imported on first use so loading the tool does not pull in the HTTP stack
+    import requests
+    from bs4 import BeautifulSoup
+
     headers = {
         'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
                        'AppleWebKit/537.36 (KHTML, like Gecko) '
@@ -35,7 +41,7 @@ def fetch_from_web(action_context: ActionContext,url: Optional[str] = None) -> s
     elif normalized_url not in ALLOWED_URLS.values():
         raise ValueError(f"URL '{normalized_url}' is not permitted. Use one of the approved URLs.")
 
-    response = requests.get(normalized_url, headers=headers)
+    response = requests.get(normalized_url, headers=headers, timeout=WEB_FETCH_TIMEOUT)
     response.raise_for_status()
 
     soup = BeautifulSoup(response.content, 'html.parser')
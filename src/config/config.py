@@ -1,17 +1,82 @@
 import os
+from functools import lru_cache
+from pathlib import Path
+
+import yaml
 from dotenv import load_dotenv
 
+from .settings import get_setting
+
 load_dotenv()
 
+AGENTS_CONFIG_PATH = Path(__file__).with_name("agents.yaml")
+
 # LLM Configuration
 DEFAULT_MODEL = os.getenv("DEFAULT_MODEL", "openai/gpt-4o")
 MAX_TOKENS = int(os.getenv("MAX_TOKENS", "1024"))
+STREAM_RESPONSES = os.getenv("STREAM_RESPONSES", "false").lower() == "true"
 MAX_ITERATIONS = int(os.getenv("MAX_ITERATIONS", "13"))
+# Time budget for one agent run in seconds, shared with sub-agents (0 = none);
+# agents.yaml `timeout` overrides it per agent
+AGENT_TIMEOUT = float(os.getenv("AGENT_TIMEOUT", "0"))
+LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", str(get_setting("temperature"))))
+
+# LLM client: timeouts, retries with backoff, per-provider concurrency, connection pool
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", str(get_setting("llm_timeout"))))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", str(get_setting("llm_max_retries"))))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", str(get_setting("llm_backoff_base"))))
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", str(get_setting("llm_backoff_max"))))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", str(get_setting("llm_max_concurrency"))))
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", str(get_setting("llm_pool_size"))))
+LLM_API_BASE = os.getenv("LLM_API_BASE")
+
+# Execution
+MAX_PARALLEL_TOOLS = int(os.getenv("MAX_PARALLEL_TOOLS", "4"))
+# Worker processes shared by execution="process" tools (0 = one per CPU)
+TOOL_PROCESS_WORKERS = int(os.getenv("TOOL_PROCESS_WORKERS", "0"))
+# Cap in seconds on one web fetch (process tools cannot see the run's deadline)
+WEB_FETCH_TIMEOUT = float(os.getenv("WEB_FETCH_TIMEOUT", "15"))
+
+# Record/replay of LLM responses (LLM_CASSETTE_MODE: record | replay)
+LLM_CASSETTE = os.getenv("LLM_CASSETTE")
+LLM_CASSETTE_MODE = os.getenv("LLM_CASSETTE_MODE", "replay")
+# Tools recorded and replayed with the LLM responses (they would reach the network)
+LLM_CASSETTE_TOOLS = ["fetch_from_web"]
+
+# LLM response cache (agents opt in with `response_cache: true` in agents.yaml)
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH")
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "3600"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+
+# Coalesce identical in-flight LLM requests across sessions
+LLM_SINGLE_FLIGHT = os.getenv("LLM_SINGLE_FLIGHT", "true").lower() == "true"
+
+# Logging & tracing
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+TRACE_FILE = os.getenv("TRACE_FILE")
 
 # Paths
 WORKSPACE_DIR = os.getenv("WORKSPACE_DIR", "./workspace")
 LOGS_DIR = os.getenv("LOGS_DIR", "./logs")
 
+# Tool results longer than ARTIFACT_THRESHOLD characters are stored under
+# ARTIFACT_DIR and referenced by handle in memory (0 = keep results inline)
+ARTIFACT_DIR = os.getenv("ARTIFACT_DIR", os.path.join(WORKSPACE_DIR, "artifacts"))
+ARTIFACT_THRESHOLD = int(os.getenv("ARTIFACT_THRESHOLD", "8000"))
+ARTIFACT_PREVIEW_CHARS = int(os.getenv("ARTIFACT_PREVIEW_CHARS", "400"))
+
 # API Keys (loaded from .env)
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
+
+
+@lru_cache(maxsize=None)
+def load_agents_config() -> dict:
+    """Load per-agent settings from agents.yaml"""
+    with open(AGENTS_CONFIG_PATH, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def get_agent_config(key: str) -> dict:
+    """Get the agents.yaml section for one agent (empty if missing)"""
+    return load_agents_config().get(key) or {}
@@ -5,6 +5,12 @@ DEFAULT_SETTINGS = {
     "default_model": "openai/gpt-4o",
     "max_tokens": 1024,
     "temperature": 0.7,
+    "llm_timeout": 60.0,
+    "llm_max_retries": 3,
+    "llm_backoff_base": 0.5,
+    "llm_backoff_max": 8.0,
+    "llm_max_concurrency": 8,
+    "llm_pool_size": 20,
 }
 
 
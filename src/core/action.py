@@ -1,3 +1,4 @@
+from types import MappingProxyType
 from typing import Callable, Dict, Any, List
 import uuid
 
@@ -13,13 +14,30 @@ class Action:
                  description: str,
                  parameters: Dict,
                  terminal: bool = False,
-                 accepts_action_context: bool = False):
+                 accepts_action_context: bool = False,
+                 idempotent: bool = False,
+                 speculate: List[dict] = None,
+                 execution: str = "thread",
+                 validator: Callable[[dict], dict] = None):
         self.name = name
         self.function = function
         self.description = description
         self.terminal = terminal
         self.parameters = parameters
         self.accepts_action_context = accepts_action_context
+        # Safe to run ahead of the model's decision with these predicted args
+        self.idempotent = idempotent
+        self.speculate = speculate or []
+        # Where the environment runs a sync tool: inline, thread or process
+        self.execution = execution
+        # Compiled from the parameters schema (see core.schema.compile_validator)
+        self.validator = validator
+
+    def validate(self, args: dict) -> dict:
+        """Check and coerce arguments; raises ArgumentError when they are invalid"""
+        if self.validator is None:
+            return args
+        return self.validator(args)
 
     def execute(self, action_context=None, **args) -> Any:
         """Execute the action's function"""
@@ -33,10 +51,21 @@ class ActionRegistry:
     
     def __init__(self):
         self.actions = {}
+        self.version = 0
+        self.frozen = False
 
     def register(self, action: Action):
         """Register a new action"""
+        if self.frozen:
+            raise RuntimeError(f"Cannot register {action.name}: registry is frozen")
         self.actions[action.name] = action
+        self.version += 1
+
+    def freeze(self) -> "ActionRegistry":
+        """Make the registry read-only so it can be shared between agents"""
+        self.actions = MappingProxyType(dict(self.actions))
+        self.frozen = True
+        return self
 
     def get_action(self, name: str) -> Action:
         """Get an action by name"""
@@ -65,4 +94,8 @@ class ActionContext:
         self.properties["memory"] = memory
 
     def get_agent_registry(self):
-        return self.properties.get("agent_registry", None)
\ No newline at end of file
+        return self.properties.get("agent_registry", None)
+
+    def get_deadline(self):
+        """The run's Deadline (see core.deadline), if one was set"""
+        return self.properties.get("deadline", None)
\ No newline at end of file
@@ -1,59 +1,119 @@
+import asyncio
 import json
-from typing import List, Callable
+import logging
+from typing import TYPE_CHECKING, Awaitable, List, Callable, Optional, Tuple, Union
 
-from .language import Goal, Prompt, AgentLanguage
-from .action import ActionContext, ActionRegistry
-from .memory import Memory
+from .language import Goal, Prompt, PromptPrefix, AgentLanguage
+from .action import Action, ActionContext, ActionRegistry
+from .memory import Memory, MemoryItem
 from .environment import Environment
+from .concurrency import run_sync
+from .deadline import Deadline, DeadlineExceeded
+from .speculation import SpeculationEngine
+from .tracing import get_tracer, preview
+
+if TYPE_CHECKING:
+    from .llm import LLMClient
+
+logger = logging.getLogger(__name__)
 
 
 class Agent:
     """Base agent implementation with GAME loop"""
-    
+
     def __init__(self,
                  goals: List[Goal],
                  agent_language: AgentLanguage,
                  action_registry: ActionRegistry,
-                 generate_response: Callable[[Prompt], str],
-                 environment: Environment,
-                 name: str = "Agent"):
+                 generate_response: Optional[Callable[[Prompt], str]] = None,
+                 environment: Optional[Environment] = None,
+                 name: str = "Agent",
+                 agenerate_response: Optional[Callable[[Prompt], Awaitable[str]]] = None,
+                 stream_response: Optional[Callable[..., Awaitable[str]]] = None,
+                 on_text: Optional[Callable[[str], None]] = None,
+                 llm: Optional["LLMClient"] = None,
+                 speculate: bool = False,
+                 timeout: Optional[float] = None):
         self.name = name
         self.goals = goals
-        self.generate_response = generate_response
+        # An LLMClient supplies the sync and async entry points; explicit
+        # callables still take precedence (e.g. tests passing a FakeLLM).
+        self.llm = llm
+        self.generate_response = generate_response or (llm.generate if llm else None)
+        self.agenerate_response = agenerate_response or (llm.agenerate if llm else None)
+        self.stream_response = stream_response
+        self.on_text = on_text
+        self.speculate = speculate
+        # Default time budget for a run, in seconds (None: unbounded)
+        self.timeout = timeout
         self.agent_language = agent_language
         self.actions = action_registry
-        self.environment = environment
+        self.environment = environment or Environment()
+        self._prompt_prefix = None
+        self._prompt_prefix_key = None
 
-    def construct_prompt(self, goals: List[Goal], memory: Memory, 
+    def get_prompt_prefix(self) -> PromptPrefix:
+        """Return the compiled goals/tools prefix, rebuilding only if they changed"""
+        key = (id(self.goals), len(self.goals), id(self.actions), self.actions.version)
+        if self._prompt_prefix is None or key != self._prompt_prefix_key:
+            self._prompt_prefix = self.agent_language.compile_prefix(
+                actions=self.actions.get_actions(),
+                goals=self.goals
+            )
+            self._prompt_prefix_key = key
+        return self._prompt_prefix
+
+    def construct_prompt(self, goals: List[Goal], memory: Memory,
                         actions: ActionRegistry) -> Prompt:
         """Build prompt with memory context"""
+        prefix = None
+        if goals is self.goals and actions is self.actions:
+            prefix = self.get_prompt_prefix()
         return self.agent_language.construct_prompt(
             actions=actions.get_actions(),
             environment=self.environment,
             goals=goals,
-            memory=memory
+            memory=memory,
+            prefix=prefix
         )
 
     def get_action(self, response: str):
         """Parse response and get corresponding action"""
-        invocation = self.agent_language.parse_response(response)
-        action = self.actions.get_action(invocation["tool"])
-        return action, invocation
+        return self.get_actions(response)[0]
+
+    def get_actions(self, response: str) -> List[Tuple[Optional[Action], dict]]:
+        """Parse response and get the action for every tool call it contains"""
+        return [
+            (self.actions.get_action(invocation["tool"]), invocation)
+            for invocation in self.agent_language.parse_invocations(response)
+        ]
 
     def should_terminate(self, response: str) -> bool:
         """Check if response indicates termination"""
-        action_def, _ = self.get_action(response)
-        return action_def and action_def.terminal
+        return any(
+            action_def and action_def.terminal
+            for action_def, _ in self.get_actions(response)
+        )
 
     def set_current_task(self, memory: Memory, task: str):
         """Set the current task in memory"""
         memory.add_memory({"type": "user", "content": task})
 
-    def update_memory(self, memory: Memory, response: str, result: dict):
-        """Update memory with agent decision and environment response"""
-        new_memories = [
-            {"type": "assistant", "content": response},
-            {"type": "environment", "content": json.dumps(result)}
+    def update_memory(self, memory: Memory, response: str, result: Union[dict, List[dict]],
+                      tools: Optional[List[str]] = None):
+        """Update memory with agent decision and environment response(s)"""
+        results = result if isinstance(result, list) else [result]
+        tools = tools or [None] * len(results)
+        new_memories = [MemoryItem("assistant", response)]
+        # The execution timestamp is left out of the content: it differs on
+        # every run, and content ends up in prompts (including sub-agent
+        # results nested in call_agent output) that are hashed for the
+        # response cache and cassettes. MemoryItem keeps its own timestamp.
+        new_memories += [
+            MemoryItem("environment", json.dumps(
+                {k: v for k, v in r.items() if k != "timestamp"} if isinstance(r, dict) else r
+            ), tool=tool)
+            for r, tool in zip(results, tools)
         ]
         for m in new_memories:
             memory.add_memory(m)
@@ -62,41 +122,173 @@ class Agent:
         """Get action from LLM"""
         return self.generate_response(full_prompt)
 
-    def run(self, user_input: str, memory: Memory = None, 
-            max_iterations: int = 13, action_context_props=None) -> Memory:
-        """Execute the GAME loop"""
+    async def aprompt_llm_for_action(self, full_prompt: Prompt) -> str:
+        """Get action from LLM without blocking the event loop"""
+        if self.agenerate_response:
+            return await self.agenerate_response(full_prompt)
+        return await asyncio.to_thread(self.generate_response, full_prompt)
+
+    async def astream_llm_for_action(self, full_prompt: Prompt, action_context: ActionContext):
+        """Stream the LLM decision, starting each tool as soon as its call is complete.
+
+        Returns the response and a map of call index to (invocation, task)
+        for the calls that were dispatched while the stream was still open.
+        """
+        dispatched = {}
+
+        def on_tool_call(index: int, invocation: dict):
+            action = self.actions.get_action(invocation["tool"])
+            if action and index not in dispatched:
+                dispatched[index] = (invocation, asyncio.ensure_future(
+                    self.execute_call(action, invocation, action_context)
+                ))
+
+        try:
+            response = await self.stream_response(
+                full_prompt, on_text=self.on_text, on_tool_call=on_tool_call
+            )
+        except BaseException:
+            for _, task in dispatched.values():
+                task.cancel()
+            raise
+        return response, dispatched
+
+    async def execute_call(self, action: Action, invocation: dict,
+                           action_context: ActionContext) -> dict:
+        """Execute a single tool call inside a tool.execute span"""
+        with get_tracer().span("tool.execute", agent=self.name, tool=action.name) as span:
+            result = await self.environment.aexecute_action(
+                action, invocation["args"], action_context
+            )
+            span.set_attribute("tool_executed", result.get("tool_executed"))
+            return result
+
+    async def execute_calls(self, calls: List[Tuple[Action, dict]], action_context: ActionContext,
+                            dispatched: dict = None,
+                            speculation: Optional[SpeculationEngine] = None) -> List[dict]:
+        """Execute a turn's calls, reusing results of calls dispatched early or speculated"""
+        dispatched = dispatched or {}
+        pending = []
+        for index, (action, invocation) in enumerate(calls):
+            early = dispatched.pop(index, None)
+            if early and early[0] == invocation:
+                pending.append(early[1])
+                continue
+            if early:
+                early[1].cancel()
+            speculated = speculation.take(action, invocation.get("args")) if speculation else None
+            if speculated is not None:
+                pending.append(speculated)
+            else:
+                pending.append(self.execute_call(action, invocation, action_context))
+        for _, task in dispatched.values():
+            task.cancel()
+        if speculation and any(action is not None and not action.idempotent for action, _ in calls):
+            # This turn may change what the predicted calls would return
+            speculation.discard()
+        return list(await asyncio.gather(*pending))
+
+    def run(self, user_input: str, memory: Memory = None,
+            max_iterations: int = 13, action_context_props=None,
+            timeout: Optional[float] = None) -> Memory:
+        """Execute the GAME loop (blocking wrapper around arun)"""
+        return run_sync(self.arun(
+            user_input,
+            memory=memory,
+            max_iterations=max_iterations,
+            action_context_props=action_context_props,
+            timeout=timeout
+        ))
+
+    async def arun(self, user_input: str, memory: Memory = None,
+                   max_iterations: int = 13, action_context_props=None,
+                   timeout: Optional[float] = None) -> Memory:
+        """Execute the GAME loop on the running event loop.
+
+        The run stops when ``timeout`` (default: the agent's) seconds pass or
+        a deadline inherited through ``action_context_props`` expires, with
+        the work done so far in memory and a final ``deadline_exceeded`` item.
+        """
+        tracer = get_tracer()
         memory = memory or Memory()
+        props = dict(action_context_props or {})
+        deadline = Deadline.after(timeout or self.timeout, parent=props.pop("deadline", None))
         action_context = ActionContext({
             'memory': memory,
             'llm': self.generate_response,
-            **(action_context_props or {})
+            'artifacts': self.environment.artifacts,
+            **props,
+            'deadline': deadline
         })
         self.set_current_task(memory, user_input)
 
-        for iteration in range(max_iterations):
-            print(f"\n[{self.name}] Iteration {iteration + 1}/{max_iterations}")
-            
+        with tracer.span("agent.run", agent=self.name, max_iterations=max_iterations) as run_span:
+            speculation = None
+            if self.speculate:
+                # Predicted idempotent calls run while the first LLM call is in flight
+                speculation = SpeculationEngine(self)
+                speculation.start(self.actions.get_actions(), action_context)
+            try:
+                for iteration in range(max_iterations):
+                    deadline.check()
+                    run_span.set_attribute("iterations", iteration + 1)
+                    with tracer.span("agent.iteration", agent=self.name, iteration=iteration + 1):
+                        logger.info("\n[%s] Iteration %d/%d", self.name, iteration + 1, max_iterations)
+                        if not await self._step(memory, action_context, tracer, speculation):
+                            break
+            except DeadlineExceeded as e:
+                logger.info("[%s] %s, stopping", self.name, e)
+                run_span.set_attribute("deadline_exceeded", True)
+                memory.add_memory({
+                    "type": "environment",
+                    "content": json.dumps({"tool_executed": False, "error": str(e), "deadline_exceeded": True}),
+                    "deadline_exceeded": True
+                })
+            finally:
+                # Sub-agents still running on this run's behalf stop at their next check
+                deadline.cancel()
+                if speculation:
+                    run_span.set_attribute("speculation", speculation.stats())
+                    speculation.discard()
+
+        return memory
+
+    async def _step(self, memory: Memory, action_context: ActionContext, tracer,
+                    speculation: Optional[SpeculationEngine] = None) -> bool:
+        """Run one GAME iteration; returns False when the loop should stop"""
+        with tracer.span("prompt.construct", agent=self.name) as span:
             prompt = self.construct_prompt(self.goals, memory, self.actions)
-            response = self.prompt_llm_for_action(prompt)
-            print(f"[{self.name}] Decision: {response[:200]}...")
-
-            action, invocation = self.get_action(response)
-            if not action:
-                print(f"[{self.name}] Unknown action, terminating")
-                break
-            
-            action_context.set_memory(memory)
-            result = self.environment.execute_action(
-                action=action,
-                args=invocation["args"],
-                action_context=action_context
-            )
-            print(f"[{self.name}] Result: {str(result)[:200]}...")
+            span.set_attribute("messages", len(prompt.messages))
+        action_context.set_memory(memory)
 
-            self.update_memory(memory, response, result)
+        dispatched = {}
+        deadline = action_context.get_deadline() or Deadline()
+        with tracer.span("llm.call", agent=self.name, streaming=bool(self.stream_response)):
+            if self.stream_response:
+                response, dispatched = await deadline.wait(self.astream_llm_for_action(prompt, action_context))
+            else:
+                response = await deadline.wait(self.aprompt_llm_for_action(prompt))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("[%s] Decision: %s...", self.name, preview(response))
 
-            if self.should_terminate(response):
-                print(f"[{self.name}] Terminating")
-                break
+        with tracer.span("response.parse", agent=self.name) as span:
+            calls = self.get_actions(response)
+            span.set_attribute("tools", [invocation.get("tool") for _, invocation in calls])
+        if not all(action for action, _ in calls):
+            for _, task in dispatched.values():
+                task.cancel()
+            logger.info("[%s] Unknown action, terminating", self.name)
+            return False
 
-        return memory
+        results = await self.execute_calls(calls, action_context, dispatched, speculation)
+        if logger.isEnabledFor(logging.INFO):
+            for result in results:
+                logger.info("[%s] Result: %s...", self.name, preview(result))
+
+        with tracer.span("memory.update", agent=self.name):
+            self.update_memory(memory, response, results, [action.name for action, _ in calls])
+
+        if any(action.terminal for action, _ in calls):
+            logger.info("[%s] Terminating", self.name)
+            return False
+        return True
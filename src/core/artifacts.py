@@ -0,0 +1,102 @@
+"""Content-addressed store for large tool results.
+
+When an Environment has an ArtifactStore, results larger than the store's
+threshold are written to disk and memory keeps only a reference (handle,
+size and a short preview). The ``read_artifact`` tool reads slices back on
+demand, so a big file or page costs prompt tokens once, not every turn.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+class ArtifactStore:
+    """Results stored under the hash of their content, read back via mmap"""
+
+    def __init__(self, root: Optional[str] = None, threshold: int = 8000, preview_chars: int = 400):
+        self.root = Path(root) if root else Path(tempfile.gettempdir()) / "agent-artifacts"
+        self.threshold = threshold
+        self.preview_chars = preview_chars
+
+    def path(self, handle: str) -> Path:
+        if not (len(handle) == 16 and all(c in "0123456789abcdef" for c in handle)):
+            raise ValueError(f"Invalid artifact handle: {handle!r}")
+        return self.root / handle[:2] / handle
+
+    def put(self, text: str) -> str:
+        """Store text (once per distinct content) and return its handle"""
+        data = text.encode("utf-8")
+        handle = hashlib.sha256(data).hexdigest()[:16]
+        path = self.path(handle)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        return handle
+
+    def size(self, handle: str) -> int:
+        """Size of the artifact in bytes"""
+        return self.path(handle).stat().st_size
+
+    def read_range(self, handle: str, offset: int = 0, length: Optional[int] = None) -> Tuple[int, int, str]:
+        """Read ``length`` bytes from ``offset``, widened to whole UTF-8 characters.
+
+        Returns the byte range actually read and its text.
+        """
+        with open(self.path(handle), "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            size = len(data)
+            start = max(0, min(offset, size))
+            end = size if length is None else max(start, min(start + length, size))
+            # Step off UTF-8 continuation bytes so a slice never splits a character
+            while start < size and data[start] & 0xC0 == 0x80:
+                start += 1
+            while end < size and data[end] & 0xC0 == 0x80:
+                end += 1
+            return start, end, data[start:end].decode("utf-8")
+
+    def read(self, handle: str, offset: int = 0, length: Optional[int] = None) -> str:
+        return self.read_range(handle, offset, length)[2]
+
+    def spill(self, result: Any) -> Any:
+        """Return ``result`` itself, or a reference to it if it is over the threshold"""
+        text = result if isinstance(result, str) else json.dumps(result, default=str, ensure_ascii=False)
+        if len(text) <= self.threshold:
+            return result
+        handle = self.put(text)
+        return {
+            "artifact": handle,
+            "size": len(text.encode("utf-8")),
+            "preview": text[:self.preview_chars],
+            "note": "Result stored as an artifact; call read_artifact(handle, offset, length) for more"
+        }
+
+
+_shared_stores: Dict[tuple, ArtifactStore] = {}
+_shared_lock = threading.Lock()
+
+
+def get_artifact_store(root: Optional[str] = None, threshold: int = 8000,
+                       preview_chars: int = 400) -> ArtifactStore:
+    """Return the process-wide store for a directory"""
+    key = (root, threshold, preview_chars)
+    with _shared_lock:
+        if key not in _shared_stores:
+            _shared_stores[key] = ArtifactStore(root, threshold=threshold, preview_chars=preview_chars)
+        return _shared_stores[key]
+
+
+def default_artifact_store() -> Optional[ArtifactStore]:
+    """The shared store configured by ARTIFACT_* settings (None when disabled)"""
+    from ..config import config
+    if not config.ARTIFACT_THRESHOLD:
+        return None
+    return get_artifact_store(config.ARTIFACT_DIR, threshold=config.ARTIFACT_THRESHOLD,
+                              preview_chars=config.ARTIFACT_PREVIEW_CHARS)
@@ -0,0 +1,165 @@
+"""Fast/strong model cascade.
+
+Mechanical turns (picking the next tool) go to a small, fast model. The
+answer is checked and the turn is re-asked of the strong model when the
+fast model's response does not parse, names a tool that is not offered, or
+is a final turn (``terminate`` or a synthesis tool) whose quality matters.
+"""
+
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Callable, Dict, Iterable, Optional, Union
+
+from .language import Prompt
+from .llm import LLMClient
+from .tracing import get_tracer
+
+
+class ModelCascade:
+    """Routes each turn to the fast tier and escalates to the strong tier"""
+
+    def __init__(self,
+                 fast: LLMClient,
+                 strong: LLMClient,
+                 escalate_tools: Iterable[str] = ("terminate",)):
+        self.fast = fast
+        self.strong = strong
+        self.escalate_tools = frozenset(escalate_tools)
+        self.escalations = defaultdict(int)
+        self.calls = defaultdict(int)
+        self._latencies = {"fast": deque(maxlen=1024), "strong": deque(maxlen=1024)}
+        # Turns from concurrent runs (threads and event loops) update the counters
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, agent_key: str, **overrides) -> Union["ModelCascade", LLMClient]:
+        """Build a cascade when the agent has ``fast_model`` in agents.yaml, else a plain client"""
+        from ..config.config import get_agent_config
+
+        agent_config = get_agent_config(agent_key)
+        strong = LLMClient.from_config(agent_key, **overrides)
+        if not agent_config.get("fast_model"):
+            return strong
+        fast = LLMClient.from_config(agent_key, **{**overrides, "model": agent_config["fast_model"]})
+        return cls(fast, strong, escalate_tools=agent_config.get("escalate_tools", ("terminate",)))
+
+    @property
+    def model(self) -> str:
+        return self.strong.model
+
+    @property
+    def settings(self) -> dict:
+        return {**self.strong.settings, "fast_model": self.fast.model}
+
+    def max_prompt_tokens(self) -> Optional[int]:
+        # The prompt must fit the smaller of the two context windows
+        budgets = [b for b in (self.fast.max_prompt_tokens(), self.strong.max_prompt_tokens()) if b]
+        return min(budgets) if budgets else None
+
+    def escalation_reason(self, prompt: Prompt, response: str) -> Optional[str]:
+        """Why a fast-tier response must be re-asked of the strong tier (None if it is fine)"""
+        try:
+            parsed = json.loads(response)
+        except (TypeError, ValueError):
+            return "parse_failure"
+        if not isinstance(parsed, dict):
+            return "parse_failure"
+        calls = parsed.get("tool_calls", [parsed])
+        offered = {tool["function"]["name"] for tool in prompt.tools}
+        for call in calls:
+            if not isinstance(call, dict) or "tool" not in call:
+                return "parse_failure"
+            if call["tool"] not in offered:
+                return "unknown_tool"
+            if call["tool"] in self.escalate_tools:
+                return "final_turn"
+        return None
+
+    def _record(self, tier: str, started: float):
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.calls[tier] += 1
+            self._latencies[tier].append(elapsed)
+
+    def _escalate(self, reason: str, span):
+        with self._lock:
+            self.escalations[reason] += 1
+        span.set_attribute("escalated", reason)
+
+    def generate(self, prompt: Prompt, **overrides) -> str:
+        # Without tools there is nothing to route; the strong model answers
+        if not prompt.tools:
+            return self._call("strong", self.strong.generate, prompt, **overrides)
+        with get_tracer().span("llm.cascade", fast=self.fast.model, strong=self.strong.model) as span:
+            response = self._call("fast", self.fast.generate, prompt, **overrides)
+            reason = self.escalation_reason(prompt, response)
+            if reason is None:
+                return response
+            self._escalate(reason, span)
+            return self._call("strong", self.strong.generate, prompt, **overrides)
+
+    __call__ = generate
+
+    async def agenerate(self, prompt: Prompt, **overrides) -> str:
+        if not prompt.tools:
+            return await self._acall("strong", self.strong.agenerate, prompt, **overrides)
+        with get_tracer().span("llm.cascade", fast=self.fast.model, strong=self.strong.model) as span:
+            response = await self._acall("fast", self.fast.agenerate, prompt, **overrides)
+            reason = self.escalation_reason(prompt, response)
+            if reason is None:
+                return response
+            self._escalate(reason, span)
+            return await self._acall("strong", self.strong.agenerate, prompt, **overrides)
+
+    async def astream(self, prompt: Prompt,
+                      on_text: Optional[Callable[[str], None]] = None,
+                      on_tool_call: Optional[Callable[[int, dict], None]] = None,
+                      **overrides) -> str:
+        """Fast-tier turns are not streamed (they may still be escalated);
+        escalated turns stream from the strong model."""
+        if prompt.tools:
+            with get_tracer().span("llm.cascade", fast=self.fast.model, strong=self.strong.model) as span:
+                response = await self._acall("fast", self.fast.agenerate, prompt, **overrides)
+                reason = self.escalation_reason(prompt, response)
+                if reason is None:
+                    return response
+                self._escalate(reason, span)
+        return await self._acall("strong", self.strong.astream, prompt,
+                                 on_text=on_text, on_tool_call=on_tool_call, **overrides)
+
+    def _call(self, tier: str, fn: Callable, prompt: Prompt, **kwargs) -> str:
+        client = getattr(self, tier)
+        with get_tracer().span("llm.tier", tier=tier, model=client.model):
+            started = time.perf_counter()
+            try:
+                return fn(prompt, **kwargs)
+            finally:
+                self._record(tier, started)
+
+    async def _acall(self, tier: str, fn: Callable, prompt: Prompt, **kwargs) -> str:
+        client = getattr(self, tier)
+        with get_tracer().span("llm.tier", tier=tier, model=client.model):
+            started = time.perf_counter()
+            try:
+                return await fn(prompt, **kwargs)
+            finally:
+                self._record(tier, started)
+
+    def stats(self) -> Dict[str, dict]:
+        """Per-tier call counts and latency percentiles (ms), plus escalation reasons"""
+        stats = {}
+        with self._lock:
+            samples = {tier: sorted(latencies) for tier, latencies in self._latencies.items()}
+            calls = dict(self.calls)
+            escalations = dict(self.escalations)
+        for tier, ordered in samples.items():
+            stats[tier] = {
+                "model": getattr(self, tier).model,
+                "calls": calls.get(tier, 0),
+                "p50_ms": round(ordered[len(ordered) // 2] * 1000, 3) if ordered else None,
+                "p95_ms": round(ordered[int(len(ordered) * 0.95)] * 1000, 3) if ordered else None,
+            }
+        stats["escalations"] = escalations
+        return stats
@@ -0,0 +1,148 @@
+"""Record/replay cassette for LLM responses.
+
+In ``record`` mode every Prompt -> response pair produced by an agent's
+generate_response is appended to a JSON Lines file. In ``replay`` mode the
+responses are served back by prompt hash, so a run needs no network and
+produces the same output every time.
+"""
+
+import functools
+import json
+import os
+import threading
+from collections import defaultdict
+from typing import Callable, Iterable, Optional
+
+from .language import Prompt
+
+
+class CassetteMissError(KeyError):
+    """Raised in replay mode when no recording matches a prompt"""
+
+
+class Cassette:
+    """Records LLM (and optionally tool) responses to disk and replays them"""
+
+    MODES = ("record", "replay")
+
+    def __init__(self, path: str, mode: str = "replay"):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown cassette mode '{mode}'. Use one of: {', '.join(self.MODES)}")
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._recordings = defaultdict(list)
+        self._cursor = defaultdict(int)
+        if mode == "replay":
+            self._load()
+        elif os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def _load(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._recordings[entry["key"]].append(entry["response"])
+
+    @staticmethod
+    def key_for_prompt(prompt: Prompt, **settings) -> str:
+        """Hash a prompt and the request settings (see Prompt.fingerprint)"""
+        return prompt.fingerprint(**settings)
+
+    @staticmethod
+    def key_for_tool(tool_name: str, args: dict) -> str:
+        return Prompt(messages=[{"tool": tool_name, "args": args}]).fingerprint()
+
+    def record(self, key: str, response, prompt: Optional[Prompt] = None):
+        """Append a response to the cassette file"""
+        entry = {"key": key, "response": response}
+        if prompt is not None:
+            entry["prompt"] = {"messages": prompt.messages, "tools": prompt.tools}
+        line = json.dumps(entry, default=str)
+        with self._lock:
+            self._recordings[key].append(response)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def play(self, key: str):
+        """Return the next recorded response for a key.
+
+        Identical prompts are served in recording order; once exhausted the
+        last recording is repeated.
+        """
+        with self._lock:
+            responses = self._recordings.get(key)
+            if not responses:
+                raise CassetteMissError(f"No recorded response for prompt hash {key[:12]} in {self.path}")
+            index = min(self._cursor[key], len(responses) - 1)
+            self._cursor[key] += 1
+            return responses[index]
+
+    def wrap(self, generate_response: Callable[..., str]) -> Callable[..., str]:
+        """Wrap a sync generate_response"""
+        @functools.wraps(generate_response)
+        def wrapper(prompt: Prompt, *args, **kwargs):
+            key = self.key_for_prompt(prompt, **kwargs)
+            if self.mode == "replay":
+                return self.play(key)
+            response = generate_response(prompt, *args, **kwargs)
+            self.record(key, response, prompt)
+            return response
+        return wrapper
+
+    def wrap_async(self, agenerate_response: Callable) -> Callable:
+        """Wrap an async generate_response"""
+        @functools.wraps(agenerate_response)
+        async def wrapper(prompt: Prompt, *args, **kwargs):
+            key = self.key_for_prompt(prompt, **kwargs)
+            if self.mode == "replay":
+                return self.play(key)
+            response = await agenerate_response(prompt, *args, **kwargs)
+            self.record(key, response, prompt)
+            return response
+        return wrapper
+
+    def attach(self, agent, tools: Iterable[str] = ()):
+        """Route an agent's LLM calls (and the named tools) through the cassette.
+
+        Streaming is turned off for the agent since a recording has no deltas.
+        Tools listed in ``tools`` (e.g. network fetches) are recorded and
+        replayed by name and arguments so the whole run can be offline.
+        """
+        agent.generate_response = self.wrap(agent.generate_response)
+        if agent.agenerate_response:
+            agent.agenerate_response = self.wrap_async(agent.agenerate_response)
+        agent.stream_response = None
+        if tools:
+            self._attach_tools(agent.environment, set(tools))
+        return agent
+
+    def _attach_tools(self, environment, tool_names: set):
+        execute_action = environment.execute_action
+        aexecute_action = environment.aexecute_action
+
+        def lookup(action, args):
+            key = self.key_for_tool(action.name, args)
+            return key, (self.play(key) if self.mode == "replay" else None)
+
+        def execute(action, args, action_context=None):
+            if action.name not in tool_names:
+                return execute_action(action, args, action_context)
+            key, result = lookup(action, args)
+            if result is None:
+                result = execute_action(action, args, action_context)
+                self.record(key, result)
+            return result
+
+        async def aexecute(action, args, action_context=None):
+            if action.name not in tool_names:
+                return await aexecute_action(action, args, action_context)
+            key, result = lookup(action, args)
+            if result is None:
+                result = await aexecute_action(action, args, action_context)
+                self.record(key, result)
+            return result
+
+        environment.execute_action = execute
+        environment.aexecute_action = aexecute
@@ -0,0 +1,77 @@
+"""Helpers for bridging the sync and async agent APIs"""
+
+import asyncio
+import atexit
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_loop_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """The process-wide event loop behind run_sync, started on first use.
+
+    It runs in a daemon thread for the life of the process, so pooled async
+    clients and their connections are reused across Agent.run calls.
+    """
+    global _loop, _loop_thread
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(target=loop.run_forever, name="agent-loop", daemon=True)
+            _loop_thread.start()
+            _loop = loop
+            atexit.register(_stop_loop)
+        return _loop
+
+
+def _stop_loop():
+    """Finalize async generators (closing per-loop clients) and stop the loop"""
+    global _loop
+    with _loop_lock:
+        loop, _loop = _loop, None
+    if loop is None or loop.is_closed():
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(loop.shutdown_asyncgens(), loop).result(timeout=5)
+    except Exception:
+        pass
+    loop.call_soon_threadsafe(loop.stop)
+    _loop_thread.join(timeout=5)
+    if not loop.is_running():
+        loop.close()
+
+
+def run_sync(awaitable: Awaitable) -> Any:
+    """Run an awaitable to completion from synchronous code.
+
+    Without a running loop in the calling thread, the awaitable runs on the
+    shared loop from get_loop (context variables such as the active trace
+    span are carried over) and the caller blocks until it finishes. When
+    called from inside a running loop (e.g. a sync tool executed inline by
+    an async agent), blocking on another loop could deadlock it, so the
+    awaitable runs on a fresh loop in a helper thread instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        future = asyncio.run_coroutine_threadsafe(_as_coroutine(awaitable), get_loop())
+        try:
+            return future.result()
+        except BaseException:
+            # e.g. KeyboardInterrupt in the caller: don't leave the run going
+            future.cancel()
+            raise
+
+    # Carry context variables (e.g. the active trace span) into the helper thread
+    context = contextvars.copy_context()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(context.run, asyncio.run, _as_coroutine(awaitable)).result()
+
+
+async def _as_coroutine(awaitable: Awaitable) -> Any:
+    return await awaitable
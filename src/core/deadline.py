@@ -0,0 +1,181 @@
+"""Deadlines for agent runs.
+
+A run's Deadline travels on its ActionContext (``"deadline"``). The agent
+checks it between iterations and bounds each LLM call with it, the
+environment bounds tool execution with it, and ``call_agent`` hands
+sub-agents a child deadline with a share of the remaining time. A child
+also expires when its parent is cancelled, which is how a finished or
+aborted run stops sub-agents still running in tool threads.
+
+While a tool runs, its deadline is also the current deadline (see
+current_deadline), so code that cannot take an ActionContext, such as the
+process-tool proxy, can still bound its waits.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+_current_deadline: ContextVar[Optional["Deadline"]] = ContextVar("current_deadline", default=None)
+
+
+def current_deadline() -> Optional["Deadline"]:
+    """The deadline of the tool call running in this context, if any"""
+    return _current_deadline.get()
+
+
+@contextmanager
+def use_deadline(deadline: Optional["Deadline"]) -> Iterator[Optional["Deadline"]]:
+    """Make ``deadline`` the current deadline inside the block"""
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The run's time budget ran out (or the run was cancelled)"""
+
+
+class Deadline:
+    """A point in monotonic time, optionally bounded by a parent deadline"""
+
+    def __init__(self, expires_at: Optional[float] = None, parent: Optional["Deadline"] = None):
+        if parent is not None and parent.expires_at is not None:
+            expires_at = parent.expires_at if expires_at is None else min(expires_at, parent.expires_at)
+        self.expires_at = expires_at
+        self.parent = parent
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._listeners = set()
+
+    @classmethod
+    def after(cls, seconds: Optional[float], parent: Optional["Deadline"] = None) -> "Deadline":
+        """Deadline ``seconds`` from now (None or 0: only the parent's limit)"""
+        return cls(time.monotonic() + seconds if seconds else None, parent)
+
+    @property
+    def cancelled(self) -> bool:
+        deadline = self
+        while deadline is not None:
+            if deadline._cancelled.is_set():
+                return True
+            deadline = deadline.parent
+        return False
+
+    def cancel(self):
+        """Expire this deadline and every child derived from it"""
+        with self._lock:
+            self._cancelled.set()
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener()
+
+    def _chain(self):
+        deadline = self
+        while deadline is not None:
+            yield deadline
+            deadline = deadline.parent
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left (None when unbounded, 0 once expired or cancelled)"""
+        if self.cancelled:
+            return 0.0
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() == 0.0
+
+    def check(self):
+        """Raise DeadlineExceeded if no time is left"""
+        if self.expired():
+            raise DeadlineExceeded("Cancelled" if self.cancelled else "Deadline exceeded")
+
+    def child(self, fraction: float = 1.0) -> "Deadline":
+        """Deadline for delegated work: ``fraction`` of the remaining time,
+        leaving the rest for this run to use the result"""
+        remaining = self.remaining()
+        if remaining is None:
+            return Deadline(parent=self)
+        return Deadline(time.monotonic() + remaining * fraction, parent=self)
+
+    def _subscribe(self, callback: Callable[[], None]) -> List["Deadline"]:
+        """Call ``callback`` when this deadline or a parent is cancelled"""
+        chain = list(self._chain())
+        for deadline in chain:
+            with deadline._lock:
+                deadline._listeners.add(callback)
+        return chain
+
+    @staticmethod
+    def _unsubscribe(chain: List["Deadline"], callback: Callable[[], None]):
+        for deadline in chain:
+            with deadline._lock:
+                deadline._listeners.discard(callback)
+
+    async def wait(self, awaitable: Awaitable[T]) -> T:
+        """Await ``awaitable``, cancelling it when the deadline passes or
+        this deadline (or a parent) is cancelled"""
+        self.check()
+        loop = asyncio.get_running_loop()
+        cancelled = loop.create_future()
+
+        def on_cancel():
+            # cancel() may be called from any thread
+            try:
+                loop.call_soon_threadsafe(_resolve, cancelled)
+            except RuntimeError:
+                pass  # loop already closed
+
+        chain = self._subscribe(on_cancel)
+        task = asyncio.ensure_future(awaitable)
+        try:
+            if self.cancelled:
+                # Cancelled before the listener was registered
+                _resolve(cancelled)
+            done, _ = await asyncio.wait(
+                {task, cancelled}, timeout=self.remaining(), return_when=asyncio.FIRST_COMPLETED
+            )
+            if task in done:
+                return task.result()
+            raise DeadlineExceeded("Cancelled" if self.cancelled else "Deadline exceeded")
+        finally:
+            self._unsubscribe(chain, on_cancel)
+            task.cancel()
+            cancelled.cancel()
+
+    def result(self, future: "concurrent.futures.Future[T]") -> T:
+        """Block on ``future`` (from a thread or process pool) until it
+        finishes, the deadline passes or it is cancelled. On DeadlineExceeded
+        the future is left to the caller, which may still have to stop the work."""
+        self.check()
+        stop = threading.Event()
+        future.add_done_callback(lambda _: stop.set())
+        chain = self._subscribe(stop.set)
+        try:
+            if not self.cancelled:
+                stop.wait(self.remaining())
+            if future.done():
+                return future.result()
+            raise DeadlineExceeded("Cancelled" if self.cancelled else "Deadline exceeded")
+        finally:
+            self._unsubscribe(chain, stop.set)
+
+    def __repr__(self) -> str:
+        remaining = self.remaining()
+        return f"Deadline(remaining={'inf' if remaining is None else f'{remaining:.3f}s'})"
+
+
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
@@ -1,29 +1,128 @@
+import asyncio
+import contextvars
+import functools
+import inspect
 import time
 import traceback
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional, Tuple
 
 from .action import Action
+from .artifacts import ArtifactStore
+from .deadline import DeadlineExceeded, use_deadline
+from .schema import ArgumentError
 
 
 class Environment:
     """Manages action execution and result formatting"""
 
+    def __init__(self, max_workers: int = 4, artifacts: Optional[ArtifactStore] = None):
+        self.max_workers = max_workers
+        # Large results are spilled here and referenced by handle
+        self.artifacts = artifacts
+        self._executor = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Lazily create the bounded pool used for blocking tools"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="tool"
+            )
+        return self._executor
+
     def execute_action(self, action: Action, args: dict, action_context=None) -> dict:
         """Execute an action and return formatted result"""
         try:
-            result = action.execute(action_context=action_context, **args)
-            return self.format_result(result)
+            args = action.validate(args)
+            deadline = action_context.get_deadline() if action_context else None
+            if deadline:
+                deadline.check()
+            with use_deadline(deadline):
+                result = action.execute(action_context=action_context, **args)
+            return self.format_result(result, action)
         except Exception as e:
-            return {
-                "tool_executed": False,
-                "error": str(e),
-                "traceback": traceback.format_exc()
-            }
+            return self.format_error(e)
+
+    def execute_actions(self, calls: List[Tuple[Action, dict]], action_context=None) -> List[dict]:
+        """Execute independent actions concurrently, results in call order"""
+        if len(calls) == 1:
+            action, args = calls[0]
+            return [self.execute_action(action, args, action_context)]
+        context = contextvars.copy_context()
+        return list(self._get_executor().map(
+            lambda call: context.copy().run(self.execute_action, call[0], call[1], action_context),
+            calls
+        ))
+
+    async def aexecute_action(self, action: Action, args: dict, action_context=None) -> dict:
+        """Execute an action without blocking the event loop.
+
+        Coroutine tools are awaited directly and ``inline`` tools are called
+        on the loop; other tools run on the environment's bounded thread pool
+        so slow I/O in one agent does not stall the others (``process`` tools
+        wait there for their worker process). A deadline on the action
+        context bounds the wait; a thread left running past it is abandoned
+        (a process tool's proxy stops waiting and retires the pool).
+        """
+        try:
+            args = action.validate(args)
+            deadline = action_context.get_deadline() if action_context else None
+            if deadline:
+                with use_deadline(deadline):
+                    result = await deadline.wait(self._arun(action, args, action_context))
+            else:
+                result = await self._arun(action, args, action_context)
+            return self.format_result(result, action)
+        except Exception as e:
+            return self.format_error(e)
+
+    async def _arun(self, action: Action, args: dict, action_context=None) -> Any:
+        if inspect.iscoroutinefunction(action.function):
+            return await action.execute(action_context=action_context, **args)
+        if action.execution == "inline":
+            return action.execute(action_context=action_context, **args)
+        call = functools.partial(action.execute, action_context=action_context, **args)
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            self._get_executor(), context.run, call
+        )
 
-    def format_result(self, result: Any) -> dict:
+    async def aexecute_actions(self, calls: List[Tuple[Action, dict]], action_context=None) -> List[dict]:
+        """Async variant of execute_actions"""
+        return list(await asyncio.gather(*[
+            self.aexecute_action(action, args, action_context)
+            for action, args in calls
+        ]))
+
+    def format_result(self, result: Any, action: Optional[Action] = None) -> dict:
         """Format result with metadata"""
+        # A terminal result is the run's answer and is returned in full
+        if self.artifacts is not None and not (action and action.terminal):
+            result = self.artifacts.spill(result)
         return {
             "tool_executed": True,
             "result": result,
             "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z")
         }
+
+    def format_error(self, error: Exception) -> dict:
+        """Format a failed execution"""
+        if isinstance(error, DeadlineExceeded):
+            return {
+                "tool_executed": False,
+                "error": str(error),
+                "deadline_exceeded": True
+            }
+        if isinstance(error, ArgumentError):
+            # The tool never ran; a traceback would only cost the model tokens
+            return {
+                "tool_executed": False,
+                "error": f"Invalid arguments for {error.tool}",
+                "invalid_arguments": error.errors
+            }
+        return {
+            "tool_executed": False,
+            "error": str(error),
+            "traceback": traceback.format_exc()
+        }
@@ -1,3 +1,4 @@
+import hashlib
 import json
 from typing import List, Dict, Any
 from dataclasses import dataclass, field
@@ -22,24 +23,63 @@ class Prompt:
     tools: List[Dict] = field(default_factory=list)
     metadata: dict = field(default_factory=dict)
 
+    def fingerprint(self, **extra) -> str:
+        """Stable hash of the messages and tools (plus any extra request settings).
+
+        Memory content carries no execution timestamps (see
+        Agent.update_memory), so identical conversations hash the same on
+        every run.
+        """
+        payload = json.dumps(
+            {"messages": self.messages, "tools": self.tools, **extra},
+            sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class PromptPrefix:
+    """Static part of a prompt (goals and tool schemas) compiled once per agent.
+
+    The messages always come first in the prompt and are never rebuilt during
+    a run, which keeps the prefix byte-identical across iterations so provider
+    prompt caches can reuse it.
+    """
+    messages: List[Dict]
+    tools: List[Dict]
+
 
 class AgentLanguage:
     """Base class for agent communication protocols"""
     
+    def compile_prefix(self, actions: List[Action], goals: List[Goal]) -> PromptPrefix:
+        raise NotImplementedError("Subclasses must implement this method")
+
     def construct_prompt(self,
                          actions: List[Action],
                          environment: Environment,
                          goals: List[Goal],
-                         memory: Memory) -> Prompt:
+                         memory: Memory,
+                         prefix: PromptPrefix = None) -> Prompt:
         raise NotImplementedError("Subclasses must implement this method")
 
     def parse_response(self, response: str) -> dict:
         raise NotImplementedError("Subclasses must implement this method")
 
+    def parse_invocations(self, response: str) -> List[dict]:
+        """Parse a response into one or more tool invocations"""
+        return [self.parse_response(response)]
+
 
 class AgentFunctionCallingActionLanguage(AgentLanguage):
     """Function calling protocol for OpenAI-style APIs"""
-    
+
+    def __init__(self, retention_policy=None):
+        # Optional policy (e.g. TokenBudgetRetentionPolicy) choosing which
+        # memories fit in the prompt; without one every memory is sent.
+        self.retention_policy = retention_policy
+        self._prefix_tokens = (None, 0)
+
     def format_goals(self, goals: List[Goal]) -> List:
         """Format goals as system messages"""
         sep = "\n-------------------\n"
@@ -50,23 +90,22 @@ class AgentFunctionCallingActionLanguage(AgentLanguage):
         return [{"role": "system", "content": goal_instructions}]
 
     def format_memory(self, memory: Memory) -> List:
-        """Format memory items as conversation messages"""
-        items = memory.get_memories()
-        mapped_items = []
-        
-        for item in items:
-            content = item.get("content", None)
-            if not content:
-                content = json.dumps(item, indent=4)
-
-            if item["type"] == "assistant":
-                mapped_items.append({"role": "assistant", "content": content})
-            elif item["type"] == "environment":
-                mapped_items.append({"role": "assistant", "content": content})
-            else:
-                mapped_items.append({"role": "user", "content": content})
-
-        return mapped_items
+        """Format memory items as conversation messages (only new items are formatted)"""
+        return memory.formatted(self.format_item)
+
+    def format_items(self, items: List[dict]) -> List:
+        """Format a list of memory items as conversation messages"""
+        return [self.format_item(item) for item in items]
+
+    def format_item(self, item: dict) -> dict:
+        """Format one memory item as a conversation message"""
+        content = item.get("content", None)
+        if not content:
+            content = json.dumps(dict(item), indent=4)
+
+        if item["type"] in ("assistant", "environment"):
+            return {"role": "assistant", "content": content}
+        return {"role": "user", "content": content}
 
     def format_actions(self, actions: List[Action]) -> List:
         """Format actions as OpenAI function tools"""
@@ -82,17 +121,42 @@ class AgentFunctionCallingActionLanguage(AgentLanguage):
         ]
         return tools
 
+    def compile_prefix(self, actions: List[Action], goals: List[Goal]) -> PromptPrefix:
+        """Format goals and tools once so they can be reused every iteration"""
+        return PromptPrefix(
+            messages=self.format_goals(goals),
+            tools=self.format_actions(actions)
+        )
+
     def construct_prompt(self,
                          actions: List[Action],
                          environment: Environment,
                          goals: List[Goal],
-                         memory: Memory) -> Prompt:
+                         memory: Memory,
+                         prefix: PromptPrefix = None) -> Prompt:
         """Construct complete prompt with goals, memory, and tools"""
-        prompt = []
-        prompt += self.format_goals(goals)
-        prompt += self.format_memory(memory)
-        tools = self.format_actions(actions)
-        return Prompt(messages=prompt, tools=tools)
+        prefix = prefix or self.compile_prefix(actions, goals)
+        prompt = list(prefix.messages)
+        if self.retention_policy is None:
+            prompt += self.format_memory(memory)
+        else:
+            items = self.retention_policy.apply(
+                memory.get_memories(), reserved_tokens=self.prefix_tokens(prefix), memory=memory
+            )
+            prompt += memory.formatted_items(items, self.format_item)
+        return Prompt(
+            messages=prompt,
+            tools=prefix.tools,
+            metadata={"prefix_messages": len(prefix.messages)}
+        )
+
+    def prefix_tokens(self, prefix: PromptPrefix) -> int:
+        """Token count of the compiled prefix, measured once per prefix"""
+        cached_prefix, tokens = self._prefix_tokens
+        if cached_prefix is not prefix:
+            tokens = self.retention_policy.prefix_tokens(prefix.messages, prefix.tools)
+            self._prefix_tokens = (prefix, tokens)
+        return tokens
 
     def parse_response(self, response: str) -> dict:
         """Parse LLM response into structured format"""
@@ -103,3 +167,10 @@ class AgentFunctionCallingActionLanguage(AgentLanguage):
                 "tool": "terminate",
                 "args": {"message": response}
             }
+
+    def parse_invocations(self, response: str) -> List[dict]:
+        """Parse a single or multi-call response into a list of invocations"""
+        parsed = self.parse_response(response)
+        if isinstance(parsed, dict) and "tool_calls" in parsed:
+            return parsed["tool_calls"]
+        return [parsed]
@@ -1,36 +1,525 @@
+import asyncio
 import json
-from litellm import completion
+import random
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
 from .language import Prompt
 
 
-def generate_response(prompt: Prompt, model: str = "openai/gpt-4o") -> str:
-    """Generate response from LLM using function calling"""
+def _provider(model: str) -> str:
+    """The provider serving ``model`` ("provider/name", or a bare OpenAI or Claude name)"""
+    if "/" in model:
+        return model.split("/", 1)[0]
+    return "anthropic" if model.startswith("claude") else "openai"
+
+
+def _supports_cache_control(model: str) -> bool:
+    """Whether the provider needs explicit prompt caching breakpoints"""
+    return _provider(model) == "anthropic"
+
+
+def _mark_cached_prefix(messages: list, prefix_length: int) -> list:
+    """Mark the end of the static prefix with an Anthropic cache breakpoint.
+
+    Anthropic caches tools, then system, then messages, so a breakpoint on the
+    last prefix message covers the tool schemas as well. Only the marked
+    message is copied; the compiled prefix itself is left untouched.
+    """
+    if not prefix_length or prefix_length > len(messages):
+        return messages
+    last = messages[prefix_length - 1]
+    if not isinstance(last.get("content"), str):
+        return messages
+    marked = list(messages)
+    marked[prefix_length - 1] = {
+        **last,
+        "content": [{
+            "type": "text",
+            "text": last["content"],
+            "cache_control": {"type": "ephemeral"},
+        }],
+    }
+    return marked
+
+
+def _build_request(prompt: Prompt, model: str, max_tokens: int = 1024) -> dict:
+    """Build the completion kwargs for a prompt"""
     messages = prompt.messages
-    tools = prompt.tools
-
-    if not tools:
-        response = completion(
-            model=model,
-            messages=messages,
-            max_tokens=1024
-        )
-        return response.choices[0].message.content
-    else:
-        # The inclusion of the tools parameter, tells the model what functions it can call. 
-        # This is what activates the function calling mechanism.
-        response = completion(
-            model=model,
-            messages=messages,
-            tools=tools,
-            max_tokens=1024
-        )
-
-        if response.choices[0].message.tool_calls:
-            tool = response.choices[0].message.tool_calls[0]
-            result = {
+    if _supports_cache_control(model):
+        messages = _mark_cached_prefix(messages, prompt.metadata.get("prefix_messages", 0))
+
+    request = {
+        "model": model,
+        "messages": messages,
+        "max_tokens": max_tokens,
+    }
+    # The inclusion of the tools parameter, tells the model what functions it can call.
+    # This is what activates the function calling mechanism.
+    if prompt.tools:
+        request["tools"] = prompt.tools
+    return request
+
+
+def _encode_calls(calls: List[dict]) -> str:
+    """Encode parsed tool calls in the agent's response format"""
+    if len(calls) == 1:
+        return json.dumps(calls[0])
+    # Several calls in one turn are independent; keep them all so the
+    # environment can run them together instead of one per round trip.
+    return json.dumps({"tool_calls": calls})
+
+
+def _parse_completion(response, has_tools: bool) -> str:
+    """Turn a completion response into the agent's response string"""
+    message = response.choices[0].message
+    if has_tools and message.tool_calls:
+        calls = [
+            {
                 "tool": tool.function.name,
                 "args": json.loads(tool.function.arguments),
-            }
-            return json.dumps(result)
-        else:
-            return response.choices[0].message.content
+            } for tool in message.tool_calls
+        ]
+        return _encode_calls(calls)
+    return message.content
+
+
+class ToolCallAssembler:
+    """Rebuilds tool calls from streamed deltas.
+
+    A call is reported through ``on_tool_call(index, invocation)`` as soon as
+    its name is known and its arguments parse as a complete JSON object, which
+    is usually well before the stream ends. Parsing is only attempted when a
+    delta could have closed the object.
+    """
+
+    def __init__(self, on_tool_call: Optional[Callable[[int, dict], None]] = None):
+        self.on_tool_call = on_tool_call
+        self._calls: Dict[int, dict] = {}
+
+    def feed(self, deltas):
+        """Consume the tool_calls list of one streamed delta"""
+        for delta in deltas:
+            call = self._calls.setdefault(delta.index, {"name": "", "arguments": "", "args": None})
+            function = delta.function
+            if function is None:
+                continue
+            if function.name:
+                call["name"] += function.name
+            if function.arguments:
+                call["arguments"] += function.arguments
+                if call["args"] is None and "}" in function.arguments:
+                    self._try_complete(delta.index, call)
+
+    def _try_complete(self, index: int, call: dict):
+        try:
+            args = json.loads(call["arguments"])
+        except ValueError:
+            return
+        call["args"] = args
+        if self.on_tool_call and call["name"]:
+            self.on_tool_call(index, {"tool": call["name"], "args": args})
+
+    def finish(self) -> List[dict]:
+        """Return every call in index order once the stream has ended"""
+        calls = []
+        for index in sorted(self._calls):
+            call = self._calls[index]
+            if call["args"] is None:
+                call["args"] = json.loads(call["arguments"] or "{}")
+                if self.on_tool_call:
+                    self.on_tool_call(index, {"tool": call["name"], "args": call["args"]})
+            calls.append({"tool": call["name"], "args": call["args"]})
+        return calls
+
+
+_litellm_lock = threading.Lock()
+_litellm_module = None
+
+
+def _litellm():
+    """Import litellm once, resolving the entry points used here in one thread.
+
+    litellm loads most of its attributes lazily on first access, and that
+    loader is not safe to run from several threads at once, so concurrent
+    first requests (or litellm's own logging thread) could see it half-done.
+    """
+    global _litellm_module
+    if _litellm_module is None:
+        with _litellm_lock:
+            if _litellm_module is None:
+                # litellm (and the openai/httpx stack under it) takes seconds
+                # to import, so it is only loaded when the first request is made
+                import litellm
+                for name in ("completion", "acompletion", "get_model_info"):
+                    getattr(litellm, name)
+                _litellm_module = litellm
+    return _litellm_module
+
+
+class ProviderLimiter:
+    """Caps the number of in-flight requests to one provider.
+
+    Shared by threads and by every event loop in the process. Waiters queue
+    in arrival order and a released slot is handed straight to the next one:
+    a thread blocks on an Event, a coroutine awaits a future on its own loop.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._available = limit
+        self._waiters: Deque[Tuple[Optional[asyncio.AbstractEventLoop], Any]] = deque()
+
+    def __enter__(self):
+        with self._lock:
+            if self._available:
+                self._available -= 1
+                return self
+            event = threading.Event()
+            self._waiters.append((None, event))
+        event.wait()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    async def __aenter__(self):
+        with self._lock:
+            if self._available:
+                self._available -= 1
+                return self
+            loop = asyncio.get_running_loop()
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                granted = waiter not in self._waiters
+                if not granted:
+                    self._waiters.remove(waiter)
+            if granted:
+                self.release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc):
+        self.release()
+
+    def release(self):
+        """Free a slot, or hand it to the longest waiter"""
+        while True:
+            with self._lock:
+                if not self._waiters:
+                    self._available += 1
+                    return
+                loop, waiter = self._waiters.popleft()
+            if loop is None:
+                waiter.set()
+                return
+            try:
+                loop.call_soon_threadsafe(_wake, waiter)
+                return
+            except RuntimeError:
+                # The waiter's loop has closed; give the slot to the next one
+                continue
+
+
+def _wake(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+async def _client_lifetime(client):
+    """Holds an async client open until the loop finalizes this generator"""
+    try:
+        yield client
+    finally:
+        await client.close()
+
+
+_limiters: Dict[str, ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_provider_limiter(provider: str, limit: int) -> ProviderLimiter:
+    """Return the process-wide limiter for a provider (first limit wins)"""
+    with _limiters_lock:
+        if provider not in _limiters:
+            _limiters[provider] = ProviderLimiter(limit)
+        return _limiters[provider]
+
+
+class LLMClient:
+    """Configured, pooled entry point for model calls.
+
+    Holds the model and sampling settings, keeps HTTP connections alive
+    between calls, limits concurrency per provider and retries transient
+    failures (429, 5xx, timeouts, dropped connections) with jittered
+    exponential backoff. ``generate``/``agenerate``/``astream`` have the same
+    signatures as the module-level functions, so a client can be handed to
+    an Agent wherever a generate_response callable was used before.
+    """
+
+    RETRYABLE_STATUS = frozenset({408, 409, 429, 500, 502, 503, 504, 529})
+
+    def __init__(self,
+                 model: str = "openai/gpt-4o",
+                 max_tokens: int = 1024,
+                 temperature: Optional[float] = None,
+                 timeout: float = 60.0,
+                 max_retries: int = 3,
+                 backoff_base: float = 0.5,
+                 backoff_max: float = 8.0,
+                 max_concurrency: int = 8,
+                 pool_size: int = 20,
+                 api_base: Optional[str] = None,
+                 api_key: Optional[str] = None):
+        self.model = model
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.pool_size = pool_size
+        self.api_base = api_base
+        self.api_key = api_key
+        self.limiter = get_provider_limiter(self.provider, max_concurrency)
+        self._http_client = None
+        self._async_clients = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, agent_key: Optional[str] = None, **overrides) -> "LLMClient":
+        """Build a client from config.py, with agents.yaml overrides per agent"""
+        from ..config import config
+
+        agent_config = config.get_agent_config(agent_key) if agent_key else {}
+        settings = {
+            "model": agent_config.get("model", config.DEFAULT_MODEL),
+            "max_tokens": agent_config.get("max_tokens", config.MAX_TOKENS),
+            "temperature": agent_config.get("temperature", config.LLM_TEMPERATURE),
+            "timeout": config.LLM_TIMEOUT,
+            "max_retries": config.LLM_MAX_RETRIES,
+            "backoff_base": config.LLM_BACKOFF_BASE,
+            "backoff_max": config.LLM_BACKOFF_MAX,
+            "max_concurrency": config.LLM_MAX_CONCURRENCY,
+            "pool_size": config.LLM_POOL_SIZE,
+            "api_base": config.LLM_API_BASE,
+        }
+        settings.update(overrides)
+        return cls(**settings)
+
+    @property
+    def provider(self) -> str:
+        return _provider(self.model)
+
+    @property
+    def settings(self) -> dict:
+        """The settings that change a response (used in cache keys)"""
+        return {"model": self.model, "max_tokens": self.max_tokens, "temperature": self.temperature}
+
+    def max_prompt_tokens(self) -> Optional[int]:
+        """Input budget for the model: its context window minus the completion"""
+        try:
+            info = _litellm().get_model_info(self.model)
+        except Exception:
+            return None
+        window = info.get("max_input_tokens") or info.get("max_tokens")
+        return window - self.max_tokens if window else None
+
+    def _uses_openai_client(self) -> bool:
+        return self.provider == "openai"
+
+    def _sync_client(self):
+        """Shared OpenAI client over a keep-alive connection pool"""
+        if self._http_client is None:
+            with self._lock:
+                if self._http_client is None:
+                    import httpx
+                    from openai import OpenAI
+                    self._http_client = OpenAI(
+                        api_key=self.api_key,
+                        base_url=self.api_base,
+                        timeout=self.timeout,
+                        max_retries=0,
+                        http_client=httpx.Client(limits=self._limits(), timeout=self.timeout),
+                    )
+        return self._http_client
+
+    async def _async_client(self):
+        """Async clients are bound to a loop, so keep one per running loop.
+
+        The client is closed when its loop shuts down (asyncio.run and
+        run_sync's loop both finalize async generators on the way out).
+        """
+        loop = asyncio.get_running_loop()
+        entry = self._async_clients.get(loop)
+        if entry is None:
+            import httpx
+            from openai import AsyncOpenAI
+            client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.api_base,
+                timeout=self.timeout,
+                max_retries=0,
+                http_client=httpx.AsyncClient(limits=self._limits(), timeout=self.timeout),
+            )
+            lifetime = _client_lifetime(client)
+            await lifetime.__anext__()
+            entry = self._async_clients[loop] = (client, lifetime)
+        return entry[0]
+
+    def _limits(self):
+        import httpx
+        return httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size)
+
+    def request_kwargs(self, prompt: Prompt, **overrides) -> dict:
+        """Completion kwargs for a prompt with this client's settings"""
+        model = overrides.pop("model", None) or self.model
+        request = _build_request(prompt, model, overrides.pop("max_tokens", self.max_tokens))
+        temperature = overrides.pop("temperature", self.temperature)
+        if temperature is not None:
+            request["temperature"] = temperature
+        request["timeout"] = self.timeout
+        # Retries are handled here, with backoff shared across providers
+        request["max_retries"] = 0
+        if self.api_base:
+            request["api_base"] = self.api_base
+        if self.api_key:
+            request["api_key"] = self.api_key
+        request.update(overrides)
+        return request
+
+    def is_retryable(self, error: Exception) -> bool:
+        status = getattr(error, "status_code", None)
+        if status in self.RETRYABLE_STATUS:
+            return True
+        return isinstance(error, (TimeoutError, ConnectionError))
+
+    def retry_delay(self, attempt: int, error: Exception) -> float:
+        """Full-jitter backoff, honouring a Retry-After header when present"""
+        response = getattr(error, "response", None)
+        retry_after = getattr(response, "headers", {}).get("retry-after") if response is not None else None
+        try:
+            if retry_after is not None:
+                return min(float(retry_after), self.backoff_max)
+        except (TypeError, ValueError):
+            pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _completion(self, **request):
+        return _litellm().completion(**request)
+
+    async def _acompletion(self, **request):
+        return await _litellm().acompletion(**request)
+
+    def generate(self, prompt: Prompt, **overrides) -> str:
+        """Generate a response, retrying transient failures"""
+        request = self.request_kwargs(prompt, **overrides)
+        if self._uses_openai_client():
+            request["client"] = self._sync_client()
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self.limiter:
+                    response = self._completion(**request)
+                return _parse_completion(response, bool(prompt.tools))
+            except Exception as e:
+                if attempt == self.max_retries or not self.is_retryable(e):
+                    raise
+                time.sleep(self.retry_delay(attempt, e))
+
+    __call__ = generate
+
+    async def agenerate(self, prompt: Prompt, **overrides) -> str:
+        """Async variant of generate"""
+        request = self.request_kwargs(prompt, **overrides)
+        if self._uses_openai_client():
+            request["client"] = await self._async_client()
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self.limiter:
+                    response = await self._acompletion(**request)
+                return _parse_completion(response, bool(prompt.tools))
+            except Exception as e:
+                if attempt == self.max_retries or not self.is_retryable(e):
+                    raise
+                await asyncio.sleep(self.retry_delay(attempt, e))
+
+    async def astream(self,
+                      prompt: Prompt,
+                      on_text: Optional[Callable[[str], None]] = None,
+                      on_tool_call: Optional[Callable[[int, dict], None]] = None,
+                      **overrides) -> str:
+        """Stream a completion, forwarding text deltas and completed tool calls early.
+
+        Only opening the stream is retried; once deltas have been forwarded a
+        failure is raised to the caller.
+        """
+        request = self.request_kwargs(prompt, stream=True, **overrides)
+        if self._uses_openai_client():
+            request["client"] = await self._async_client()
+        async with self.limiter:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    response = await self._acompletion(**request)
+                    break
+                except Exception as e:
+                    if attempt == self.max_retries or not self.is_retryable(e):
+                        raise
+                    await asyncio.sleep(self.retry_delay(attempt, e))
+
+            assembler = ToolCallAssembler(on_tool_call)
+            text = []
+            async for chunk in response:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                if delta.content:
+                    text.append(delta.content)
+                    if on_text:
+                        on_text(delta.content)
+                if delta.tool_calls:
+                    assembler.feed(delta.tool_calls)
+
+        calls = assembler.finish()
+        if prompt.tools and calls:
+            return _encode_calls(calls)
+        return "".join(text)
+
+
+_default_client: Optional[LLMClient] = None
+
+
+def get_default_client() -> LLMClient:
+    """The configured client behind the module-level functions"""
+    global _default_client
+    if _default_client is None:
+        _default_client = LLMClient.from_config()
+    return _default_client
+
+
+def generate_response(prompt: Prompt, model: Optional[str] = None) -> str:
+    """Generate response from LLM using function calling"""
+    return get_default_client().generate(prompt, model=model)
+
+
+async def agenerate_response(prompt: Prompt, model: Optional[str] = None) -> str:
+    """Async variant of generate_response backed by litellm.acompletion"""
+    return await get_default_client().agenerate(prompt, model=model)
+
+
+async def astream_response(prompt: Prompt,
+                           model: Optional[str] = None,
+                           on_text: Optional[Callable[[str], None]] = None,
+                           on_tool_call: Optional[Callable[[int, dict], None]] = None) -> str:
+    """Stream a completion, forwarding text deltas and completed tool calls early.
+
+    Returns the same response string as generate_response once the stream ends.
+    """
+    return await get_default_client().astream(prompt, on_text=on_text, on_tool_call=on_tool_call, model=model)
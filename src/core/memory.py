@@ -1,33 +1,194 @@
-from typing import List, Dict, Optional
+import time
+from collections.abc import Mapping
+from typing import Any, Callable, Iterator, List, Dict, Optional, Union
+
+_CORE_KEYS = ("type", "content", "tool")
+
+# Bumped by every MemoryItem.__setitem__ so Memory.formatted drops messages
+# formatted from the old value (items can be shared between memories)
+_mutations = 0
+
+
+class MemoryItem(Mapping):
+    """One memory record.
+
+    Stored in fixed slots instead of a dict; reading it as a mapping
+    (``item["type"]``, ``item.get("content")``, ``{**item}``) shows the same
+    keys as the dict it was created from. ``size`` and ``timestamp`` are
+    record metadata and are not part of the mapping view. A core key set
+    to None (``{"content": None}``) stays in the view, as in a dict.
+    Change items through ``item[key] = value`` so cached messages are
+    refreshed.
+    """
+
+    __slots__ = ("type", "content", "tool", "size", "timestamp", "extra", "_nulls")
+
+    def __init__(self, type: Optional[str] = None, content: Any = None, tool: Optional[str] = None,
+                 extra: Optional[dict] = None, timestamp: Optional[float] = None):
+        self.type = type
+        self.content = content
+        self.tool = tool
+        self.size = len(content) if isinstance(content, str) else len(str(content or ""))
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.extra = extra or None
+        # Core keys explicitly set to None
+        self._nulls = ()
+
+    @classmethod
+    def from_dict(cls, memory: Union[dict, "MemoryItem"]) -> "MemoryItem":
+        if isinstance(memory, MemoryItem):
+            return memory
+        extra = {k: v for k, v in memory.items() if k not in _CORE_KEYS}
+        item = cls(memory.get("type"), memory.get("content"), memory.get("tool"), extra)
+        item._nulls = tuple(k for k in _CORE_KEYS if k in memory and memory[k] is None)
+        return item
+
+    @property
+    def role(self) -> str:
+        """Provider message role the item is sent as"""
+        return "assistant" if self.type in ("assistant", "environment") else "user"
+
+    def to_dict(self) -> dict:
+        return dict(self.items())
+
+    def _keys(self) -> Iterator[str]:
+        for key in _CORE_KEYS:
+            if getattr(self, key) is not None or key in self._nulls:
+                yield key
+        if self.extra:
+            yield from self.extra
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _CORE_KEYS:
+            value = getattr(self, key)
+            if value is not None or key in self._nulls:
+                return value
+        elif self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        # Same result as Mapping.get without the KeyError round trip (hot in retention policies)
+        if key == "type":
+            value = self.type
+        elif key == "content":
+            value = self.content
+        elif key == "tool":
+            value = self.tool
+        else:
+            return self.extra.get(key, default) if self.extra else default
+        return default if value is None and key not in self._nulls else value
+
+    def __setitem__(self, key: str, value: Any):
+        global _mutations
+        if key in _CORE_KEYS:
+            setattr(self, key, value)
+            nulls = tuple(k for k in self._nulls if k != key)
+            self._nulls = nulls + (key,) if value is None else nulls
+            if key == "content":
+                self.size = len(value) if isinstance(value, str) else len(str(value or ""))
+        else:
+            self.extra = {**(self.extra or {}), key: value}
+        _mutations += 1
+
+    def __iter__(self) -> Iterator[str]:
+        return self._keys()
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._keys())
+
+    def __repr__(self) -> str:
+        return f"MemoryItem({self.to_dict()!r})"
 
 
 class Memory:
-    """Manages agent memory and conversation history"""
-    
+    """Manages agent memory and conversation history.
+
+    Items are MemoryItem records (dicts passed to add_memory are converted).
+    ``formatted`` keeps an append-only cache of provider messages, so each
+    iteration formats only the items added since the last one (it starts
+    over after an item is changed in place).
+    """
+
     def __init__(self):
-        self.items = []
+        self._items: List[MemoryItem] = []
+        self._formatter = None
+        self._formatted: List[dict] = []
+        self._formatted_last = None
+        self._formatted_mutations = _mutations
+        self._positions: Dict[int, int] = {}
 
-    def add_memory(self, memory: dict):
+    @property
+    def items(self) -> List[MemoryItem]:
+        return self._items
+
+    @items.setter
+    def items(self, items: List[Union[dict, MemoryItem]]):
+        self._items = [MemoryItem.from_dict(m) for m in items]
+        self._formatted = []
+        self._positions = {}
+
+    def add_memory(self, memory: Union[dict, MemoryItem]):
         """Add a memory item"""
-        self.items.append(memory)
+        self._items.append(MemoryItem.from_dict(memory))
 
-    def get_memories(self, limit: int = None) -> List[Dict]:
+    def get_memories(self, limit: int = None) -> List[MemoryItem]:
         """Get memory items, optionally limited"""
         if limit:
-            return self.items[-limit:]
-        return self.items
+            return self._items[-limit:]
+        return self._items
+
+    def formatted(self, format_item: Callable[[MemoryItem], dict]) -> List[dict]:
+        """Every item formatted with ``format_item``, reusing earlier results.
+
+        The returned list is the cache itself and must not be modified.
+        """
+        cached = len(self._formatted)
+        if (format_item != self._formatter or cached > len(self._items)
+                or (cached and self._formatted_last is not self._items[cached - 1])
+                or self._formatted_mutations != _mutations):
+            self._formatter = format_item
+            self._formatted = []
+            self._positions = {}
+            self._formatted_mutations = _mutations
+            cached = 0
+        if cached < len(self._items):
+            new = self._items[cached:]
+            self._formatted.extend(format_item(item) for item in new)
+            self._positions.update((id(item), cached + i) for i, item in enumerate(new))
+            self._formatted_last = self._items[-1]
+        return self._formatted
+
+    def formatted_items(self, items: List[Union[dict, MemoryItem]],
+                        format_item: Callable[[MemoryItem], dict]) -> List[dict]:
+        """Messages for a selection of items (e.g. chosen by a retention policy).
+
+        Items of this memory reuse their cached message from ``formatted``;
+        anything else (such as a truncated copy) is formatted on the spot.
+        """
+        messages = self.formatted(format_item)
+        selected = []
+        for item in items:
+            index = self._positions.get(id(item))
+            if index is not None and self._items[index] is item:
+                selected.append(messages[index])
+            else:
+                selected.append(format_item(item))
+        return selected
 
     def copy_without_system_memories(self):
         """Return a copy without system memories"""
-        filtered_items = [m for m in self.items if m.get("type") != "system"]
+        filtered_items = [m for m in self._items if m.get("type") != "system"]
         memory = Memory()
         memory.items = filtered_items
         return memory
 
     def clear(self):
         """Clear all memory"""
-        self.items = []
+        self._items = []
+        self._formatted = []
+        self._positions = {}
 
-    def get_last_memory(self) -> Optional[Dict]:
+    def get_last_memory(self) -> Optional[MemoryItem]:
         """Get the most recent memory item"""
-        return self.items[-1] if self.items else None
+        return self._items[-1] if self._items else None
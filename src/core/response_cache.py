@@ -0,0 +1,153 @@
+"""Persistent cache for LLM responses.
+
+Responses are keyed on a canonical hash of the model, messages, tools and
+sampling settings. Lookups go to an in-process LRU with TTL first and fall
+back to an optional SQLite file, so repeated runs of the same query (and
+separate worker processes) can skip the paid model round trip.
+"""
+
+import functools
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from .language import Prompt
+
+
+class ResponseCache:
+    """Two-tier (memory LRU + SQLite) cache of generate_response results"""
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 1024, ttl: Optional[float] = 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, response TEXT NOT NULL, expires_at REAL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def key(prompt: Prompt, **settings) -> str:
+        """Canonical key for a prompt and the request settings"""
+        return prompt.fingerprint(**settings)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a cached response or None"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, response = entry
+                if expires_at is None or expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return response
+                del self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT response, expires_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row and (row[1] is None or row[1] > now):
+                    self._remember(key, row[0], row[1])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, response: str):
+        """Store a response in both tiers"""
+        expires_at = time.time() + self.ttl if self.ttl else None
+        with self._lock:
+            self._remember(key, response, expires_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, expires_at) VALUES (?, ?, ?)",
+                    (key, response, expires_at)
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, response: str, expires_at: Optional[float]):
+        self._entries[key] = (expires_at, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached response"""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+            }
+
+    def wrap(self, generate_response: Callable[..., str], **settings) -> Callable[..., str]:
+        """Wrap a sync generate_response; ``settings`` (model, sampling) join the key"""
+        @functools.wraps(generate_response)
+        def wrapper(prompt: Prompt, *args, **kwargs):
+            key = self.key(prompt, **settings, **kwargs)
+            response = self.get(key)
+            if response is None:
+                response = generate_response(prompt, *args, **kwargs)
+                if response is not None:
+                    self.set(key, response)
+            return response
+        return wrapper
+
+    def wrap_async(self, agenerate_response: Callable, **settings) -> Callable:
+        """Wrap an async generate_response"""
+        @functools.wraps(agenerate_response)
+        async def wrapper(prompt: Prompt, *args, **kwargs):
+            key = self.key(prompt, **settings, **kwargs)
+            response = self.get(key)
+            if response is None:
+                response = await agenerate_response(prompt, *args, **kwargs)
+                if response is not None:
+                    self.set(key, response)
+            return response
+        return wrapper
+
+    def attach(self, agent, **settings):
+        """Opt an agent in to the cache (streaming is turned off for it)"""
+        agent.generate_response = self.wrap(agent.generate_response, **settings)
+        if agent.agenerate_response:
+            agent.agenerate_response = self.wrap_async(agent.agenerate_response, **settings)
+        agent.stream_response = None
+        return agent
+
+
+_shared_caches: Dict[tuple, ResponseCache] = {}
+_shared_lock = threading.Lock()
+
+
+def get_response_cache(path: Optional[str] = None, max_entries: int = 1024,
+                       ttl: Optional[float] = 3600) -> ResponseCache:
+    """Return the process-wide cache for a path so agents share hits"""
+    key = (path, max_entries, ttl)
+    with _shared_lock:
+        if key not in _shared_caches:
+            _shared_caches[key] = ResponseCache(path, max_entries=max_entries, ttl=ttl)
+        return _shared_caches[key]
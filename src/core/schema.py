@@ -0,0 +1,328 @@
+"""JSON schemas from type hints, and compiled argument validators.
+
+``json_schema`` turns a parameter's annotation (``Optional[str]``,
+``List[int]``, ``Literal["a", "b"]``, ...) into the schema offered to the
+model. ``compile_validator`` turns a tool's parameters schema into a function
+that checks and coerces the model's arguments before the tool runs, so a bad
+call comes back as a short error the model can fix instead of a traceback.
+"""
+
+import enum
+import json
+import types
+import typing
+from typing import Any, Callable, Dict, List
+
+# ``X | Y`` unions have their own origin type (Python 3.10+)
+_UNION_TYPES = tuple(t for t in (typing.Union, getattr(types, "UnionType", None)) if t is not None)
+
+_PRIMITIVES = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    type(None): "null",
+}
+_ARRAYS = (list, tuple, set, frozenset, typing.Sequence, typing.Iterable)
+_OBJECTS = (dict, typing.Mapping)
+
+
+class ArgumentError(ValueError):
+    """Tool arguments that do not match the tool's schema.
+
+    ``errors`` maps each offending argument (dotted path for nested values)
+    to a short description of the problem.
+    """
+
+    def __init__(self, tool: str, errors: Dict[str, str]):
+        self.tool = tool
+        self.errors = errors
+        details = "; ".join(f"{path}: {message}" for path, message in errors.items())
+        super().__init__(f"Invalid arguments for {tool}: {details}")
+
+
+def json_schema(hint: Any) -> dict:
+    """JSON schema for a type hint (unknown classes are treated as strings)"""
+    if hint is Any:
+        return {}
+    if hint in _PRIMITIVES:
+        return {"type": _PRIMITIVES[hint]}
+    if isinstance(hint, type) and issubclass(hint, enum.Enum):
+        values = [member.value for member in hint]
+        return {**_literal_type(values), "enum": values}
+
+    origin = typing.get_origin(hint)
+    args = typing.get_args(hint)
+    if origin is typing.Annotated:
+        schema = json_schema(args[0])
+        descriptions = [meta for meta in args[1:] if isinstance(meta, str)]
+        if descriptions:
+            schema["description"] = " ".join(descriptions)
+        return schema
+    if origin is typing.Literal:
+        values = list(args)
+        return {**_literal_type(values), "enum": values}
+    if origin in _UNION_TYPES:
+        options = [a for a in args if a is not type(None)]
+        nullable = len(options) < len(args)
+        schemas = [json_schema(a) for a in options]
+        if len(schemas) == 1:
+            schema = schemas[0]
+        elif all(set(s) == {"type"} and isinstance(s["type"], str) for s in schemas):
+            schema = {"type": [s["type"] for s in schemas]}
+        else:
+            schema = {"anyOf": schemas}
+        if nullable:
+            schema = _nullable(schema)
+        return schema
+    if hint in _ARRAYS or origin in _ARRAYS:
+        schema = {"type": "array"}
+        if args:
+            variadic = origin is not tuple or (len(args) == 2 and args[1] is Ellipsis)
+            items = args[:1] if variadic else tuple(dict.fromkeys(args))
+            schema["items"] = json_schema(typing.Union[items] if len(items) > 1 else items[0])
+        return schema
+    if hint in _OBJECTS or origin in _OBJECTS:
+        schema = {"type": "object"}
+        if len(args) == 2 and args[1] is not Any:
+            schema["additionalProperties"] = json_schema(args[1])
+        return schema
+    return {"type": "string"}
+
+
+def _literal_type(values: list) -> dict:
+    kinds = {_PRIMITIVES.get(type(v)) for v in values}
+    return {"type": kinds.pop()} if len(kinds) == 1 and None not in kinds else {}
+
+
+def _nullable(schema: dict) -> dict:
+    if "enum" in schema:
+        schema = {**schema, "enum": schema["enum"] + [None]}
+    kind = schema.get("type")
+    if isinstance(kind, str):
+        return {**schema, "type": [kind, "null"]}
+    if isinstance(kind, list):
+        return {**schema, "type": kind + ["null"]}
+    if "anyOf" in schema:
+        return {**schema, "anyOf": schema["anyOf"] + [{"type": "null"}]}
+    return schema
+
+
+class _Invalid(Exception):
+    """Raised inside compiled checks; carries the path and message"""
+
+    def __init__(self, path: str, message: str):
+        self.path = path
+        self.message = message
+
+
+def _describe(value: Any) -> str:
+    text = repr(value)
+    return text if len(text) <= 40 else text[:37] + "..."
+
+
+def _parse_json(value: Any, expected: type) -> Any:
+    if isinstance(value, str):
+        try:
+            parsed = json.loads(value)
+        except ValueError:
+            return value
+        if isinstance(parsed, expected):
+            return parsed
+    return value
+
+
+def _coerce_string(value, path):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    raise _Invalid(path, f"expected string, got {_describe(value)}")
+
+
+def _coerce_integer(value, path):
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            pass
+    raise _Invalid(path, f"expected integer, got {_describe(value)}")
+
+
+def _coerce_number(value, path):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        try:
+            return float(value.strip())
+        except ValueError:
+            pass
+    raise _Invalid(path, f"expected number, got {_describe(value)}")
+
+
+def _coerce_boolean(value, path):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+        return value.strip().lower() == "true"
+    raise _Invalid(path, f"expected boolean, got {_describe(value)}")
+
+
+def _coerce_null(value, path):
+    if value is None:
+        return None
+    raise _Invalid(path, f"expected null, got {_describe(value)}")
+
+
+def _compile(schema: dict) -> Callable[[Any, str], Any]:
+    """Build the check for one schema node; returns check(value, path)"""
+    if not schema:
+        return lambda value, path: value
+
+    if "anyOf" in schema:
+        options = [_compile(option) for option in schema["anyOf"]]
+        return _first_match(options, "expected one of the allowed types")
+
+    kind = schema.get("type")
+    if isinstance(kind, list):
+        check = _compile_types(schema, kind)
+    elif kind == "array":
+        check = _compile_array(schema)
+    elif kind == "object":
+        check = _compile_object(schema)
+    else:
+        check = {
+            "string": _coerce_string,
+            "integer": _coerce_integer,
+            "number": _coerce_number,
+            "boolean": _coerce_boolean,
+            "null": _coerce_null,
+        }.get(kind, lambda value, path: value)
+
+    if "enum" in schema and not isinstance(kind, list):
+        allowed = list(schema["enum"])
+        message = f"expected one of {', '.join(json.dumps(v) for v in allowed)}"
+        base = check
+
+        def check(value, path):
+            value = base(value, path)
+            if value not in allowed:
+                raise _Invalid(path, f"{message}, got {_describe(value)}")
+            return value
+    return check
+
+
+def _kind(value: Any) -> str:
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, dict):
+        return "object"
+    if isinstance(value, (list, tuple)):
+        return "array"
+    return _PRIMITIVES.get(type(value), "")
+
+
+def _compile_types(schema: dict, kinds: List[str]) -> Callable:
+    """Check for a list of types; the value's own type is tried before coercing"""
+    branches = {k: _compile({**schema, "type": k}) for k in kinds}
+    fallback = _first_match(list(branches.values()), f"expected {' or '.join(kinds)}")
+
+    def check(value, path):
+        exact = branches.get(_kind(value))
+        if exact is not None:
+            try:
+                return exact(value, path)
+            except _Invalid:
+                pass
+        return fallback(value, path)
+    return check
+
+
+def _first_match(options: List[Callable], message: str) -> Callable:
+    def check(value, path):
+        for option in options:
+            try:
+                return option(value, path)
+            except _Invalid:
+                continue
+        raise _Invalid(path, f"{message}, got {_describe(value)}")
+    return check
+
+
+def _compile_array(schema: dict) -> Callable:
+    item = _compile(schema["items"]) if schema.get("items") else None
+
+    def check(value, path):
+        value = _parse_json(value, list)
+        if isinstance(value, (tuple, set, frozenset)):
+            value = list(value)
+        if not isinstance(value, list):
+            raise _Invalid(path, f"expected array, got {_describe(value)}")
+        if item is None:
+            return value
+        return [item(v, f"{path}[{i}]") for i, v in enumerate(value)]
+    return check
+
+
+def _compile_object(schema: dict) -> Callable:
+    properties = {name: _compile(s) for name, s in schema.get("properties", {}).items()}
+    required = list(schema.get("required", []))
+    extra = schema.get("additionalProperties", True)
+    extra_check = _compile(extra) if isinstance(extra, dict) else None
+
+    def check(value, path):
+        value = _parse_json(value, dict)
+        if not isinstance(value, dict):
+            raise _Invalid(path, f"expected object, got {_describe(value)}")
+        prefix = f"{path}." if path else ""
+        result = {}
+        for key, item in value.items():
+            field = properties.get(key)
+            if field is not None:
+                result[key] = field(item, prefix + key)
+            elif extra_check is not None:
+                result[key] = extra_check(item, prefix + key)
+            elif extra is False:
+                raise _Invalid(prefix + key, "unexpected argument")
+            else:
+                result[key] = item
+        for key in required:
+            if key not in value:
+                raise _Invalid(prefix + key, "missing required argument")
+        return result
+    return check
+
+
+def compile_validator(tool: str, parameters: dict) -> Callable[[dict], dict]:
+    """Compile a tool's parameters schema into ``validate(args) -> args``.
+
+    Arguments are coerced where the intent is unambiguous (``"5"`` for an
+    integer, a JSON string for an array) and every problem found is reported
+    together in an ArgumentError. Names not in the schema are rejected.
+    """
+    properties = {name: _compile(s) for name, s in (parameters or {}).get("properties", {}).items()}
+    required = list((parameters or {}).get("required", []))
+
+    def validate(args: dict) -> dict:
+        errors = {}
+        result = {}
+        for key, value in (args or {}).items():
+            check = properties.get(key)
+            if check is None:
+                errors[key] = "unexpected argument"
+                continue
+            try:
+                result[key] = check(value, key)
+            except _Invalid as e:
+                errors[e.path] = e.message
+        for key in required:
+            if key not in result and key not in errors:
+                errors[key] = "missing required argument"
+        if errors:
+            raise ArgumentError(tool, errors)
+        return result
+    return validate
@@ -0,0 +1,123 @@
+"""Coalescing of identical in-flight LLM requests.
+
+When several callers send a byte-identical prompt at the same moment, only
+the first (the leader) calls the model; the others wait for its result.
+Works across threads and event loops because waiters share a
+concurrent.futures.Future rather than a loop-bound asyncio future.
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import CancelledError, Future
+from typing import Callable, Dict, Tuple
+
+from .language import Prompt
+
+
+class SingleFlight:
+    """Shares one upstream call between concurrent callers with the same key"""
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(prompt: Prompt, **settings) -> str:
+        return prompt.fingerprint(**settings)
+
+    def _join(self, key: str) -> Tuple[Future, bool]:
+        """Return the in-flight future for key and whether the caller leads it"""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            self.calls += 1
+            return future, True
+
+    def _settle(self, key: str, future: Future, result=None, error: BaseException = None):
+        # Forget the key first so callers arriving later start a fresh request
+        with self._lock:
+            self._inflight.pop(key, None)
+        if error is None:
+            future.set_result(result)
+        elif isinstance(error, Exception):
+            future.set_exception(error)
+        else:
+            future.cancel()
+
+    def do(self, key: str, fn: Callable, *args, **kwargs):
+        """Run fn once for all concurrent callers of key (thread path)"""
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException as e:
+                    self._settle(key, future, error=e)
+                    raise
+                self._settle(key, future, result)
+                return result
+            try:
+                return future.result()
+            except CancelledError:
+                # The leader was cancelled, not failed; try again
+                continue
+
+    async def ado(self, key: str, fn: Callable, *args, **kwargs):
+        """Async variant of do; waiters may live on other threads or loops"""
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                try:
+                    result = await fn(*args, **kwargs)
+                except BaseException as e:
+                    self._settle(key, future, error=e)
+                    raise
+                self._settle(key, future, result)
+                return result
+            try:
+                # Shielded so a cancelled waiter does not cancel the shared call
+                return await asyncio.shield(asyncio.wrap_future(future))
+            except asyncio.CancelledError:
+                if future.cancelled():
+                    continue
+                raise
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._inflight)}
+
+    def wrap(self, generate_response: Callable[..., str], **settings) -> Callable[..., str]:
+        """Wrap a sync generate_response; ``settings`` (model, sampling) join the key"""
+        @functools.wraps(generate_response)
+        def wrapper(prompt: Prompt, *args, **kwargs):
+            return self.do(self.key(prompt, **settings, **kwargs), generate_response, prompt, *args, **kwargs)
+        return wrapper
+
+    def wrap_async(self, agenerate_response: Callable, **settings) -> Callable:
+        """Wrap an async generate_response"""
+        @functools.wraps(agenerate_response)
+        async def wrapper(prompt: Prompt, *args, **kwargs):
+            return await self.ado(self.key(prompt, **settings, **kwargs), agenerate_response, prompt, *args, **kwargs)
+        return wrapper
+
+    def attach(self, agent, **settings):
+        """Coalesce an agent's non-streaming LLM calls with other agents'"""
+        agent.generate_response = self.wrap(agent.generate_response, **settings)
+        if agent.agenerate_response:
+            agent.agenerate_response = self.wrap_async(agent.agenerate_response, **settings)
+        return agent
+
+
+_shared = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    """Return the process-wide single-flight group so all agents coalesce together"""
+    return _shared
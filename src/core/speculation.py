@@ -0,0 +1,78 @@
+"""Speculative execution of predictable, idempotent tool calls.
+
+When an agent is created with ``speculate=True``, tools registered with
+``idempotent=True`` and a list of likely invocations (``speculate=[{...}]``)
+are started when a run begins, so they execute while the model is still
+deciding. If the model later picks one of those invocations (compared after
+filling in schema defaults), the precomputed result is used. Predictions still unused are cancelled and
+thrown away as soon as a turn runs a tool that is not idempotent (their
+results may be stale from then on) or when the run ends.
+
+Agents opt in with ``speculate: true`` in their agents.yaml section.
+"""
+
+import asyncio
+import json
+from typing import Dict, List, Optional
+
+from .action import Action, ActionContext
+from .tracing import get_tracer
+
+
+def invocation_key(action: Action, args: dict) -> str:
+    """Key of a call with its arguments normalized against the tool schema.
+
+    Schema defaults are filled in and values coerced, so ``{}`` and
+    ``{"url": <default>}`` (or ``{"limit": "5"}`` and ``{"limit": 5}``) match.
+    """
+    properties = (action.parameters or {}).get("properties", {})
+    args = {**{k: s["default"] for k, s in properties.items() if "default" in s}, **(args or {})}
+    try:
+        args = action.validate(args)
+    except ValueError:
+        pass
+    return action.name + ":" + json.dumps(args, sort_keys=True, default=str)
+
+
+class SpeculationEngine:
+    """Starts predicted tool calls for one run and hands them out on a match"""
+
+    def __init__(self, agent):
+        self.agent = agent
+        self.hits = 0
+        self.started = 0
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def start(self, actions: List[Action], action_context: ActionContext):
+        """Schedule every predicted invocation of the speculative actions"""
+        for action in actions:
+            if not (action.idempotent and action.speculate):
+                continue
+            for args in action.speculate:
+                key = invocation_key(action, args)
+                if key not in self._tasks:
+                    self._tasks[key] = asyncio.ensure_future(self._run(action, args, action_context))
+                    self.started += 1
+
+    async def _run(self, action: Action, args: dict, action_context: ActionContext) -> dict:
+        with get_tracer().span("tool.speculate", agent=self.agent.name, tool=action.name):
+            return await self.agent.environment.aexecute_action(action, dict(args), action_context)
+
+    def take(self, action: Action, args: dict) -> Optional[asyncio.Task]:
+        """Return the speculative task for a matching invocation, if one was started"""
+        task = self._tasks.pop(invocation_key(action, args), None)
+        if task is not None:
+            self.hits += 1
+        return task
+
+    def discard(self):
+        """Cancel and drop every speculation that was not used"""
+        for task in self._tasks.values():
+            if task.done() and not task.cancelled():
+                # Mark a failure (e.g. a cassette miss) as seen; the result is unused
+                task.exception()
+            task.cancel()
+        self._tasks.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"started": self.started, "hits": self.hits, "pending": len(self._tasks)}
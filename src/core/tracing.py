@@ -0,0 +1,180 @@
+"""Structured tracing for agent runs.
+
+Spans nest through a context variable, so a sub-agent started by
+``call_agent`` (even on a worker thread) is recorded as a child of the tool
+span that launched it. With no exporters configured the tracer hands out a
+shared no-op span and costs next to nothing.
+"""
+
+import json
+import logging
+import reprlib
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+_preview_repr = reprlib.Repr()
+_preview_repr.maxstring = 200
+_preview_repr.maxother = 200
+_preview_repr.maxlevel = 2
+
+
+def preview(value: Any, limit: int = 200) -> str:
+    """Cheap bounded preview of a value for logs (never stringifies it whole)"""
+    if isinstance(value, str):
+        return value[:limit]
+    return _preview_repr.repr(value)[:limit]
+
+
+class Span:
+    """A timed unit of work within a trace"""
+
+    __slots__ = ("tracer", "name", "trace_id", "span_id", "parent_id",
+                 "start_time", "duration", "attributes", "status", "_start", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: Dict[str, Any]):
+        parent = _current_span.get()
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = attributes
+        self.status = "ok"
+        self.start_time = None
+        self.duration = None
+        self._start = None
+        self._token = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        self.start_time = time.time()
+        self._start = time.perf_counter()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self._start
+        if exc_type is not None:
+            self.status = "error"
+            self.attributes["error"] = preview(str(exc))
+        _current_span.reset(self._token)
+        self.tracer.export(self)
+        return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "duration_ms": round(self.duration * 1000, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Span stand-in used when tracing is disabled"""
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class InMemoryCollector:
+    """Keeps finished spans in process, e.g. for tests or a debug endpoint"""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    def get_spans(self, name: str = None) -> List[Span]:
+        with self._lock:
+            return [s for s in self.spans if name is None or s.name == name]
+
+    def clear(self):
+        with self._lock:
+            self.spans = []
+
+
+class JsonlExporter:
+    """Appends finished spans to a JSON Lines file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class Tracer:
+    """Creates spans and hands finished ones to the configured exporters"""
+
+    def __init__(self, exporters: List = None):
+        self.exporters = list(exporters or [])
+
+    def add_exporter(self, exporter):
+        self.exporters.append(exporter)
+
+    def span(self, name: str, **attributes):
+        """Start a span; use as a context manager"""
+        if not self.exporters:
+            return _NOOP_SPAN
+        return Span(self, name, attributes)
+
+    def export(self, span: Span):
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception:  # pragma: no cover - exporters must never break a run
+                logging.getLogger(__name__).exception("Span exporter failed")
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer"""
+    return _tracer
+
+
+def set_tracer(tracer: Tracer):
+    """Replace the process-wide tracer"""
+    global _tracer
+    _tracer = tracer
+
+
+def current_span() -> Optional[Span]:
+    """Get the innermost active span, if any"""
+    return _current_span.get()
@@ -1,8 +1,17 @@
 """Base classes for memory systems"""
 
+import json
+from collections.abc import Mapping
 from typing import List, Dict, Any
 
 
+def _json_default(value: Any) -> Any:
+    # Memory items are Mappings (MemoryItem), not dicts
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
+
+
 class MemoryStore:
     """Abstract base for memory storage"""
     
@@ -14,3 +23,17 @@ class MemoryStore:
     
     def search(self, query: str) -> List[Any]:
         raise NotImplementedError
+
+    @staticmethod
+    def to_json(value: Any) -> str:
+        """Serialize a value for storage (mappings such as MemoryItem become objects)"""
+        return json.dumps(value, default=_json_default, ensure_ascii=False)
+
+    @staticmethod
+    def text_of(value: Any) -> str:
+        """The searchable text of a value (a memory's content, else its JSON)"""
+        if isinstance(value, str):
+            return value
+        if isinstance(value, Mapping) and isinstance(value.get("content"), str):
+            return value["content"]
+        return MemoryStore.to_json(value)
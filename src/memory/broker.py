@@ -1,33 +1,191 @@
 """Memory broker for inter-agent communication and shared memory"""
 
+import asyncio
+import heapq
+import logging
+import threading
+from typing import Any, AsyncIterator, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+
+class SharedMemory(NamedTuple):
+    """A shared memory and its position in the broker's global sequence"""
+    seq: int
+    agent_id: str
+    memory: dict
+
+
+class _Ring:
+    """Fixed-capacity buffer of entries, oldest first; the oldest is dropped when full"""
+
+    __slots__ = ("capacity", "entries", "start", "count")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.entries: List[Optional[SharedMemory]] = [None] * capacity
+        self.start = 0
+        self.count = 0
+
+    def append(self, entry: SharedMemory):
+        end = (self.start + self.count) % self.capacity
+        self.entries[end] = entry
+        if self.count < self.capacity:
+            self.count += 1
+        else:
+            self.start = (self.start + 1) % self.capacity
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> SharedMemory:
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return self.entries[(self.start + index) % self.capacity]
+
+    def since(self, seq: int, limit: Optional[int] = None) -> List[SharedMemory]:
+        """Entries after ``seq``, found by binary search (sequence numbers only grow)"""
+        first, high = 0, self.count
+        while first < high:
+            middle = (first + high) // 2
+            if self[middle].seq <= seq:
+                first = middle + 1
+            else:
+                high = middle
+        last = self.count if limit is None else min(self.count, first + limit)
+        return [self[i] for i in range(first, last)]
+
+
+class Subscription:
+    """A registered callback; ``close`` (or leaving a ``with`` block) unsubscribes"""
+
+    def __init__(self, broker: "MemoryBroker", callback: Callable[[SharedMemory], Any],
+                 agent_id: Optional[str]):
+        self.broker = broker
+        self.callback = callback
+        self.agent_id = agent_id
+
+    def close(self):
+        self.broker._unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
 
 class MemoryBroker:
-    """Facilitates memory sharing between agents"""
-    
-    def __init__(self):
-        self.shared_memories = {}
-    
-    def share_memory(self, agent_id: str, memory: dict):
-        """Share a memory from an agent"""
-        if agent_id not in self.shared_memories:
-            self.shared_memories[agent_id] = []
-        self.shared_memories[agent_id].append(memory)
-    
+    """Facilitates memory sharing between agents.
+
+    Each agent's memories are kept in a ring buffer of ``capacity`` entries
+    and stamped with a broker-wide sequence number. ``read(cursor)`` returns
+    only what was shared after a cursor (binary search per agent, merged by
+    sequence), so readers never copy the history they have already seen.
+    ``subscribe`` pushes each new memory to a callback and ``listen`` to an
+    async iterator, so agents are notified instead of polling. All methods
+    are thread-safe; callbacks run in the sharing thread, outside the lock.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._rings: Dict[str, _Ring] = {}
+        self._seq = 0
+        self._subscribers: List[Subscription] = []
+
+    @property
+    def cursor(self) -> int:
+        """Sequence number of the latest shared memory (0 before any)"""
+        return self._seq
+
+    @property
+    def shared_memories(self) -> Dict[str, list]:
+        """Retained memories per agent (built on each access)"""
+        with self._lock:
+            return {agent_id: [entry.memory for entry in ring.since(0)]
+                    for agent_id, ring in self._rings.items()}
+
+    def share_memory(self, agent_id: str, memory: dict) -> int:
+        """Share a memory from an agent and return its sequence number"""
+        with self._lock:
+            self._seq += 1
+            entry = SharedMemory(self._seq, agent_id, memory)
+            ring = self._rings.get(agent_id)
+            if ring is None:
+                ring = self._rings[agent_id] = _Ring(self.capacity)
+            ring.append(entry)
+            subscribers = [s for s in self._subscribers if s.agent_id in (None, agent_id)]
+        for subscription in subscribers:
+            try:
+                subscription.callback(entry)
+            except Exception:
+                logging.getLogger(__name__).exception("Memory subscriber failed")
+        return entry.seq
+
+    def read(self, cursor: int = 0, agent_id: Optional[str] = None,
+             limit: Optional[int] = None) -> Tuple[List[SharedMemory], int]:
+        """Memories shared after ``cursor`` (oldest first) and the cursor to read from next.
+
+        Entries already dropped from a full ring buffer are skipped.
+        """
+        with self._lock:
+            if agent_id is not None:
+                ring = self._rings.get(agent_id)
+                entries = ring.since(cursor, limit) if ring else []
+            else:
+                per_agent = [ring.since(cursor, limit) for ring in self._rings.values()]
+                entries = list(heapq.merge(*per_agent))
+                if limit is not None:
+                    entries = entries[:limit]
+            if entries:
+                return entries, entries[-1].seq
+            return entries, max(cursor, self._seq)
+
     def get_shared_memories(self, agent_id: str = None) -> list:
         """Get shared memories, optionally filtered by agent"""
-        if agent_id:
-            return self.shared_memories.get(agent_id, [])
-        
-        all_memories = []
-        for memories in self.shared_memories.values():
-            all_memories.extend(memories)
-        return all_memories
-    
+        return [entry.memory for entry in self.read(0, agent_id)[0]]
+
+    def subscribe(self, callback: Callable[[SharedMemory], Any],
+                  agent_id: Optional[str] = None) -> Subscription:
+        """Call ``callback`` with every memory shared from now on (by ``agent_id`` if given)"""
+        subscription = Subscription(self, callback, agent_id)
+        with self._lock:
+            self._subscribers.append(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    async def listen(self, cursor: Optional[int] = None,
+                     agent_id: Optional[str] = None) -> AsyncIterator[SharedMemory]:
+        """Yield memories shared after ``cursor`` (default: from now on) as they arrive.
+
+        Safe to use while other threads share memories; delivery is handed
+        to the listening event loop.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        # Take the cursor before subscribing so nothing shared in between is missed
+        last = self.cursor if cursor is None else cursor
+        with self.subscribe(lambda entry: loop.call_soon_threadsafe(queue.put_nowait, entry), agent_id):
+            backlog, _ = self.read(last, agent_id)
+            for entry in backlog:
+                last = entry.seq
+                yield entry
+            while True:
+                entry = await queue.get()
+                # Skip entries already yielded from the backlog
+                if entry.seq > last:
+                    last = entry.seq
+                    yield entry
+
     def clear_agent_memories(self, agent_id: str):
-        """Clear memories for a specific agent"""
-        if agent_id in self.shared_memories:
-            self.shared_memories[agent_id] = []
-    
+        """Clear memories for a specific agent (sequence numbers keep counting)"""
+        with self._lock:
+            self._rings.pop(agent_id, None)
+
     def clear_all_memories(self):
-        """Clear all shared memories"""
-        self.shared_memories = {}
+        """Clear all shared memories (sequence numbers keep counting)"""
+        with self._lock:
+            self._rings = {}
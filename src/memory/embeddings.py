@@ -0,0 +1,78 @@
+"""Text embedders for semantic memory search"""
+
+import hashlib
+import re
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_TOKENS = re.compile(r"\w+", re.UNICODE)
+
+
+class Embedder:
+    """Maps texts to fixed-size float32 vectors (one row per text)"""
+
+    dim: int
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        raise NotImplementedError
+
+
+@lru_cache(maxsize=65536)
+def _feature(feature: str, dim: int) -> Tuple[int, float]:
+    digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+    return digest % dim, (1.0 if digest >> 63 else -1.0)
+
+
+class HashingEmbedder(Embedder):
+    """Deterministic offline embedder (signed feature hashing of words and word pairs).
+
+    Needs no model or network and gives the same vectors in every process,
+    so it suits tests and keyword-like similarity; plug in a model-backed
+    embedder for real semantic matching.
+    """
+
+    def __init__(self, dim: int = 256, bigrams: bool = True):
+        self.dim = dim
+        self.bigrams = bigrams
+
+    def features(self, text: str) -> List[str]:
+        words = [w.lower() for w in _TOKENS.findall(text)]
+        if self.bigrams:
+            return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        return words
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        rows, cols, signs = [], [], []
+        for row, text in enumerate(texts):
+            for feature in self.features(text):
+                col, sign = _feature(feature, self.dim)
+                rows.append(row)
+                cols.append(col)
+                signs.append(sign)
+        if rows:
+            np.add.at(vectors, (rows, cols), signs)
+        return vectors
+
+
+class LiteLLMEmbedder(Embedder):
+    """Embeddings from a provider model through litellm (imported on first use)"""
+
+    def __init__(self, model: str = "text-embedding-3-small", dim: Optional[int] = None):
+        self.model = model
+        self.dim = dim or 1536
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        from litellm import embedding
+        response = embedding(model=self.model, input=list(texts))
+        vectors = np.asarray([item["embedding"] for item in response.data], dtype=np.float32)
+        return vectors.reshape(len(texts), -1)
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length in place (zero rows stay zero), so dot product is cosine"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
@@ -1,5 +1,16 @@
 """Memory retention policies"""
 
+import json
+import threading
+import weakref
+from collections import OrderedDict
+from typing import TYPE_CHECKING, List, Optional
+
+from .tokens import TokenCounter
+
+if TYPE_CHECKING:
+    from ..core.memory import Memory
+
 
 class RetentionPolicy:
     """Defines when to keep or discard memories"""
@@ -10,11 +21,194 @@ class RetentionPolicy:
 
 
 class RecentRetentionPolicy(RetentionPolicy):
-    """Keep only recent N memories"""
+    """Keep only recent N memories (all of them when N is None)"""
     
-    def __init__(self, max_items: int = 100):
+    def __init__(self, max_items: Optional[int] = 100):
         self.max_items = max_items
     
     def apply(self, memories: list) -> list:
         """Keep only most recent memories"""
-        return memories[-self.max_items:]
+        return memories[-self.max_items:] if self.max_items else list(memories)
+
+
+def task_index(memories: list) -> Optional[int]:
+    """Position of the current task: the latest user memory (a Memory may span several runs)"""
+    return next((i for i in range(len(memories) - 1, -1, -1) if memories[i].get("type") == "user"), None)
+
+
+class TokenBudgetRetentionPolicy(RecentRetentionPolicy):
+    """Keep the task and as many recent memories as fit in a token budget.
+
+    The latest user memory (the current task) is always sent. The remaining
+    memories are taken newest first until the budget runs out; tool output that does
+    not fit is truncated to half the remaining room (or dropped when too
+    little is left) so one large result cannot crowd out the rest of the
+    conversation. Tool output older than the latest result can also be
+    capped with ``max_tool_tokens``, and ``max_items`` optionally caps the
+    number of memories considered. Only the prompt is trimmed; the agent's
+    Memory keeps every item.
+    """
+
+    MESSAGE_OVERHEAD = 4
+    TRUNCATION_MARKER = "\n...[truncated {} characters]"
+
+    def __init__(self,
+                 max_tokens: int,
+                 max_items: Optional[int] = None,
+                 max_tool_tokens: Optional[int] = None,
+                 min_truncated_tokens: int = 64,
+                 counter: Optional[TokenCounter] = None,
+                 model: Optional[str] = None):
+        super().__init__(max_items)
+        self.max_tokens = max_tokens
+        self.max_tool_tokens = max_tool_tokens
+        self.min_truncated_tokens = min_truncated_tokens
+        self.counter = counter or TokenCounter(model)
+        self._truncated: "OrderedDict[tuple, str]" = OrderedDict()
+
+    @staticmethod
+    def item_text(memory: dict) -> str:
+        """The text a memory is sent as (mirrors format_memory)"""
+        return memory.get("content") or json.dumps(dict(memory), indent=4)
+
+    def item_tokens(self, memory: dict) -> int:
+        return self.counter(self.item_text(memory)) + self.MESSAGE_OVERHEAD
+
+    def prefix_tokens(self, messages: List[dict], tools: List[dict]) -> int:
+        """Tokens taken by the static goals/tools prefix"""
+        tokens = sum(self.counter(str(m.get("content", ""))) + self.MESSAGE_OVERHEAD for m in messages)
+        if tools:
+            tokens += self.counter(json.dumps(tools, separators=(",", ":")))
+        return tokens
+
+    def truncate(self, memory: dict, max_tokens: int) -> dict:
+        """Return a copy of memory whose content fits in max_tokens"""
+        text = self.item_text(memory)
+        tokens = self.counter(text)
+        if tokens <= max_tokens:
+            return memory
+        key = (text, max_tokens)
+        truncated = self._truncated.get(key)
+        if truncated is None:
+            marker_chars = len(self.TRUNCATION_MARKER) + 8
+            keep = max(0, int(len(text) * max_tokens / tokens) - marker_chars)
+            truncated = text[:keep] + self.TRUNCATION_MARKER.format(len(text) - keep)
+            self._truncated[key] = truncated
+            while len(self._truncated) > 256:
+                self._truncated.popitem(last=False)
+        return {**memory, "content": truncated}
+
+    def apply(self, memories: list, reserved_tokens: int = 0, memory: Optional["Memory"] = None) -> list:
+        """Select the memories to send, leaving reserved_tokens for the prefix.
+
+        ``memory`` is the Memory the items belong to; this policy keeps no
+        per-conversation state and ignores it.
+        """
+        if not memories:
+            return []
+        budget = self.max_tokens - reserved_tokens
+        task = task_index(memories)
+        if task is not None:
+            budget -= self.item_tokens(memories[task])
+        positions = super().apply([i for i in range(len(memories)) if i != task])
+        latest_tool = max((i for i in positions if memories[i].get("type") == "environment"), default=None)
+
+        selected = []
+        for position in reversed(positions):
+            item = memories[position]
+            is_tool = item.get("type") == "environment"
+            if is_tool and self.max_tool_tokens and position != latest_tool:
+                item = self.truncate(item, self.max_tool_tokens)
+            tokens = self.item_tokens(item)
+            if tokens > budget:
+                if not is_tool:
+                    break
+                if budget < self.min_truncated_tokens:
+                    continue
+                # Leave half the remaining room for the turns that led up to it
+                target = max(self.min_truncated_tokens, budget // 2)
+                item = self.truncate(item, target - self.MESSAGE_OVERHEAD)
+                tokens = self.item_tokens(item)
+            selected.append((position, item))
+            budget -= tokens
+
+        if task is not None:
+            selected.append((task, memories[task]))
+        selected.sort(key=lambda pair: pair[0])
+        return [item for _, item in selected]
+
+
+class _RelevanceIndex:
+    """Embeddings of one conversation's memories, in memory order"""
+
+    def __init__(self, embedder):
+        from .stores.vector import VectorMemoryStore
+        self.store = VectorMemoryStore(embedder)
+        self.indexed: list = []
+        self.lock = threading.Lock()
+
+    def update(self, memories: list):
+        """Embed the memories not indexed yet (rebuilding if history was replaced)"""
+        indexed = len(self.indexed)
+        if indexed > len(memories) or (indexed and self.indexed[-1] is not memories[indexed - 1]):
+            self.store.clear()
+            self.indexed, indexed = [], 0
+        new = memories[indexed:]
+        self.store.store_many(
+            (str(indexed + offset), TokenBudgetRetentionPolicy.item_text(m)) for offset, m in enumerate(new)
+        )
+        self.indexed.extend(new)
+
+
+class RelevanceRetentionPolicy(RecentRetentionPolicy):
+    """Keep the task, the latest memories and the k most relevant older ones.
+
+    Older memories are indexed in a VectorMemoryStore as they arrive (only
+    new items are embedded each iteration) and ranked by similarity to the
+    task and the latest memory, so a long run sends a bounded prompt instead
+    of replaying its whole history. Selected memories keep their order.
+
+    The index belongs to the conversation's Memory (held weakly), so one
+    policy can serve concurrent runs of the same agent; without a ``memory``
+    the index is rebuilt on every call.
+    """
+
+    def __init__(self, k: int = 8, recent: int = 6, embedder=None, max_items: int = 100):
+        super().__init__(max_items)
+        self.k = k
+        self.recent = recent
+        self.embedder = embedder
+        self._indexes: "weakref.WeakKeyDictionary[Memory, _RelevanceIndex]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def prefix_tokens(self, messages: List[dict], tools: List[dict]) -> int:
+        return 0
+
+    def _index_for(self, memory: Optional["Memory"]) -> _RelevanceIndex:
+        if memory is None:
+            return _RelevanceIndex(self.embedder)
+        with self._lock:
+            index = self._indexes.get(memory)
+            if index is None:
+                index = self._indexes[memory] = _RelevanceIndex(self.embedder)
+            return index
+
+    def apply(self, memories: list, reserved_tokens: int = 0, memory: Optional["Memory"] = None) -> list:
+        """Select the memories to send (reserved_tokens is accepted for compatibility)"""
+        memories = list(memories)
+        task = task_index(memories)
+        first_recent = max(len(memories) - self.recent, 0)
+        keep = set(range(first_recent, len(memories)))
+        if task is not None:
+            keep.add(task)
+        if first_recent and self.k > 0:
+            index = self._index_for(memory)
+            query = "\n".join(TokenBudgetRetentionPolicy.item_text(memories[i])
+                              for i in (task, len(memories) - 1) if i is not None)
+            with index.lock:
+                index.update(memories)
+                # Rank everything, then keep the best k that are not already kept
+                ranked = index.store.top_k(query, self.k + len(keep))
+            relevant = [int(key) for key, _, score in ranked if score > 0 and int(key) not in keep]
+            keep.update(relevant[:self.k])
+        return super().apply([memories[i] for i in sorted(keep)])
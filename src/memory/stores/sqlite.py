@@ -0,0 +1,225 @@
+"""SQLite storage implementation with FTS5 full-text search"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+import weakref
+from typing import Any, List, Optional
+
+from ..base import MemoryStore
+
+_TOKENS = re.compile(r"\w+", re.UNICODE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS memories (
+    id INTEGER PRIMARY KEY,
+    agent TEXT NOT NULL,
+    session TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    text TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    UNIQUE (agent, session, key)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(
+    text, content='memories', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS memories_ai AFTER INSERT ON memories BEGIN
+    INSERT INTO memories_fts (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS memories_ad AFTER DELETE ON memories BEGIN
+    INSERT INTO memories_fts (memories_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+CREATE TRIGGER IF NOT EXISTS memories_au AFTER UPDATE OF text ON memories BEGIN
+    INSERT INTO memories_fts (memories_fts, rowid, text) VALUES ('delete', old.id, old.text);
+    INSERT INTO memories_fts (rowid, text) VALUES (new.id, new.text);
+END;
+"""
+
+
+_UPSERT = (
+    "INSERT INTO memories (agent, session, key, value, text, created_at) "
+    "VALUES (?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (agent, session, key) DO UPDATE SET "
+    "value = excluded.value, text = excluded.text, created_at = excluded.created_at"
+)
+
+
+def _write(conn: sqlite3.Connection, lock: threading.RLock, pending: list):
+    with lock:
+        if not pending:
+            return
+        rows = pending[:]
+        pending.clear()
+        with conn:
+            conn.executemany(_UPSERT, rows)
+
+
+def _flush_later(ref: "weakref.ref[_Database]"):
+    # Timer callback; holds only a weak reference so the database can still be collected
+    db = ref()
+    if db is not None:
+        db.flush()
+
+
+def _close(conn: sqlite3.Connection, lock: threading.RLock, pending: list):
+    with lock:
+        _write(conn, lock, pending)
+        conn.close()
+
+
+class _Database:
+    """Connection, lock and write buffer shared by every namespace of one file.
+
+    Buffered rows are written when the batch fills, by a timer at most
+    ``flush_interval`` seconds after the first of them was buffered, before
+    any read, on ``close`` and, as a fallback, when the database is garbage
+    collected or the interpreter exits.
+    """
+
+    def __init__(self, path: str, batch_size: int, flush_interval: float):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.lock = threading.RLock()
+        self.pending = []
+        self._timer: Optional[threading.Timer] = None
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+        # Must not reference self, or the database would never be collected
+        self._finalizer = weakref.finalize(self, _close, self.conn, self.lock, self.pending)
+
+    def add(self, row: tuple):
+        with self.lock:
+            self.pending.append(row)
+            if len(self.pending) >= self.batch_size:
+                self.flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, _flush_later, (weakref.ref(self),))
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        with self.lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            _write(self.conn, self.lock, self.pending)
+
+    def close(self):
+        with self.lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self._finalizer()
+
+
+class SQLiteMemoryStore(MemoryStore):
+    """Persistent key-value store with ranked full-text search.
+
+    Entries live in one namespace per ``(agent, session)``; ``scoped`` returns
+    a store for another namespace sharing the same connection. Writes are
+    buffered and committed ``batch_size`` at a time (or within
+    ``flush_interval`` seconds of being buffered, and before any read), in WAL
+    mode so readers in other processes are not blocked. ``search`` ranks
+    matches with the FTS5 index's BM25 score instead of scanning every entry.
+
+    Call ``close()`` (or use the store as a context manager) when done so
+    the last writes are committed; buffered rows are also written at
+    interpreter exit, but not if the process is killed.
+    """
+
+    def __init__(self, path: str = ":memory:", agent: str = "default", session: str = "default",
+                 batch_size: int = 256, flush_interval: float = 1.0):
+        self.agent = agent
+        self.session = session
+        self._db = _Database(path, batch_size, flush_interval)
+
+    @property
+    def path(self) -> str:
+        return self._db.path
+
+    def scoped(self, agent: Optional[str] = None, session: Optional[str] = None) -> "SQLiteMemoryStore":
+        """Store for another agent/session namespace in the same database"""
+        store = object.__new__(SQLiteMemoryStore)
+        store.agent = agent or self.agent
+        store.session = session or self.session
+        store._db = self._db
+        return store
+
+    def store(self, key: str, value: Any):
+        self._db.add((self.agent, self.session, key, self.to_json(value),
+                      self.text_of(value), time.time()))
+
+    def flush(self):
+        """Commit buffered writes"""
+        self._db.flush()
+
+    def retrieve(self, key: str) -> Any:
+        db = self._db
+        with db.lock:
+            db.flush()
+            row = db.conn.execute(
+                "SELECT value FROM memories WHERE agent = ? AND session = ? AND key = ?",
+                (self.agent, self.session, key)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def search(self, query: str, limit: int = 10) -> List[Any]:
+        """Best matches for every word of ``query``, most relevant first"""
+        tokens = _TOKENS.findall(query)
+        if not tokens:
+            return []
+        match = " ".join('"' + token.replace('"', '""') + '"' for token in tokens)
+        db = self._db
+        with db.lock:
+            db.flush()
+            rows = db.conn.execute(
+                "SELECT m.key, m.value FROM memories_fts "
+                "JOIN memories AS m ON m.id = memories_fts.rowid "
+                "WHERE memories_fts MATCH ? AND m.agent = ? AND m.session = ? "
+                "ORDER BY bm25(memories_fts) LIMIT ?",
+                (match, self.agent, self.session, limit)
+            ).fetchall()
+        return [{key: json.loads(value)} for key, value in rows]
+
+    def delete(self, key: str):
+        db = self._db
+        with db.lock:
+            db.flush()
+            with db.conn:
+                db.conn.execute(
+                    "DELETE FROM memories WHERE agent = ? AND session = ? AND key = ?",
+                    (self.agent, self.session, key)
+                )
+
+    def clear(self):
+        """Delete every entry in this namespace"""
+        db = self._db
+        with db.lock:
+            db.flush()
+            with db.conn:
+                db.conn.execute("DELETE FROM memories WHERE agent = ? AND session = ?",
+                                (self.agent, self.session))
+
+    def count(self) -> int:
+        db = self._db
+        with db.lock:
+            db.flush()
+            return db.conn.execute("SELECT COUNT(*) FROM memories WHERE agent = ? AND session = ?",
+                                   (self.agent, self.session)).fetchone()[0]
+
+    def close(self):
+        """Flush and close the database (shared by every scoped store)"""
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
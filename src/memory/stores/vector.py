@@ -0,0 +1,210 @@
+"""Vector storage implementation with cosine top-k search"""
+
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..base import MemoryStore
+from ..embeddings import Embedder, HashingEmbedder, normalize
+
+# Names the matrix and entries files of the latest save
+_MANIFEST = "manifest.json"
+
+
+class VectorMemoryStore(MemoryStore):
+    """Key-value store searched by embedding similarity.
+
+    Unit-length embeddings live in one contiguous float32 matrix (grown by
+    doubling, rows kept dense on delete), so a query is a single
+    matrix-vector product plus ``argpartition`` for the top k, and
+    ``search_many`` scores a batch of queries in one matrix product. With a
+    ``path``, ``save`` writes the matrix (``.npy``) and the entries
+    (``.jsonl``) to new files and then ``manifest.json`` naming the pair,
+    so a crash mid-save leaves the previous save readable. Reopening maps
+    the matrix read-only instead of loading it; the first write after that
+    copies it into memory.
+    """
+
+    def __init__(self, embedder: Optional[Embedder] = None, path: Optional[str] = None,
+                 capacity: int = 1024):
+        self.embedder = embedder or HashingEmbedder()
+        self.path = Path(path) if path else None
+        self._lock = threading.RLock()
+        self._keys: List[str] = []
+        self._values: List[Any] = []
+        self._rows: Dict[str, int] = {}
+        self._vectors = np.zeros((capacity, self.embedder.dim), dtype=np.float32)
+        if self.path and ((self.path / _MANIFEST).exists() or (self.path / "vectors.npy").exists()):
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """The stored embeddings, one row per key (read-only view)"""
+        view = self._vectors[:len(self._keys)].view()
+        view.flags.writeable = False
+        return view
+
+    def _reserve(self, count: int):
+        """Make room for ``count`` rows in a writable matrix"""
+        if count <= len(self._vectors) and self._vectors.flags.writeable:
+            return
+        capacity = max(count, 2 * len(self._vectors), 1)
+        grown = np.zeros((capacity, self.embedder.dim), dtype=np.float32)
+        grown[:len(self._keys)] = self._vectors[:len(self._keys)]
+        self._vectors = grown
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.asarray(self.embedder.embed(texts), dtype=np.float32)
+        if vectors.shape != (len(texts), self.embedder.dim):
+            raise ValueError(f"Embedder returned shape {vectors.shape}, expected "
+                             f"({len(texts)}, {self.embedder.dim})")
+        return normalize(np.array(vectors, copy=True))
+
+    def store(self, key: str, value: Any):
+        self.store_many([(key, value)])
+
+    def store_many(self, items: Iterable[Tuple[str, Any]]):
+        """Store several entries, embedding them in one batch"""
+        items = list(items)
+        if not items:
+            return
+        vectors = self.embed([self.text_of(value) for _, value in items])
+        with self._lock:
+            self._reserve(len(self._keys) + len(items))
+            for (key, value), vector in zip(items, vectors):
+                row = self._rows.get(key)
+                if row is None:
+                    row = self._rows[key] = len(self._keys)
+                    self._keys.append(key)
+                    self._values.append(value)
+                else:
+                    self._values[row] = value
+                self._vectors[row] = vector
+
+    def retrieve(self, key: str) -> Any:
+        with self._lock:
+            row = self._rows.get(key)
+            return None if row is None else self._values[row]
+
+    def delete(self, key: str):
+        """Remove an entry, moving the last row into its place"""
+        with self._lock:
+            row = self._rows.pop(key, None)
+            if row is None:
+                return
+            self._reserve(len(self._keys))
+            last = len(self._keys) - 1
+            if row != last:
+                moved = self._keys[last]
+                self._keys[row], self._values[row] = moved, self._values[last]
+                self._vectors[row] = self._vectors[last]
+                self._rows[moved] = row
+            self._keys.pop()
+            self._values.pop()
+
+    def clear(self):
+        with self._lock:
+            self._keys, self._values, self._rows = [], [], {}
+            self._vectors = np.zeros((len(self._vectors), self.embedder.dim), dtype=np.float32)
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+        """Indices of the ``k`` highest scores in each row, best first"""
+        if k < scores.shape[-1]:
+            top = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+        else:
+            top = np.broadcast_to(np.arange(scores.shape[-1]), scores.shape[:-1] + (scores.shape[-1],))
+        order = np.argsort(-np.take_along_axis(scores, top, axis=-1), axis=-1, kind="stable")
+        return np.take_along_axis(top, order, axis=-1)
+
+    def search_many(self, queries: Sequence[str], k: int = 10) -> List[List[Tuple[str, Any, float]]]:
+        """``(key, value, score)`` of the ``k`` nearest entries for each query"""
+        queries = self.embed(list(queries))
+        with self._lock:
+            count = len(self._keys)
+            if not count or k <= 0:
+                return [[] for _ in range(len(queries))]
+            scores = queries @ self._vectors[:count].T
+            top = self._top_k(scores, min(k, count))
+            return [
+                [(self._keys[i], self._values[i], float(row_scores[i])) for i in row]
+                for row, row_scores in zip(top, scores)
+            ]
+
+    def top_k(self, query: str, k: int = 10) -> List[Tuple[str, Any, float]]:
+        """``(key, value, score)`` of the ``k`` entries most similar to ``query``"""
+        return self.search_many([query], k)[0]
+
+    def search(self, query: str, limit: int = 10) -> List[Any]:
+        """Most similar entries first, as ``{key: value}`` like the other stores"""
+        return [{key: value} for key, value, score in self.top_k(query, limit) if score > 0]
+
+    def save(self):
+        """Write the matrix and entries under ``path``"""
+        if self.path is None:
+            raise ValueError("VectorMemoryStore has no path to save to")
+        self.path.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            count = len(self._keys)
+            fd, vectors_tmp = tempfile.mkstemp(dir=self.path, prefix="vectors-", suffix=".npy")
+            os.close(fd)
+            matrix = np.lib.format.open_memmap(vectors_tmp, mode="w+", dtype=np.float32,
+                                               shape=(count, self.embedder.dim))
+            matrix[:] = self._vectors[:count]
+            matrix.flush()
+            del matrix
+            fd, items_tmp = tempfile.mkstemp(dir=self.path, prefix="items-", suffix=".jsonl")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                for key, value in zip(self._keys, self._values):
+                    f.write(self.to_json([key, value]) + "\n")
+            # The manifest is replaced last: until then readers still see the previous pair
+            fd, manifest_tmp = tempfile.mkstemp(dir=self.path, prefix="manifest-", suffix=".json")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"vectors": os.path.basename(vectors_tmp),
+                           "items": os.path.basename(items_tmp), "count": count}, f)
+            os.replace(manifest_tmp, self.path / _MANIFEST)
+            # Earlier saves, including ones interrupted before their manifest
+            current = {os.path.basename(vectors_tmp), os.path.basename(items_tmp)}
+            for stale in self.path.glob("*"):
+                if stale.name not in current and (
+                        stale.name in ("vectors.npy", "items.jsonl")
+                        or stale.match("vectors-*.npy") or stale.match("items-*.jsonl")
+                        or stale.match("manifest-*.json")):
+                    try:
+                        stale.unlink()
+                    except OSError:
+                        pass  # e.g. still mapped by a reader on Windows
+
+    def _files(self) -> Tuple[str, str]:
+        """Names of the saved matrix and entries files"""
+        manifest = self.path / _MANIFEST
+        if not manifest.exists():
+            # Saved before manifests were written
+            return "vectors.npy", "items.jsonl"
+        with open(manifest, encoding="utf-8") as f:
+            entry = json.load(f)
+        return entry["vectors"], entry["items"]
+
+    def _load(self):
+        vectors_file, items_file = self._files()
+        vectors = np.load(self.path / vectors_file, mmap_mode="r")
+        if vectors.ndim != 2 or vectors.shape[1] != self.embedder.dim:
+            raise ValueError(f"Stored vectors have shape {vectors.shape}; "
+                             f"the embedder produces {self.embedder.dim} dimensions")
+        with open(self.path / items_file, encoding="utf-8") as f:
+            for line in f:
+                key, value = json.loads(line)
+                self._rows[key] = len(self._keys)
+                self._keys.append(key)
+                self._values.append(value)
+        if len(self._keys) != len(vectors):
+            raise ValueError(f"{self.path} has {len(vectors)} vectors for {len(self._keys)} items")
+        self._vectors = vectors
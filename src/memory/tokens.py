@@ -0,0 +1,70 @@
+"""Token counting for context budgeting"""
+
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Optional
+
+
+def approximate_tokens(text: str) -> int:
+    """Rough count (~4 characters per token) used when no tokenizer is available"""
+    return (len(text) + 3) // 4
+
+
+@lru_cache(maxsize=None)
+def load_tokenizer(model: Optional[str] = None) -> Callable[[str], int]:
+    """Return a tiktoken-backed counter for the model, or the approximation.
+
+    tiktoken is optional (it ships with litellm) and may need to download its
+    encoding files, so any failure falls back to approximate_tokens. The
+    choice is made once per model and process, so agents created later (e.g.
+    for a cassette replay) neither reach the network nor count differently.
+    """
+    try:
+        import tiktoken
+        name = (model or "").split("/")[-1]
+        try:
+            encoding = tiktoken.encoding_for_model(name)
+        except KeyError:
+            encoding = tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return approximate_tokens
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+class TokenCounter:
+    """Counts tokens once per distinct text and remembers the result.
+
+    Memory contents are the same string objects on every iteration, so each
+    item is tokenized once, when it is first seen, and looked up afterwards.
+    """
+
+    def __init__(self, model: Optional[str] = None,
+                 tokenizer: Optional[Callable[[str], int]] = None,
+                 max_entries: int = 4096):
+        self.model = model
+        self.max_entries = max_entries
+        self._tokenizer = tokenizer
+        self._counts: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def tokenizer(self) -> Callable[[str], int]:
+        if self._tokenizer is None:
+            self._tokenizer = load_tokenizer(self.model)
+        return self._tokenizer
+
+    def count(self, text: str) -> int:
+        with self._lock:
+            tokens = self._counts.get(text)
+            if tokens is not None:
+                self._counts.move_to_end(text)
+                return tokens
+        tokens = self.tokenizer(text)
+        with self._lock:
+            self._counts[text] = tokens
+            while len(self._counts) > self.max_entries:
+                self._counts.popitem(last=False)
+        return tokens
+
+    __call__ = count
@@ -1,14 +1,24 @@
-from typing import List, Dict, Any
+from typing import Iterable, List, Dict, Any, Optional
+from ..config.config import LLM_CASSETTE_TOOLS
 from ..core.agent import Agent
+from ..core.cassette import Cassette
 from ..core.memory import Memory
 
 
 class BaseOrchestrator:
-    """Base class for multi-agent orchestration"""
+    """Base class for multi-agent orchestration.
+
+    With a ``cassette`` every agent's LLM calls and the ``cassette_tools``
+    (by default the ones that reach the network) are recorded or replayed.
+    """
     
-    def __init__(self, agents: List[Agent]):
+    def __init__(self, agents: List[Agent], cassette: Optional[Cassette] = None,
+                 cassette_tools: Iterable[str] = LLM_CASSETTE_TOOLS):
         self.agents = {agent.name: agent for agent in agents}
         self.shared_memory = Memory()
+        if cassette:
+            for agent in agents:
+                cassette.attach(agent, tools=cassette_tools)
 
     def get_agent(self, name: str) -> Agent:
         """Get an agent by name"""
@@ -1,3 +1,6 @@
+from typing import Optional
+
+from ...core.deadline import Deadline
 from ...core.memory import Memory
 from ..base import BaseOrchestrator
 from ..protocols import MessageProtocol
@@ -6,13 +9,16 @@ from ..protocols import MessageProtocol
 class ChatbotPipelineOrchestrator(BaseOrchestrator):
     """Orchestrator for the 3-agent chatbot pipeline"""
     
-    def coordinate(self, user_input: str) -> str:
+    def coordinate(self, user_input: str, timeout: Optional[float] = None) -> str:
         """
         Coordinate the three-agent pipeline:
         1. Orchestrator analyzes and dispatches
         2. Retrieval Worker fetches data
         3. Synthesizer consolidates and reports
+
+        ``timeout`` bounds the whole pipeline; every phase shares one deadline.
         """
+        deadline_props = {"deadline": Deadline.after(timeout)}
         print("\n" + "="*80)
         print("CHATBOT PIPELINE STARTED")
         print("="*80)
@@ -33,7 +39,8 @@ class ChatbotPipelineOrchestrator(BaseOrchestrator):
         orchestrator_memory = orchestrator.run(
             orchestration_task, 
             memory=orchestrator_memory,
-            max_iterations=10
+            max_iterations=10,
+            action_context_props=deadline_props
         )
         
         # Extract orchestrator's plan
@@ -55,7 +62,8 @@ class ChatbotPipelineOrchestrator(BaseOrchestrator):
         retrieval_memory = retrieval_worker.run(
             retrieval_task,
             memory=retrieval_memory,
-            max_iterations=15
+            max_iterations=15,
+            action_context_props=deadline_props
         )
         
         # Extract retrieval results
@@ -78,7 +86,8 @@ class ChatbotPipelineOrchestrator(BaseOrchestrator):
         synthesizer_memory = synthesizer.run(
             synthesis_task,
             memory=synthesizer_memory,
-            max_iterations=10
+            max_iterations=10,
+            action_context_props=deadline_props
         )
         
         # Extract final result
@@ -4,6 +4,8 @@ from ..agents.orchestrator.agent import create_orchestrator_agent
 from ..agents.retrieval_worker.agent import create_retrieval_worker_agent
 from ..agents.synthesizer.agent import create_synthesizer_agent
 from ..orchestrators.coordinators.chatbot_pipeline import ChatbotPipelineOrchestrator
+from ..config.config import LLM_CASSETTE, LLM_CASSETTE_MODE
+from ..core.cassette import Cassette
 
 
 def main():
@@ -21,7 +23,8 @@ def main():
     
     # Create pipeline orchestrator
     pipeline = ChatbotPipelineOrchestrator(
-        agents=[orchestrator, retrieval_worker, synthesizer]
+        agents=[orchestrator, retrieval_worker, synthesizer],
+        cassette=Cassette(LLM_CASSETTE, LLM_CASSETTE_MODE) if LLM_CASSETTE else None
     )
     
     # Example query
@@ -0,0 +1 @@
+"""Offline test doubles for running agents without a real LLM provider"""
@@ -0,0 +1,60 @@
+"""Scripted stand-in for generate_response"""
+
+import asyncio
+import json
+import threading
+import time
+from typing import Callable, List, Sequence, Union
+
+from ..core.language import Prompt
+
+
+def conversation_turn(messages: Sequence[dict]) -> int:
+    """Number of decisions the model has already made in this conversation.
+
+    Environment results are also sent with the assistant role, so they are
+    told apart from decisions by the "tool_executed" marker they carry.
+    """
+    return sum(
+        1 for m in messages
+        if m.get("role") == "assistant" and '"tool_executed"' not in str(m.get("content", ""))
+    )
+
+
+def tool_call(tool: str, **args) -> str:
+    """Build a response string in generate_response's format"""
+    return json.dumps({"tool": tool, "args": args})
+
+
+class FakeLLM:
+    """Returns scripted responses by conversation turn, with optional latency.
+
+    ``script`` is either a list of responses (the last one repeats once the
+    script runs out) or a callable taking (prompt, turn). Because the
+    response is chosen from the prompt itself, one instance can serve many
+    concurrent sessions.
+    """
+
+    def __init__(self, script: Union[List[str], Callable[[Prompt, int], str]], latency: float = 0.0):
+        self.script = script
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _respond(self, prompt: Prompt) -> str:
+        with self._lock:
+            self.calls += 1
+        turn = conversation_turn(prompt.messages)
+        if callable(self.script):
+            return self.script(prompt, turn)
+        return self.script[min(turn, len(self.script) - 1)]
+
+    def __call__(self, prompt: Prompt, **kwargs) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._respond(prompt)
+
+    async def agenerate(self, prompt: Prompt, **kwargs) -> str:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._respond(prompt)
@@ -0,0 +1,262 @@
+"""Local OpenAI-compatible chat completions server for load testing.
+
+Point an LLMClient at ``server.url`` (``api_base``) and it behaves like a
+provider: scripted tool-call or text responses, configurable latency,
+random 500s and a requests-per-second limit that answers 429. Streaming
+requests are answered with server-sent events.
+"""
+
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List, Optional, Union
+
+from .fake_llm import conversation_turn, tool_call
+
+Script = Union[List[str], Callable[[dict, int], str]]
+
+
+def fixed_latency(seconds: float) -> Callable[[], float]:
+    return lambda: seconds
+
+
+def uniform_latency(low: float, high: float, seed: Optional[int] = None) -> Callable[[], float]:
+    rng = random.Random(seed)
+    return lambda: rng.uniform(low, high)
+
+
+def lognormal_latency(median: float, sigma: float = 0.5, seed: Optional[int] = None) -> Callable[[], float]:
+    """Long-tailed latency, the usual shape of provider response times"""
+    rng = random.Random(seed)
+    mu = math.log(median) if median > 0 else 0.0
+    return lambda: rng.lognormvariate(mu, sigma) if median > 0 else 0.0
+
+
+def default_script(request: dict, turn: int) -> str:
+    """Call the first tool that needs no arguments, then terminate"""
+    tools = [t["function"] for t in request.get("tools") or []]
+    if turn == 0:
+        for tool in tools:
+            if tool["name"] != "terminate" and not tool.get("parameters", {}).get("required"):
+                return tool_call(tool["name"])
+    if any(tool["name"] == "terminate" for tool in tools):
+        return tool_call("terminate", message="done")
+    return "done"
+
+
+class _RateLimiter:
+    """Token bucket allowing ``rate`` requests per second (burst of ``rate``)"""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Return 0 when the request may proceed, else seconds until it could"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+
+class FakeOpenAIServer:
+    """Threaded fake of POST /v1/chat/completions"""
+
+    def __init__(self,
+                 script: Optional[Script] = None,
+                 latency: Union[float, Callable[[], float]] = 0.0,
+                 error_rate: float = 0.0,
+                 rate_limit: Optional[float] = None,
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 seed: Optional[int] = None):
+        self.script = script or default_script
+        self.latency = latency if callable(latency) else fixed_latency(latency)
+        self.error_rate = error_rate
+        self.rate_limiter = _RateLimiter(rate_limit) if rate_limit else None
+        self.requests = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeOpenAIServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-openai", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"requests": self.requests, "errors": self.errors, "rate_limited": self.rate_limited}
+
+    def respond(self, request: dict) -> str:
+        """The scripted response (in generate_response's format) for a request"""
+        turn = conversation_turn(request.get("messages", []))
+        if callable(self.script):
+            return self.script(request, turn)
+        return self.script[min(turn, len(self.script) - 1)]
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    return self._json(404, {"error": {"message": f"Unknown path {self.path}"}})
+                with server._lock:
+                    server.requests += 1
+
+                if server.rate_limiter:
+                    wait = server.rate_limiter.acquire()
+                    if wait:
+                        with server._lock:
+                            server.rate_limited += 1
+                        return self._json(429, {"error": {"message": "Rate limit exceeded",
+                                                          "type": "rate_limit_error"}},
+                                          {"Retry-After": f"{wait:.3f}"})
+
+                time.sleep(max(0.0, server.latency()))
+                with server._lock:
+                    failed = server.error_rate and server._random.random() < server.error_rate
+                    if failed:
+                        server.errors += 1
+                if failed:
+                    return self._json(500, {"error": {"message": "Injected server error", "type": "server_error"}})
+
+                request = json.loads(body or b"{}")
+                response = server.respond(request)
+                calls = _decode_calls(response) if request.get("tools") else None
+                if request.get("stream"):
+                    self._stream(request, response, calls)
+                else:
+                    self._json(200, _completion(request, response, calls))
+
+            def _json(self, status: int, payload: dict, headers: dict = None):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _stream(self, request: dict, response: str, calls: Optional[List[dict]]):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                for chunk in _chunks(request, response, calls):
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+
+        return Handler
+
+
+def _decode_calls(response: str) -> Optional[List[dict]]:
+    """Turn a generate_response-format string back into tool calls"""
+    try:
+        parsed = json.loads(response)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(parsed, dict):
+        return None
+    if "tool_calls" in parsed:
+        return parsed["tool_calls"]
+    if "tool" in parsed:
+        return [parsed]
+    return None
+
+
+def _usage(request: dict, response: str) -> dict:
+    prompt_tokens = sum(len(str(m.get("content", ""))) for m in request.get("messages", [])) // 4
+    completion_tokens = len(response) // 4
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens}
+
+
+def _envelope(request: dict, obj: str, choices: list) -> dict:
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+        "object": obj,
+        "created": int(time.time()),
+        "model": request.get("model", "fake-model"),
+        "choices": choices,
+    }
+
+
+def _completion(request: dict, response: str, calls: Optional[List[dict]]) -> dict:
+    if calls:
+        message = {"role": "assistant", "content": None, "tool_calls": [
+            {"id": f"call_{i}", "type": "function",
+             "function": {"name": call["tool"], "arguments": json.dumps(call.get("args", {}))}}
+            for i, call in enumerate(calls)
+        ]}
+        finish_reason = "tool_calls"
+    else:
+        message = {"role": "assistant", "content": response}
+        finish_reason = "stop"
+    payload = _envelope(request, "chat.completion",
+                        [{"index": 0, "message": message, "finish_reason": finish_reason}])
+    payload["usage"] = _usage(request, response)
+    return payload
+
+
+def _chunks(request: dict, response: str, calls: Optional[List[dict]]):
+    def chunk(delta, finish_reason=None):
+        return _envelope(request, "chat.completion.chunk",
+                         [{"index": 0, "delta": delta, "finish_reason": finish_reason}])
+
+    if calls:
+        for i, call in enumerate(calls):
+            arguments = json.dumps(call.get("args", {}))
+            yield chunk({"role": "assistant", "tool_calls": [
+                {"index": i, "id": f"call_{i}", "type": "function",
+                 "function": {"name": call["tool"], "arguments": ""}}
+            ]})
+            for start in range(0, len(arguments), 16):
+                yield chunk({"tool_calls": [{"index": i, "function": {"arguments": arguments[start:start + 16]}}]})
+        yield chunk({}, "tool_calls")
+    else:
+        for start in range(0, len(response), 16):
+            yield chunk({"content": response[start:start + 16]})
+        yield chunk({}, "stop")
@@ -0,0 +1,184 @@
+"""Load generator for agents and pipelines.
+
+Drives N concurrent sessions and reports latency percentiles and sessions
+per second. Warmup sessions run first and are left out of the numbers, so
+one-off costs (importing litellm, opening connections) don't land in the
+percentiles. From the command line it starts a FakeOpenAIServer and points
+the real agents at it, so the numbers include litellm, HTTP and the
+framework but no provider::
+
+    python -m src.testing.loadgen --target agent --sessions 200 --concurrency 50 --latency 0.3
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, List, Optional
+
+
+def percentile(samples: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of samples (q in 0..100)"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(q / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def summarize(latencies: List[float], errors: int, wall: float, concurrency: int,
+              warmup: int = 0) -> Dict:
+    """Report for one load run; latencies in seconds, reported in ms"""
+    def ms(value):
+        return round(value * 1000, 3) if value is not None else None
+
+    sessions = len(latencies) + errors
+    return {
+        "sessions": sessions,
+        "concurrency": concurrency,
+        "warmup": warmup,
+        "errors": errors,
+        "wall_s": round(wall, 3),
+        "sessions_per_s": round(len(latencies) / wall, 3) if wall else None,
+        "mean_ms": ms(statistics.fmean(latencies)) if latencies else None,
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+    }
+
+
+def run_load(session: Callable[[int], object], sessions: int, concurrency: int,
+             warmup: int = 0) -> Dict:
+    """Run blocking sessions (e.g. Agent.run) on ``concurrency`` threads.
+
+    ``warmup`` sessions run one at a time beforehand and are not measured.
+    """
+    for index in range(-warmup, 0):
+        session(index)
+    latencies, errors = [], 0
+
+    def timed(index: int):
+        start = time.perf_counter()
+        session(index)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="session") as executor:
+        for future in [executor.submit(timed, i) for i in range(sessions)]:
+            try:
+                latencies.append(future.result())
+            except Exception:
+                errors += 1
+    return summarize(latencies, errors, time.perf_counter() - start, concurrency, warmup)
+
+
+async def arun_load(session: Callable[[int], Awaitable], sessions: int, concurrency: int,
+                    warmup: int = 0) -> Dict:
+    """Run async sessions (e.g. Agent.arun) with at most ``concurrency`` in flight.
+
+    ``warmup`` sessions run one at a time beforehand and are not measured.
+    """
+    for index in range(-warmup, 0):
+        await session(index)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed(index: int):
+        async with semaphore:
+            start = time.perf_counter()
+            await session(index)
+            return time.perf_counter() - start
+
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(*[timed(i) for i in range(sessions)], return_exceptions=True)
+    latencies = [o for o in outcomes if not isinstance(o, BaseException)]
+    return summarize(latencies, len(outcomes) - len(latencies), time.perf_counter() - start,
+                     concurrency, warmup)
+
+
+def _build_session(target: str, llm, use_async: bool):
+    """Session callable for a target, with every agent talking to llm"""
+    from ..agents.file_management.agent import create_file_management_agent
+
+    if target == "agent":
+        agent = create_file_management_agent(llm=llm)
+        if use_async:
+            return lambda i: agent.arun(f"List the text files (session {i})")
+        return lambda i: agent.run(f"List the text files (session {i})")
+
+    from ..agents.orchestrator.agent import create_orchestrator_agent
+    from ..agents.retrieval_worker.agent import create_retrieval_worker_agent
+    from ..core.agent import Agent
+    from ..core.language import AgentFunctionCallingActionLanguage, Goal
+    from ..orchestrators.coordinators.chatbot_pipeline import ChatbotPipelineOrchestrator
+    from ..tools.registry import PythonActionRegistry
+
+    registry = PythonActionRegistry.snapshot(tags=["system"])
+
+    def pipeline_session(i: int):
+        # A pipeline keeps the run's shared memory, so each session builds its
+        # own (the agent factories reuse cached registry snapshots)
+        retrieval_worker = create_retrieval_worker_agent(llm=llm)
+        # fetch_from_web is speculated at run start; keep load runs off the network
+        retrieval_worker.speculate = False
+        synthesizer = Agent(
+            name="Synthesizer",
+            goals=[Goal(priority=1, name="Synthesize", description="Summarize the retrieved information.")],
+            agent_language=AgentFunctionCallingActionLanguage(),
+            action_registry=registry,
+            llm=llm,
+        )
+        pipeline = ChatbotPipelineOrchestrator(
+            agents=[create_orchestrator_agent(llm=llm), retrieval_worker, synthesizer]
+        )
+        return pipeline.coordinate(f"Summarize the data files (session {i})")
+    return pipeline_session
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive concurrent sessions against a local fake provider")
+    parser.add_argument("--target", choices=["agent", "pipeline"], default="agent",
+                        help="agent: FileManagementAgent.run; pipeline: ChatbotPipelineOrchestrator.coordinate")
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=2, help="Unmeasured sessions run before the load")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Use Agent.arun on one event loop")
+    parser.add_argument("--latency", type=float, default=0.2, help="Median model latency in seconds")
+    parser.add_argument("--sigma", type=float, default=0.5, help="Log-normal spread of the latency (0 = fixed)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with a 500")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Requests per second before 429s")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", help="Write the JSON report here")
+    args = parser.parse_args(argv)
+
+    import logging
+    from ..core.llm import LLMClient
+    from .fake_openai_server import FakeOpenAIServer, fixed_latency, lognormal_latency
+
+    logging.getLogger("src").setLevel(logging.WARNING)
+    latency = lognormal_latency(args.latency, args.sigma, args.seed) if args.sigma else fixed_latency(args.latency)
+    if args.target == "pipeline" and args.use_async:
+        parser.error("--async is only supported for --target agent")
+
+    with FakeOpenAIServer(latency=latency, error_rate=args.error_rate,
+                          rate_limit=args.rate_limit, seed=args.seed) as server:
+        llm = LLMClient(model="openai/fake-model", api_base=server.url, api_key="fake",
+                        max_concurrency=args.concurrency, pool_size=args.concurrency)
+        session = _build_session(args.target, llm, args.use_async)
+        if args.use_async:
+            report = asyncio.run(arun_load(session, args.sessions, args.concurrency, args.warmup))
+        else:
+            report = run_load(session, args.sessions, args.concurrency, args.warmup)
+        report["target"] = args.target
+        report["server"] = server.stats()
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,16 @@
+import inspect
 from typing import Any, Dict
 
 from ..core.action import ActionContext
+from ..core.concurrency import run_sync
+from ..core.tracing import get_tracer
 from ..core.memory import Memory
 from .registry import register_tool
 
+# Share of the caller's remaining time a sub-agent may use; the rest is left
+# for the caller to act on the sub-agent's result
+SUBAGENT_TIME_FRACTION = 0.9
+
 
 @register_tool(tags=["agents"])
 def call_agent(
@@ -32,8 +39,22 @@ def call_agent(
     # invoked_memory = action_context.get_memory() or Memory()
     invoked_memory = Memory()
 
+    run_kwargs = {}
+    deadline = action_context.get_deadline()
+    if deadline:
+        if deadline.expired():
+            return {
+                "success": False,
+                "agent": agent_name,
+                "error": "Deadline exceeded before the agent was called",
+            }
+        run_kwargs["action_context_props"] = {"deadline": deadline.child(SUBAGENT_TIME_FRACTION)}
+
     try:
-        result_memory = agent_run(user_input=task, memory=invoked_memory)
+        with get_tracer().span("call_agent", agent=agent_name):
+            result_memory = agent_run(user_input=task, memory=invoked_memory, **run_kwargs)
+            if inspect.isawaitable(result_memory):
+                result_memory = run_sync(result_memory)
     except Exception as exc:  # pragma: no cover - defensive guardrail
         return {
             "success": False,
@@ -56,9 +77,48 @@ def call_agent(
             "error": "Agent completed but produced no results",
         }
 
+    if last_memory.get("deadline_exceeded"):
+        # Return what the sub-agent had when its time ran out
+        previous = result_memory.items[-2] if len(result_memory.items) > 1 else {}
+        return {
+            "success": False,
+            "agent": agent_name,
+            "error": "Deadline exceeded",
+            "partial_result": previous.get("content") if previous.get("type") != "user" else None,
+            "memory_items": len(result_memory.items),
+        }
+
     return {
         "success": True,
         "agent": agent_name,
         "result": last_memory.get("content", "No content"),
         "memory_items": len(result_memory.items),
-    }
\ No newline at end of file
+    }
+
+@register_tool(tags=["artifacts"], idempotent=True, execution="inline")
+def read_artifact(
+    action_context: ActionContext,
+    handle: str,
+    offset: int = 0,
+    length: int = 4000,
+) -> Dict[str, Any]:
+    """Read part of a large tool result that was stored as an artifact.
+
+    Results too large to keep in the conversation are replaced by an
+    artifact handle, size and preview. Read further slices with offset and
+    length (in bytes) until the needed information is found.
+    """
+    store = action_context.get("artifacts")
+    if store is None:
+        raise ValueError("No artifact store is configured for this agent")
+    # Half the spill threshold, so the slice itself is never spilled again
+    length = max(1, min(length, store.threshold // 2))
+    start, end, content = store.read_range(handle, offset, length)
+    size = store.size(handle)
+    return {
+        "artifact": handle,
+        "offset": start,
+        "content": content,
+        "next_offset": end if end < size else None,
+        "size": size,
+    }
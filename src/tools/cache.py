@@ -0,0 +1,129 @@
+"""Result caches for idempotent tools (see register_tool(cacheable=True))"""
+
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+_MISSING = object()
+
+
+def file_mtime(path) -> Optional[int]:
+    """Invalidation token for a file or directory: its mtime (None if missing)"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class ToolResultCache:
+    """Bounded, thread-safe LRU of a tool's results.
+
+    Entries are keyed on the call's arguments (defaults applied, so ``f()``
+    and ``f(x=None)`` share an entry) or on a custom ``key(**args)``. They
+    expire after ``ttl`` seconds and are dropped when ``version(**args)`` (for
+    example a file's mtime) no longer matches the value seen when the result
+    was stored. Failed calls are never cached.
+    """
+
+    def __init__(self,
+                 func: Callable,
+                 max_entries: int = 128,
+                 ttl: Optional[float] = None,
+                 key: Optional[Callable[..., Any]] = None,
+                 version: Optional[Callable[..., Any]] = None):
+        self.func = func
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.key_fn = key
+        self.version_fn = version
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._signature = inspect.signature(func)
+        self._entries: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _arguments(self, args: tuple, kwargs: dict) -> dict:
+        bound = self._signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        bound.arguments.pop("action_context", None)
+        return dict(bound.arguments)
+
+    def key(self, arguments: dict) -> Any:
+        if self.key_fn:
+            return self.key_fn(**arguments)
+        return json.dumps(arguments, sort_keys=True, default=str)
+
+    def get(self, key: Any, version: Any = None) -> Any:
+        """Return the cached result, or _MISSING"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, entry_version, result = entry
+                if expires_at is not None and expires_at <= time.monotonic():
+                    del self._entries[key]
+                elif entry_version != version:
+                    del self._entries[key]
+                    self.invalidations += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return result
+            self.misses += 1
+            return _MISSING
+
+    def set(self, key: Any, result: Any, version: Any = None):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, version, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+            }
+
+    def _lookup(self, args: tuple, kwargs: dict):
+        arguments = self._arguments(args, kwargs)
+        version = self.version_fn(**arguments) if self.version_fn else None
+        key = self.key(arguments)
+        return key, version, self.get(key, version)
+
+    def wrap(self) -> Callable:
+        """The cached function (sync or async, matching the tool)"""
+        func = self.func
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                key, version, result = self._lookup(args, kwargs)
+                if result is _MISSING:
+                    result = await func(*args, **kwargs)
+                    self.set(key, result, version)
+                return result
+            async_wrapper.cache = self
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key, version, result = self._lookup(args, kwargs)
+            if result is _MISSING:
+                result = func(*args, **kwargs)
+                self.set(key, result, version)
+            return result
+        wrapper.cache = self
+        return wrapper
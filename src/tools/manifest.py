@@ -0,0 +1,140 @@
+"""Precomputed tool manifest.
+
+``manifest.json`` holds the schema and flags of every tool defined in
+TOOL_MODULES, so PythonActionRegistry can offer tools to the model without
+importing the modules that define them (and their dependencies). A tool's
+module is imported the first time the tool is executed.
+
+Regenerate after adding or changing a tool (``--check`` only verifies it)::
+
+    python -m src.tools.manifest
+"""
+
+import functools
+import importlib
+import inspect
+import json
+from pathlib import Path
+from typing import Callable, Dict
+
+MANIFEST_PATH = Path(__file__).with_name("manifest.json")
+
+# Modules whose @register_tool functions are listed in the manifest, relative
+# to the top-level package. Later modules win when tool names collide, the
+# same as importing them in this order.
+TOOL_MODULES = [
+    "tools.agent_tools",
+    "agents.file_management.actions",
+    "agents.retrieval_worker.action",
+    "agents.orchestrator.actions",
+]
+
+_PACKAGE_ROOT = __package__.rsplit(".", 1)[0]
+
+
+def _module_name(module: str) -> str:
+    return f"{_PACKAGE_ROOT}.{module}"
+
+
+def build_manifest() -> Dict[str, dict]:
+    """Import every tool module and describe the tools it registered"""
+    from .registry import tools
+
+    manifest = {}
+    for module in TOOL_MODULES:
+        importlib.import_module(_module_name(module))
+        prefix = _module_name(module)
+        for name, tool in tools.items():
+            function = inspect.unwrap(tool["function"])
+            if function.__module__ != prefix:
+                continue
+            manifest[name] = {
+                "module": module,
+                "qualname": function.__qualname__,
+                "description": tool["description"],
+                "parameters": tool["parameters"],
+                "terminal": tool["terminal"],
+                "tags": tool["tags"],
+                "idempotent": tool.get("idempotent", False),
+                "speculate": tool.get("speculate", []),
+                "accepts_action_context": "action_context" in inspect.signature(function).parameters,
+                "is_async": inspect.iscoroutinefunction(function),
+                "execution": tool.get("execution", "thread"),
+            }
+    return dict(sorted(manifest.items()))
+
+
+def write_manifest(path: Path = MANIFEST_PATH) -> Dict[str, dict]:
+    manifest = build_manifest()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    return manifest
+
+
+@functools.lru_cache(maxsize=None)
+def load_manifest(path: Path = MANIFEST_PATH) -> Dict[str, dict]:
+    """Read the manifest (empty if it has not been generated)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def resolve(entry: dict) -> Callable:
+    """Import the tool's module and return the function register_tool stored"""
+    from .registry import registered_functions
+
+    module_name = _module_name(entry["module"])
+    importlib.import_module(module_name)
+    return registered_functions[(module_name, entry["qualname"])]
+
+
+def lazy_function(entry: dict) -> Callable:
+    """Stand-in that imports the real tool on its first call.
+
+    Keeps the tool's sync/async nature so the environment schedules it the
+    same way it would the real function.
+    """
+    target = None
+
+    def load():
+        nonlocal target
+        if target is None:
+            target = resolve(entry)
+            if getattr(target, "cache", None):
+                proxy.cache = target.cache
+        return target
+
+    if entry.get("is_async"):
+        async def proxy(*args, **kwargs):
+            return await load()(*args, **kwargs)
+    else:
+        def proxy(*args, **kwargs):
+            return load()(*args, **kwargs)
+    proxy.__name__ = proxy.__qualname__ = entry["qualname"]
+    proxy.load = load
+    return proxy
+
+
+def main(argv=None):
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Regenerate the tool manifest")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if manifest.json is out of date")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        if build_manifest() != load_manifest():
+            print(f"{MANIFEST_PATH} is out of date; run python -m src.tools.manifest")
+            sys.exit(1)
+        print(f"{MANIFEST_PATH} is up to date")
+        return
+    written = write_manifest()
+    print(f"Wrote {len(written)} tools to {MANIFEST_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Shared worker-process pool for CPU-bound tools (see register_tool(execution="process"))"""
+
+import functools
+import importlib
+import inspect
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional
+
+from ..core.deadline import DeadlineExceeded, current_deadline
+
+EXECUTION_MODES = ("inline", "thread", "process")
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+class ToolProcessError(RuntimeError):
+    """A tool's worker process died before returning a result"""
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Return the process-wide pool, creating it on first use.
+
+    Workers are spawned (not forked) so they never inherit the parent's
+    threads, locks or open connections; they stay up between calls.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            from ..config.config import TOOL_PROCESS_WORKERS
+            _pool = ProcessPoolExecutor(
+                max_workers=TOOL_PROCESS_WORKERS or os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def warm_process_pool() -> int:
+    """Start every worker now instead of on the first tool calls; returns the count"""
+    from ..config.config import TOOL_PROCESS_WORKERS
+    workers = TOOL_PROCESS_WORKERS or os.cpu_count() or 1
+    pool = get_process_pool()
+    for future in [pool.submit(_ping) for _ in range(workers)]:
+        future.result()
+    return workers
+
+
+def shutdown_process_pool(wait: bool = True):
+    """Stop the pool's workers (a new pool is started by the next process tool call)"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def _discard_pool(pool: ProcessPoolExecutor, cancel_futures: bool = True):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=cancel_futures)
+
+
+def _ping() -> bool:
+    return True
+
+
+def _invoke(module: str, qualname: str, args: tuple, kwargs: dict):
+    """Worker side: import the tool's module and call the undecorated function"""
+    target = importlib.import_module(module)
+    for part in qualname.split("."):
+        target = getattr(target, part)
+    return target(*args, **kwargs)
+
+
+def process_function(func: Callable) -> Callable:
+    """Blocking stand-in that runs ``func`` in the shared pool.
+
+    Arguments and the result cross the process boundary by pickling, so the
+    function must be defined at module level and take no action_context. A
+    worker crash is reported as ToolProcessError and the pool is replaced.
+
+    The wait is bounded by the current deadline. A call that overruns it
+    cannot be interrupted inside its worker, so the pool is retired: later
+    calls get fresh workers, calls already queued on the old pool still
+    finish, and its workers exit once they are idle. A tool that never
+    returns keeps its worker alive, so process tools must bound their own
+    I/O (e.g. a request timeout).
+    """
+    if inspect.iscoroutinefunction(func):
+        raise ValueError(f"{func.__qualname__}: async tools cannot run in a process")
+    if "<locals>" in func.__qualname__:
+        raise ValueError(f"{func.__qualname__}: process tools must be module-level functions")
+    if "action_context" in inspect.signature(func).parameters:
+        raise ValueError(f"{func.__qualname__}: process tools cannot take action_context")
+
+    @functools.wraps(func)
+    def proxy(*args, **kwargs):
+        pool = get_process_pool()
+        deadline = current_deadline()
+        try:
+            future = pool.submit(_invoke, func.__module__, func.__qualname__, args, kwargs)
+            if deadline is None:
+                return future.result()
+            try:
+                return deadline.result(future)
+            except DeadlineExceeded:
+                if not future.cancel():
+                    # Running: retire the pool so the stuck worker is not reused
+                    _discard_pool(pool, cancel_futures=False)
+                raise
+        except BrokenProcessPool as e:
+            _discard_pool(pool)
+            raise ToolProcessError(f"{func.__name__}: worker process crashed") from e
+    return proxy
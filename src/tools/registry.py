@@ -1,24 +1,44 @@
+import copy
 import inspect
-from typing import List, get_type_hints
+import threading
+from typing import Dict, List, Optional, get_type_hints
 
 from ..core.action import Action, ActionRegistry
+from ..core.schema import compile_validator, json_schema
+from .cache import ToolResultCache
+from .manifest import lazy_function, load_manifest
+from .process import EXECUTION_MODES, process_function
 
 # Global tool registries
 tools = {}
 tools_by_tag = {}
+# (module, qualname) -> registered (possibly cached) function, for manifest lookups
+registered_functions = {}
+
+# Catalog of every known tool (manifest entries overlaid with imported
+# tools), indexed by name and tag. Each entry carries the Action built for it
+# once, so registries are assembled by lookup rather than introspection.
+_catalog: Optional[Dict[str, dict]] = None
+_catalog_by_tag: Dict[str, Dict[str, None]] = {}
+_catalog_position: Dict[str, int] = {}
+_generation = 0
+_lock = threading.RLock()
+# Frozen registries handed out by PythonActionRegistry.snapshot: key -> (generation, registry)
+_snapshots: Dict[tuple, tuple] = {}
 
 
 def get_tool_metadata(func, tool_name=None, description=None, 
-                     parameters_override=None, terminal=False, tags=None):
+                     parameters_override=None, terminal=False, tags=None,
+                     idempotent=False, speculate=None):
     """Extract metadata from a function for tool registration"""
     tool_name = tool_name or func.__name__
     description = description or (
         func.__doc__.strip() if func.__doc__ else "No description provided."
     )
 
+    signature = inspect.signature(func)
     if parameters_override is None:
-        signature = inspect.signature(func)
-        type_hints = get_type_hints(func)
+        type_hints = get_type_hints(func, include_extras=True)
 
         args_schema = {
             "type": "object",
@@ -31,11 +51,12 @@ def get_tool_metadata(func, tool_name=None, description=None,
                 continue
 
             param_type = type_hints.get(param_name, str)
-            param_schema = {"type": _get_json_type(param_type)}
-            args_schema["properties"][param_name] = param_schema
+            args_schema["properties"][param_name] = json_schema(param_type)
 
             if param.default == inspect.Parameter.empty:
                 args_schema["required"].append(param_name)
+            elif isinstance(param.default, (str, int, float, bool, type(None))):
+                args_schema["properties"][param_name]["default"] = param.default
     else:
         args_schema = parameters_override
 
@@ -45,91 +66,230 @@ def get_tool_metadata(func, tool_name=None, description=None,
         "parameters": args_schema,
         "function": func,
         "terminal": terminal,
-        "tags": tags or []
+        "tags": tags or [],
+        "idempotent": idempotent,
+        "speculate": speculate or [],
+        "accepts_action_context": "action_context" in signature.parameters
     }
 
 
-def _get_json_type(param_type):
-    """Convert Python type to JSON schema type"""
-    type_map = {
-        str: "string",
-        int: "integer",
-        float: "number",
-        bool: "boolean",
-        list: "array",
-        dict: "object"
-    }
-    return type_map.get(param_type, "string")
+def _build_action(name: str, tool_desc: dict) -> Action:
+    return Action(
+        name=name,
+        function=tool_desc["function"],
+        description=tool_desc["description"],
+        parameters=tool_desc.get("parameters", {}),
+        terminal=tool_desc.get("terminal", False),
+        accepts_action_context=tool_desc.get("accepts_action_context", False),
+        idempotent=tool_desc.get("idempotent", False),
+        speculate=tool_desc.get("speculate"),
+        execution=tool_desc.get("execution", "thread"),
+        validator=compile_validator(name, tool_desc.get("parameters", {}))
+    )
+
+
+def _detached(action: Action) -> Action:
+    """Copy of a catalog Action with its own parameters schema"""
+    detached = copy.copy(action)
+    detached.parameters = copy.deepcopy(action.parameters)
+    return detached
+
+
+def _catalog_add(name: str, tool_desc: dict):
+    """Insert or replace a catalog entry and keep the tag index in step"""
+    previous = _catalog.get(name)
+    if previous is not None:
+        for tag in previous.get("tags", []):
+            _catalog_by_tag.get(tag, {}).pop(name, None)
+    else:
+        _catalog_position[name] = len(_catalog_position)
+    _catalog[name] = {**tool_desc, "action": _build_action(name, tool_desc)}
+    for tag in tool_desc.get("tags", []):
+        _catalog_by_tag.setdefault(tag, {})[name] = None
+
+
+def available_tools() -> Dict[str, dict]:
+    """Every known tool: imported ones, plus manifest entries not yet imported.
+
+    Manifest tools get a stand-in function that imports the defining module
+    on first call, so listing schemas never loads tool dependencies.
+    """
+    global _catalog
+    with _lock:
+        if _catalog is None:
+            _catalog = {}
+            for name, entry in load_manifest().items():
+                _catalog_add(name, {**entry, "function": lazy_function(entry)})
+            for name, tool_desc in tools.items():
+                _catalog_add(name, tool_desc)
+        return _catalog
 
 
 def register_tool(tool_name=None, description=None, parameters_override=None, 
-                 terminal=False, tags=None):
-    """Decorator to register a function as a tool"""
+                 terminal=False, tags=None, idempotent=False, speculate=None,
+                 cacheable=False, ttl=None, key=None, invalidate=None, max_entries=128,
+                 execution="thread"):
+    """Decorator to register a function as a tool
+
+    The signature is introspected and the JSON schema and Action are built
+    here, once, so registries never repeat that work.
+
+    ``idempotent`` marks tools that are safe to run more than once or ahead
+    of time; ``speculate`` lists argument dicts the model is likely to call an
+    idempotent tool with, which are started alongside the LLM call.
+
+    ``cacheable`` memoizes results in a bounded LRU (``max_entries``), shared
+    by every registry and session. ``ttl`` expires entries after that many
+    seconds, ``key(**args)`` overrides the cache key and ``invalidate(**args)``
+    returns a version token (e.g. a file mtime); a changed token discards
+    the cached result.
+
+    ``execution`` picks where a sync tool runs when an agent executes it:
+    ``"inline"`` on the agent's event loop (cheap, non-blocking tools),
+    ``"thread"`` on the environment's thread pool (blocking I/O, the default)
+    or ``"process"`` in the shared worker-process pool (CPU-bound work; the
+    function must be module-level, take no action_context and return a
+    picklable result). Cached results are served without leaving the caller.
+    """
+    if speculate and not idempotent:
+        raise ValueError("Only idempotent tools can be speculated")
+    if execution not in EXECUTION_MODES:
+        raise ValueError(f"execution must be one of {', '.join(EXECUTION_MODES)}")
+
     def decorator(func):
+        global _generation
+        function = process_function(func) if execution == "process" else func
+        cache = None
+        if cacheable:
+            cache = ToolResultCache(function, max_entries=max_entries, ttl=ttl, key=key, version=invalidate)
+            function = cache.wrap()
         metadata = get_tool_metadata(
-            func=func,
+            func=function,
             tool_name=tool_name,
             description=description,
             parameters_override=parameters_override,
             terminal=terminal,
-            tags=tags
+            tags=tags,
+            idempotent=idempotent,
+            speculate=speculate
         )
 
-        tools[metadata["tool_name"]] = {
+        name = metadata["tool_name"]
+        tool_desc = {
             "description": metadata["description"],
             "parameters": metadata["parameters"],
             "function": metadata["function"],
             "terminal": metadata["terminal"],
-            "tags": metadata["tags"]
+            "tags": metadata["tags"],
+            "idempotent": metadata["idempotent"],
+            "speculate": metadata["speculate"],
+            "cache": cache,
+            "accepts_action_context": metadata["accepts_action_context"],
+            "execution": execution
         }
-
-        for tag in metadata["tags"]:
-            if tag not in tools_by_tag:
-                tools_by_tag[tag] = []
-            tools_by_tag[tag].append(metadata["tool_name"])
+        with _lock:
+            tools[name] = tool_desc
+            registered_functions[(func.__module__, func.__qualname__)] = function
+            for tag in metadata["tags"]:
+                if tag not in tools_by_tag:
+                    tools_by_tag[tag] = []
+                tools_by_tag[tag].append(name)
+            if _catalog is not None:
+                _catalog_add(name, tool_desc)
+            _generation += 1
 
         return func
     return decorator
 
 
+def unregister_tool(name: str):
+    """Remove a tool registered with register_tool (e.g. one added by a test
+    or benchmark); registries built before the call keep their copy"""
+    global _generation
+    with _lock:
+        tool_desc = tools.pop(name, None)
+        if tool_desc is None:
+            raise KeyError(name)
+        for tag in tool_desc["tags"]:
+            names = tools_by_tag.get(tag, [])
+            if name in names:
+                names.remove(name)
+            if not names:
+                tools_by_tag.pop(tag, None)
+        for key, function in list(registered_functions.items()):
+            if function is tool_desc["function"]:
+                del registered_functions[key]
+        if _catalog is not None and name in _catalog:
+            for tag in _catalog.pop(name).get("tags", []):
+                _catalog_by_tag.get(tag, {}).pop(name, None)
+            del _catalog_position[name]
+        _generation += 1
+
+
+def _select(tags: Optional[List[str]], tool_names: Optional[List[str]]) -> List[str]:
+    """Names of the matching tools (terminate excluded), in catalog order"""
+    catalog = available_tools()
+    if tags:
+        selected = {}
+        for tag in tags:
+            selected.update(_catalog_by_tag.get(tag, {}))
+        if tool_names:
+            wanted = set(tool_names)
+            selected = {name: None for name in selected if name in wanted}
+    elif tool_names:
+        selected = {name: None for name in tool_names if name in catalog}
+    else:
+        selected = catalog
+    return sorted((name for name in selected if name != "terminate"), key=_catalog_position.__getitem__)
+
+
 class PythonActionRegistry(ActionRegistry):
-    """Action registry that loads from decorated functions"""
+    """Action registry assembled from the tool catalog's tag and name indexes"""
     
     def __init__(self, tags: List[str] = None, tool_names: List[str] = None):
         super().__init__()
-        self.terminate_tool = None
+        with _lock:
+            catalog = available_tools()
+            self.terminate_tool = catalog.get("terminate")
+            for name in _select(tags, tool_names):
+                self.register(catalog[name]["action"])
 
-        for tool_name, tool_desc in tools.items():
-            if tool_name == "terminate":
-                self.terminate_tool = tool_desc
-                continue
+    @classmethod
+    def snapshot(cls, tags: List[str] = None, tool_names: List[str] = None,
+                 terminate: bool = True) -> "PythonActionRegistry":
+        """Return a frozen registry shared by every caller asking for the same tools.
 
-            if tool_names and tool_name not in tool_names:
-                continue
+        Snapshots are cached until a new tool is registered, so per-request
+        agent creation costs a dictionary lookup. Tool schemas come from the
+        tool manifest; a tool's module is only imported when it first runs.
+        Snapshot actions are copies, so changing one cannot alter the
+        catalog or registries built from it.
+        """
+        key = (tuple(tags or ()), tuple(tool_names or ()), terminate)
+        with _lock:
+            cached = _snapshots.get(key)
+            if cached is not None and cached[0] == _generation:
+                return cached[1]
+            registry = cls(tags=tags, tool_names=tool_names)
+            if terminate:
+                registry.register_terminate_tool()
+            registry.actions = {name: _detached(action) for name, action in registry.actions.items()}
+            registry.freeze()
+            _snapshots[key] = (_generation, registry)
+            return registry
 
-            tool_tags = tool_desc.get("tags", [])
-            if tags and not any(tag in tool_tags for tag in tags):
-                continue
-
-            self.register(Action(
-                name=tool_name,
-                function=tool_desc["function"],
-                description=tool_desc["description"],
-                parameters=tool_desc.get("parameters", {}),
-                terminal=tool_desc.get("terminal", False),
-                accepts_action_context="action_context" in inspect.signature(tool_desc["function"]).parameters
-            ))
+    def cache_stats(self) -> dict:
+        """Result cache statistics for this registry's cacheable tools"""
+        return {
+            name: action.function.cache.stats()
+            for name, action in self.actions.items()
+            if getattr(action.function, "cache", None)
+        }
 
     def register_terminate_tool(self):
         """Register the terminate tool"""
         if self.terminate_tool:
-            self.register(Action(
-                name="terminate",
-                function=self.terminate_tool["function"],
-                description=self.terminate_tool["description"],
-                parameters=self.terminate_tool.get("parameters", {}),
-                terminal=self.terminate_tool.get("terminal", False),
-                accepts_action_context="action_context" in inspect.signature(self.terminate_tool["function"]).parameters
-            ))
+            self.register(self.terminate_tool["action"])
         else:
             raise Exception("Terminate tool not found in tool registry")
+
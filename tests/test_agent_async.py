@@ -0,0 +1,104 @@
+"""Tests for the async GAME loop"""
+
+import asyncio
+import contextvars
+import json
+import threading
+
+from core.action import Action, ActionRegistry
+from core.agent import Agent
+from core.concurrency import run_sync
+from core.environment import Environment
+from core.language import AgentFunctionCallingActionLanguage, Goal
+
+
+def _make_agent(responses, **kwargs):
+    registry = ActionRegistry()
+    registry.register(Action(
+        name="terminate",
+        function=lambda message: message,
+        description="Finish",
+        parameters={"type": "object", "properties": {"message": {"type": "string"}}},
+        terminal=True,
+    ))
+    replies = iter(responses)
+    return Agent(
+        goals=[Goal(priority=1, name="Test", description="Test goal")],
+        agent_language=AgentFunctionCallingActionLanguage(),
+        action_registry=registry,
+        generate_response=lambda prompt: next(replies),
+        environment=Environment(),
+        **kwargs
+    )
+
+
+def test_run_is_wrapper_around_arun():
+    """Test the sync API still drives the loop to termination"""
+    agent = _make_agent([json.dumps({"tool": "terminate", "args": {"message": "done"}})])
+    memory = agent.run("task")
+
+    assert [m["type"] for m in memory.items] == ["user", "assistant", "environment"]
+    assert json.loads(memory.items[-1]["content"])["result"] == "done"
+
+
+def test_arun_uses_async_generate_response():
+    """Test concurrent runs share one event loop"""
+    async def agenerate(prompt):
+        await asyncio.sleep(0.01)
+        return json.dumps({"tool": "terminate", "args": {"message": "async"}})
+
+    agents = [_make_agent([], agenerate_response=agenerate) for _ in range(20)]
+
+    async def main():
+        return await asyncio.gather(*[agent.arun("task") for agent in agents])
+
+    memories = asyncio.run(main())
+    assert all(json.loads(m.items[-1]["content"])["result"] == "async" for m in memories)
+
+
+def test_aexecute_action_awaits_coroutine_tools():
+    """Test coroutine tools are awaited by the environment"""
+    async def tool(value: str) -> str:
+        return value.upper()
+
+    action = Action(name="upper", function=tool, description="", parameters={})
+    result = asyncio.run(Environment().aexecute_action(action, {"value": "ok"}))
+    assert result["result"] == "OK"
+
+
+def test_prompt_prefix_compiled_once():
+    """Test the goals/tools prefix is only rebuilt when the registry changes"""
+    agent = _make_agent([])
+    calls = []
+    compile_prefix = agent.agent_language.compile_prefix
+    agent.agent_language.compile_prefix = lambda **kw: calls.append(1) or compile_prefix(**kw)
+
+    first = agent.get_prompt_prefix()
+    assert agent.get_prompt_prefix() is first
+    agent.actions.register(Action(name="extra", function=lambda: None, description="", parameters={}))
+    assert agent.get_prompt_prefix() is not first
+    assert len(calls) == 2
+
+
+def test_run_sync_reuses_one_loop_and_keeps_context():
+    """Test sync callers on any thread share one long-lived loop and keep their context"""
+    var = contextvars.ContextVar("var", default=None)
+
+    async def probe():
+        return asyncio.get_running_loop(), var.get()
+
+    var.set("caller")
+    loops = [run_sync(probe())]
+    thread = threading.Thread(target=lambda: loops.append(run_sync(probe())))
+    thread.start()
+    thread.join()
+
+    assert loops[0][0] is loops[1][0] and loops[0][0].is_running()
+    assert loops[0][1] == "caller" and loops[1][1] is None
+
+    async def nested():
+        # Inside a running loop run_sync must not block on that same loop
+        return run_sync(probe())
+
+    inner_loop, value = run_sync(nested())
+    assert inner_loop is not loops[0][0] and value == "caller"
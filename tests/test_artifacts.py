@@ -0,0 +1,91 @@
+"""Tests for spilling large tool results to the artifact store"""
+
+import json
+
+from src.core.action import Action, ActionContext, ActionRegistry
+from src.core.agent import Agent
+from src.core.artifacts import ArtifactStore
+from src.core.environment import Environment
+from src.core.language import AgentFunctionCallingActionLanguage, Goal
+from src.tools.agent_tools import read_artifact
+
+
+def test_store_is_content_addressed_and_reads_whole_characters(tmp_path):
+    """Test identical content shares a handle and slices never split a character"""
+    store = ArtifactStore(str(tmp_path), threshold=10)
+    handle = store.put("héllo wörld")
+    assert store.put("héllo wörld") == handle
+    assert len(list(tmp_path.rglob(handle))) == 1
+    assert store.size(handle) == len("héllo wörld".encode("utf-8"))
+
+    # Byte 2 falls inside "é": the slice moves to the next whole character
+    assert store.read_range(handle, 2, 4) == (3, 6, "llo")
+    assert store.read(handle) == "héllo wörld"
+
+
+def test_environment_keeps_a_reference_for_large_results(tmp_path):
+    """Test results over the threshold become a handle, size and preview"""
+    store = ArtifactStore(str(tmp_path), threshold=100, preview_chars=20)
+    environment = Environment(artifacts=store)
+    page = "line of text\n" * 1000
+    action = Action(name="fetch", function=lambda: page, description="", parameters={})
+
+    result = environment.execute_action(action, {})["result"]
+    assert result["size"] == len(page)
+    assert result["preview"] == page[:20]
+    assert store.read(result["artifact"]) == page
+
+    small = Action(name="small", function=lambda: {"ok": True}, description="", parameters={})
+    assert environment.execute_action(small, {})["result"] == {"ok": True}
+
+
+def test_agent_memory_stays_flat_and_read_artifact_pages_through(tmp_path):
+    """Test memory holds the reference and read_artifact returns slices on demand"""
+    store = ArtifactStore(str(tmp_path), threshold=200, preview_chars=10)
+    document = "".join(f"{i:05d}\n" for i in range(10000))
+    registry = ActionRegistry()
+    registry.register(Action(name="load", function=lambda: document, description="", parameters={}))
+    registry.register(Action(name="terminate", function=lambda message: message,
+                             description="", parameters={}, terminal=True))
+    replies = iter([json.dumps({"tool": "load", "args": {}}),
+                    json.dumps({"tool": "terminate", "args": {"message": "done"}})])
+    agent = Agent(
+        goals=[Goal(priority=1, name="Test", description="Test goal")],
+        agent_language=AgentFunctionCallingActionLanguage(),
+        action_registry=registry,
+        generate_response=lambda prompt: next(replies),
+        environment=Environment(artifacts=store),
+    )
+
+    memory = agent.run("task")
+    assert max(len(m["content"]) for m in memory.items) < 400
+    handle = json.loads(memory.items[2]["content"])["result"]["artifact"]
+
+    context = ActionContext({"artifacts": store})
+    page = read_artifact(context, handle, offset=6, length=12)
+    assert page == {"artifact": handle, "offset": 6, "content": "00001\n00002\n",
+                    "next_offset": 18, "size": len(document)}
+    # Slices are capped at half the threshold so they are never spilled again
+    assert len(read_artifact(context, handle, length=10 ** 6)["content"]) == 100
+
+
+def test_terminal_results_are_never_spilled(tmp_path):
+    """Test a long final answer is returned in full instead of as a reference"""
+    store = ArtifactStore(str(tmp_path), threshold=10)
+    answer = "a long final answer " * 100
+    terminate = Action(name="terminate", function=lambda: answer, description="", parameters={}, terminal=True)
+    assert Environment(artifacts=store).execute_action(terminate, {})["result"] == answer
+
+
+def test_read_artifact_is_only_offered_with_a_store(monkeypatch):
+    """Test agents only get read_artifact when artifact spilling is enabled"""
+    import src.config.config as config
+    from src.agents.retrieval_worker.agent import create_retrieval_worker_agent
+
+    monkeypatch.setattr(config, "ARTIFACT_THRESHOLD", 0)
+    agent = create_retrieval_worker_agent()
+    assert agent.environment.artifacts is None
+    assert "read_artifact" not in agent.actions.get_action_names()
+
+    monkeypatch.setattr(config, "ARTIFACT_THRESHOLD", 8000)
+    assert "read_artifact" in create_retrieval_worker_agent().actions.get_action_names()
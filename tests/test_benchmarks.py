@@ -0,0 +1,16 @@
+"""Smoke test for the benchmark suite"""
+
+import json
+
+from benchmarks import run as bench_run
+
+
+def test_quick_benchmarks_produce_results(tmp_path):
+    """Test selected benchmarks run and the result file is machine-readable"""
+    output = tmp_path / "results.json"
+    bench_run.main(["--quick", "--output", str(output), "--only", "format_memory", "execute_action"])
+
+    document = json.loads(output.read_text())
+    assert set(document["results"]) == {"format_memory", "execute_action"}
+    assert document["results"]["format_memory"]["10"]["median_us"] > 0
+    assert "format_memory.10" in bench_run.compare(str(output), str(output))
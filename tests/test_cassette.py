@@ -0,0 +1,167 @@
+"""Tests for LLM record/replay cassettes"""
+
+import json
+
+import pytest
+
+from core.action import Action, ActionRegistry
+from core.agent import Agent
+from core.cassette import Cassette, CassetteMissError
+from core.environment import Environment
+from core.language import AgentFunctionCallingActionLanguage, Goal, Prompt
+
+
+def _agent(generate_response):
+    registry = ActionRegistry()
+    registry.register(Action(name="clock", function=lambda: "tick", description="", parameters={}))
+    registry.register(Action(name="terminate", function=lambda message: message,
+                             description="", parameters={}, terminal=True))
+    return Agent(
+        goals=[Goal(priority=1, name="Test", description="Test goal")],
+        agent_language=AgentFunctionCallingActionLanguage(),
+        action_registry=registry,
+        generate_response=generate_response,
+        environment=Environment(),
+    )
+
+
+def test_record_then_replay_offline(tmp_path):
+    """Test a replayed run matches the recorded one without calling the LLM"""
+    path = str(tmp_path / "run.jsonl")
+    replies = iter([
+        json.dumps({"tool": "clock", "args": {}}),
+        json.dumps({"tool": "terminate", "args": {"message": "done"}}),
+    ])
+    recorded = Cassette(path, "record").attach(_agent(lambda prompt: next(replies)), tools=["clock"])
+    first = recorded.run("task")
+
+    def offline(prompt):
+        raise AssertionError("network call during replay")
+
+    replayed = Cassette(path, "replay").attach(_agent(offline), tools=["clock"])
+    second = replayed.run("task")
+
+    assert [m["content"] for m in first.items[:2]] == [m["content"] for m in second.items[:2]]
+    assert json.loads(second.items[-1]["content"])["result"] == "done"
+
+
+def test_replay_miss_raises(tmp_path):
+    """Test unknown prompts fail loudly in replay mode"""
+    path = tmp_path / "empty.jsonl"
+    path.write_text("")
+    generate = Cassette(str(path), "replay").wrap(lambda prompt: "unused")
+    with pytest.raises(CassetteMissError):
+        generate(Prompt(messages=[{"role": "user", "content": "hi"}]))
+
+
+def test_replay_matches_prompts_with_nested_sub_agent_results(tmp_path, monkeypatch):
+    """Test a delegating run replays although every tool ran at a different time"""
+    import itertools
+    import core.environment
+
+    ticks = itertools.count()
+    monkeypatch.setattr(core.environment.time, "strftime", lambda fmt: f"T{next(ticks)}")
+
+    def run(cassette, generate_response):
+        sub = cassette.attach(_agent(generate_response))
+        registry = ActionRegistry()
+        registry.register(Action(name="delegate", description="", parameters={},
+                                 function=lambda: {"result": sub.run("sub task").get_last_memory()["content"]}))
+        registry.register(Action(name="terminate", function=lambda message: message,
+                                 description="", parameters={}, terminal=True))
+        orchestrator = cassette.attach(Agent(
+            goals=[Goal(priority=1, name="Test", description="Test goal")],
+            agent_language=AgentFunctionCallingActionLanguage(),
+            action_registry=registry,
+            generate_response=generate_response,
+            environment=Environment(),
+        ))
+        return orchestrator.run("task")
+
+    path = str(tmp_path / "run.jsonl")
+    replies = {
+        "task": [json.dumps({"tool": "delegate", "args": {}}),
+                 json.dumps({"tool": "terminate", "args": {"message": "done"}})],
+        "sub task": [json.dumps({"tool": "clock", "args": {}}),
+                     json.dumps({"tool": "terminate", "args": {"message": "sub done"}})],
+    }
+    scripted = {task: iter(responses) for task, responses in replies.items()}
+    first = run(Cassette(path, "record"), lambda prompt: next(scripted[prompt.messages[1]["content"]]))
+
+    def offline(prompt):
+        raise AssertionError("network call during replay")
+
+    second = run(Cassette(path, "replay"), offline)
+    assert [m["content"] for m in second.items] == [m["content"] for m in first.items]
+
+
+def test_pipeline_replays_with_no_network(tmp_path, monkeypatch):
+    """Test ChatbotPipelineOrchestrator replays LLM calls and web fetches from the cassette"""
+    import itertools
+    import socket
+
+    import src.core.environment
+    import src.tools.process
+    from src.agents.orchestrator.agent import create_orchestrator_agent
+    from src.agents.retrieval_worker.agent import create_retrieval_worker_agent
+    from src.core.agent import Agent as PackageAgent
+    from src.core.cassette import Cassette as PackageCassette
+    from src.core.language import AgentFunctionCallingActionLanguage as PackageLanguage, Goal as PackageGoal
+    from src.orchestrators.coordinators.chatbot_pipeline import ChatbotPipelineOrchestrator
+    from src.testing.fake_llm import FakeLLM, tool_call
+    from src.tools.registry import PythonActionRegistry
+
+    ticks = itertools.count()
+    monkeypatch.setattr(src.core.environment.time, "strftime", lambda fmt: f"T{next(ticks)}")
+    page = "Richmond has 230,000 residents."
+
+    def pipeline(cassette, offline):
+        agents = [
+            create_orchestrator_agent(),
+            create_retrieval_worker_agent(),
+            PackageAgent(name="Synthesizer",
+                         goals=[PackageGoal(priority=1, name="Synthesize", description="Summarize.")],
+                         agent_language=PackageLanguage(),
+                         action_registry=PythonActionRegistry.snapshot(tags=["system"])),
+        ]
+        scripts = {
+            "Orchestrator": [tool_call("terminate", message="fetch the population")],
+            "RetrievalWorker": [tool_call("fetch_from_web"), tool_call("terminate", message=page)],
+            "Synthesizer": [tool_call("terminate", message="Richmond: 230,000")],
+        }
+        for agent in agents:
+            llm = FakeLLM(scripts[agent.name])
+            agent.generate_response, agent.agenerate_response = (offline, offline) if offline else \
+                (llm, llm.agenerate)
+        worker = agents[1]
+        if not offline:
+            # Record a canned page instead of fetching one
+            execute = worker.environment.aexecute_action
+
+            async def fake_fetch(action, args, action_context=None):
+                if action.name == "fetch_from_web":
+                    return worker.environment.format_result(page, action)
+                return await execute(action, args, action_context)
+            worker.environment.aexecute_action = fake_fetch
+        return ChatbotPipelineOrchestrator(agents=agents, cassette=cassette)
+
+    path = str(tmp_path / "pipeline.jsonl")
+    recorded = pipeline(PackageCassette(path, "record"), offline=None).coordinate("Population of Richmond?")
+
+    network = []
+
+    def blocked(*args, **kwargs):
+        network.append(args)
+        raise AssertionError("network access during replay")
+
+    async def offline(prompt, **kwargs):
+        raise AssertionError("LLM call during replay")
+
+    monkeypatch.setattr(socket.socket, "connect", blocked)
+    monkeypatch.setattr(socket, "getaddrinfo", blocked)
+    monkeypatch.setattr(src.tools.process, "get_process_pool", blocked)
+    ticks = itertools.count()
+    replayed = pipeline(PackageCassette(path, "replay"), offline=offline).coordinate("Population of Richmond?")
+
+    assert network == []
+    assert replayed == recorded and "230,000" in replayed
@@ -0,0 +1,132 @@
+"""Tests for run deadlines and their propagation to sub-agents"""
+
+import asyncio
+import json
+import time
+
+from src.core.action import Action, ActionContext, ActionRegistry
+from src.core.agent import Agent
+from src.core.agent_registry import AgentRegistry
+from src.core.deadline import Deadline, DeadlineExceeded
+from src.core.environment import Environment
+from src.core.language import AgentFunctionCallingActionLanguage, Goal
+from src.tools.agent_tools import call_agent
+
+
+def _call(tool, **args):
+    return json.dumps({"tool": tool, "args": args})
+
+
+def _agent(agenerate, extra_actions=(), **kwargs):
+    registry = ActionRegistry()
+    for action in extra_actions:
+        registry.register(action)
+    registry.register(Action(name="terminate", function=lambda message: message,
+                             description="", parameters={}, terminal=True))
+    return Agent(
+        goals=[Goal(priority=1, name="Test", description="Test goal")],
+        agent_language=AgentFunctionCallingActionLanguage(),
+        action_registry=registry,
+        agenerate_response=agenerate,
+        environment=Environment(),
+        speculate=False,
+        **kwargs
+    )
+
+
+def test_child_deadline_takes_a_share_and_follows_cancellation():
+    """Test child deadlines never outlive their parent and expire when it is cancelled"""
+    parent = Deadline.after(10)
+    child = parent.child(0.5)
+    assert 4.5 < child.remaining() <= 5
+    assert Deadline.after(None).remaining() is None
+    assert Deadline.after(60, parent=parent).remaining() <= 10
+
+    parent.cancel()
+    assert child.expired() and child.remaining() == 0.0
+
+
+def test_wait_stops_when_a_parent_is_cancelled():
+    """Test an in-flight wait on a child deadline ends as soon as the parent is cancelled"""
+    parent = Deadline.after(None)
+    child = parent.child()
+
+    async def main():
+        asyncio.get_running_loop().call_later(0.05, parent.cancel)
+        started = time.monotonic()
+        try:
+            await child.wait(asyncio.sleep(10))
+        except DeadlineExceeded as error:
+            return str(error), time.monotonic() - started
+        return None, None
+
+    message, elapsed = asyncio.run(main())
+    assert message == "Cancelled" and elapsed < 1
+
+
+def test_slow_llm_call_stops_the_run_with_partial_memory():
+    """Test the LLM call is cut off at the deadline and the run ends cleanly"""
+    replies = iter([_call("lookup"), None])
+
+    async def agenerate(prompt):
+        reply = next(replies)
+        if reply is None:
+            await asyncio.sleep(5)
+        return reply
+
+    lookup = Action(name="lookup", function=lambda: "found", description="", parameters={})
+    agent = _agent(agenerate, [lookup], timeout=0.2)
+
+    start = time.perf_counter()
+    memory = agent.run("task")
+    assert time.perf_counter() - start < 2
+    assert [m["type"] for m in memory.items] == ["user", "assistant", "environment", "environment"]
+    assert json.loads(memory.items[2]["content"])["result"] == "found"
+    assert memory.items[-1]["deadline_exceeded"]
+
+
+def test_slow_tool_is_bounded_by_the_deadline():
+    """Test a tool still running at the deadline is reported and the loop stops"""
+    async def slow():
+        await asyncio.sleep(5)
+
+    async def agenerate(prompt):
+        return _call("slow")
+
+    agent = _agent(agenerate, [Action(name="slow", function=slow, description="", parameters={})])
+    memory = asyncio.run(agent.arun("task", timeout=0.2))
+
+    tool_result = json.loads(memory.items[2]["content"])
+    assert tool_result == {"tool_executed": False, "error": "Deadline exceeded", "deadline_exceeded": True}
+    assert memory.items[-1]["deadline_exceeded"]
+
+
+def test_call_agent_passes_a_reduced_deadline_and_returns_partial_results():
+    """Test sub-agents inherit the caller's deadline and report what they had"""
+    seen = []
+    replies = iter([_call("step"), None])
+
+    async def agenerate(prompt):
+        reply = next(replies)
+        if reply is None:
+            await asyncio.sleep(5)
+        return reply
+
+    step = Action(name="step", function=lambda action_context: seen.append(action_context.get_deadline()) or "half done",
+                  description="", parameters={}, accepts_action_context=True)
+    child = _agent(agenerate, [step])
+    registry = AgentRegistry()
+    registry.register_agent("Child", child.run)
+
+    parent_deadline = Deadline.after(0.3)
+    result = call_agent(ActionContext({"agent_registry": registry, "deadline": parent_deadline}), "Child", "task")
+
+    assert result["success"] is False
+    assert result["error"] == "Deadline exceeded"
+    assert "half done" in result["partial_result"]
+    assert seen[0].expires_at < parent_deadline.expires_at
+    assert seen[0].cancelled
+
+    parent_deadline.cancel()
+    result = call_agent(ActionContext({"agent_registry": registry, "deadline": parent_deadline}), "Child", "task")
+    assert result["error"] == "Deadline exceeded before the agent was called"
@@ -0,0 +1,113 @@
+"""Tests for the local OpenAI-compatible server and the load generator"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from src.core.language import Prompt
+from src.core.llm import LLMClient, _litellm
+from src.testing.fake_llm import tool_call
+from src.testing.fake_openai_server import FakeOpenAIServer
+from src.testing.loadgen import arun_load, percentile, run_load
+
+TOOLS = [
+    {"type": "function", "function": {"name": "list_txt_files", "parameters": {"type": "object", "properties": {}}}},
+    {"type": "function", "function": {"name": "terminate", "parameters": {
+        "type": "object", "properties": {"message": {"type": "string"}}, "required": ["message"]}}},
+]
+
+
+def _client(server, **kwargs):
+    return LLMClient(model="openai/fake-model", api_base=server.url, api_key="fake",
+                     backoff_base=0.01, **kwargs)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def litellm_loaded():
+    """Load litellm before any server or client threads are running"""
+    _litellm()
+
+
+def test_scripted_tool_calls_round_trip_through_litellm():
+    """Test sync, async and streamed requests all decode to the scripted call"""
+    script = [json.dumps({"tool_calls": [
+        {"tool": "list_txt_files", "args": {}},
+        {"tool": "terminate", "args": {"message": "done"}},
+    ]})]
+    prompt = Prompt(messages=[{"role": "user", "content": "hi"}], tools=TOOLS)
+    early = []
+    with FakeOpenAIServer(script=script) as server:
+        client = _client(server)
+        assert json.loads(asyncio.run(client.agenerate(prompt))) == json.loads(script[0])
+        streamed = asyncio.run(client.astream(prompt, on_tool_call=lambda i, call: early.append(call["tool"])))
+        assert json.loads(streamed) == json.loads(script[0])
+        # Last, so litellm's logging thread for the sync call overlaps no other request
+        assert json.loads(client.generate(prompt)) == json.loads(script[0])
+        assert server.stats()["requests"] == 3
+    assert early == ["list_txt_files", "terminate"]
+
+
+def test_rate_limit_answers_429_and_client_retries():
+    """Test requests over the limit get 429s that the client backs off from"""
+    prompt = Prompt(messages=[{"role": "user", "content": "hi"}], tools=TOOLS)
+    with FakeOpenAIServer(script=[tool_call("terminate", message="ok")], rate_limit=5) as server:
+        client = _client(server, max_retries=10)
+
+        async def burst():
+            return await asyncio.gather(*[client.agenerate(prompt) for _ in range(8)])
+
+        results = asyncio.run(burst())
+        assert len(results) == 8
+        assert server.stats()["rate_limited"] > 0
+
+
+def test_error_rate_injects_server_errors():
+    """Test every request fails when error_rate is 1"""
+    prompt = Prompt(messages=[{"role": "user", "content": "hi"}])
+    with FakeOpenAIServer(error_rate=1.0) as server:
+        with pytest.raises(Exception):
+            _client(server, max_retries=1).generate(prompt)
+        assert server.stats()["errors"] == 2
+
+
+def test_load_reports_percentiles_and_throughput():
+    """Test the thread and async drivers report latency and sessions per second"""
+    report = run_load(lambda i: time.sleep(0.01), sessions=20, concurrency=5)
+    assert report["sessions"] == 20 and report["errors"] == 0
+    assert report["p50_ms"] >= 10 and report["p99_ms"] >= report["p50_ms"]
+    assert report["sessions_per_s"] > 0
+
+    async def session(i):
+        if i == 3:
+            raise RuntimeError("boom")
+        await asyncio.sleep(0.01)
+
+    report = asyncio.run(arun_load(session, sessions=10, concurrency=10))
+    assert report["errors"] == 1
+    assert report["wall_s"] < 0.5
+    assert percentile([1, 2, 3, 4], 50) == 2
+
+
+def test_warmup_sessions_are_not_measured():
+    """Test warmup sessions run first and stay out of the latency numbers"""
+    calls = []
+
+    def session(i):
+        calls.append(i)
+        time.sleep(0.2 if i < 0 else 0.001)
+
+    report = run_load(session, sessions=4, concurrency=2, warmup=2)
+    assert calls[:2] == [-2, -1] and sorted(calls[2:]) == [0, 1, 2, 3]
+    assert report["sessions"] == 4 and report["warmup"] == 2
+    assert report["p99_ms"] < 200
+
+    async def asession(i):
+        calls.append(i)
+        await asyncio.sleep(0.2 if i < 0 else 0.001)
+
+    calls.clear()
+    report = asyncio.run(arun_load(asession, sessions=4, concurrency=4, warmup=1))
+    assert calls[0] == -1 and report["sessions"] == 4
+    assert report["p99_ms"] < 200
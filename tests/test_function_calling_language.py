@@ -25,3 +25,18 @@ def test_format_memory(sample_memory):
     assert len(messages) == 2
     assert messages[0]["role"] == "user"
     assert messages[1]["role"] == "assistant"
+
+
+def test_construct_prompt_reuses_prefix(sample_memory):
+    """Test the compiled prefix is shared and placed first"""
+    language = AgentFunctionCallingActionLanguage()
+    goals = [Goal(priority=1, name="Test", description="Test goal")]
+    actions = [Action(name="noop", function=lambda: None, description="Does nothing", parameters={})]
+
+    prefix = language.compile_prefix(actions, goals)
+    first = language.construct_prompt(actions, None, goals, sample_memory, prefix=prefix)
+    second = language.construct_prompt(actions, None, goals, sample_memory, prefix=prefix)
+
+    assert first.tools is prefix.tools and second.tools is prefix.tools
+    assert first.messages[0] is prefix.messages[0]
+    assert first.metadata["prefix_messages"] == 1
@@ -0,0 +1,201 @@
+"""Tests for the pooled LLM client"""
+
+import asyncio
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.language import Prompt
+from src.core.concurrency import run_sync
+from src.core.llm import LLMClient, ProviderLimiter, _build_request
+
+
+class TransientError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def _completion_response(content="hello"):
+    message = SimpleNamespace(content=content, tool_calls=None)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class ScriptedClient(LLMClient):
+    """Replays a list of exceptions/responses instead of calling litellm"""
+
+    def __init__(self, outcomes, **kwargs):
+        kwargs.setdefault("model", "test/model")
+        kwargs.setdefault("backoff_base", 0.001)
+        super().__init__(**kwargs)
+        self.outcomes = list(outcomes)
+        self.requests = []
+
+    def _next(self, request):
+        self.requests.append(request)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    def _completion(self, **request):
+        return self._next(request)
+
+    async def _acompletion(self, **request):
+        return self._next(request)
+
+
+def test_generate_retries_transient_errors():
+    """Test 429 and 5xx responses are retried until one succeeds"""
+    client = ScriptedClient([TransientError(429), TransientError(503), _completion_response("ok")])
+    assert client.generate(Prompt(messages=[{"role": "user", "content": "hi"}])) == "ok"
+    assert len(client.requests) == 3
+
+
+def test_generate_does_not_retry_client_errors():
+    """Test a 400 is raised immediately"""
+    client = ScriptedClient([TransientError(400), _completion_response()])
+    with pytest.raises(TransientError):
+        client.generate(Prompt(messages=[{"role": "user", "content": "hi"}]))
+    assert len(client.requests) == 1
+
+
+def test_agenerate_gives_up_after_max_retries():
+    """Test the last error surfaces once the retry budget is spent"""
+    client = ScriptedClient([TransientError(500)] * 3, max_retries=2)
+    with pytest.raises(TransientError):
+        asyncio.run(client.agenerate(Prompt(messages=[{"role": "user", "content": "hi"}])))
+    assert len(client.requests) == 3
+
+
+def test_request_carries_client_settings():
+    """Test model, sampling and timeout come from the client, not hard-coded values"""
+    client = ScriptedClient([_completion_response(json.dumps({"tool": "x", "args": {}}))],
+                            max_tokens=77, temperature=0.2, timeout=5)
+    client.generate(Prompt(messages=[{"role": "user", "content": "hi"}]), model="test/other")
+    request = client.requests[0]
+    assert request["model"] == "test/other"
+    assert request["max_tokens"] == 77
+    assert request["temperature"] == 0.2
+    assert request["timeout"] == 5
+    assert client.settings == {"model": "test/model", "max_tokens": 77, "temperature": 0.2}
+
+
+def _prefixed_prompt():
+    return Prompt(
+        messages=[
+            {"role": "system", "content": "goals"},
+            {"role": "system", "content": "more goals"},
+            {"role": "user", "content": "task"},
+        ],
+        tools=[{"type": "function", "function": {"name": "x", "parameters": {}}}],
+        metadata={"prefix_messages": 2},
+    )
+
+
+def test_anthropic_requests_mark_the_end_of_the_prefix():
+    """Test the cache breakpoint lands on the last prefix message only, leaving the prompt intact"""
+    prompt = _prefixed_prompt()
+    request = _build_request(prompt, "anthropic/claude-3-5-sonnet-20240620")
+
+    goals, last_prefix, task = request["messages"]
+    assert goals == {"role": "system", "content": "goals"}
+    assert last_prefix == {"role": "system", "content": [
+        {"type": "text", "text": "more goals", "cache_control": {"type": "ephemeral"}}
+    ]}
+    assert task == {"role": "user", "content": "task"}
+    assert prompt.messages[1] == {"role": "system", "content": "more goals"}
+    assert request["tools"] == prompt.tools
+
+
+def test_other_providers_get_the_prompt_unmarked():
+    """Test models without explicit prompt caching get the messages as they are"""
+    prompt = _prefixed_prompt()
+    for model in ("openai/gpt-4o", "gpt-4o", "test/model"):
+        assert _build_request(prompt, model)["messages"] == prompt.messages
+
+
+def test_openai_requests_share_pooled_client():
+    """Test every OpenAI call reuses one keep-alive client"""
+    client = ScriptedClient([_completion_response(), _completion_response()],
+                            model="openai/gpt-4o", api_key="test-key")
+    prompt = Prompt(messages=[{"role": "user", "content": "hi"}])
+    client.generate(prompt)
+    client.generate(prompt)
+    assert client.requests[0]["client"] is client.requests[1]["client"]
+
+
+def test_bare_claude_models_are_anthropic():
+    """Test a bare Claude name gets Anthropic's limiter bucket and no OpenAI client"""
+    client = ScriptedClient([_completion_response()], model="claude-3-5-sonnet-20240620", api_key="test-key")
+    assert client.provider == "anthropic"
+    assert LLMClient(model="gpt-4o").provider == "openai"
+    client.generate(Prompt(messages=[{"role": "user", "content": "hi"}]))
+    assert "client" not in client.requests[0]
+
+
+def test_provider_limit_caps_in_flight_requests():
+    """Test concurrent calls to one provider never exceed max_concurrency"""
+    in_flight = []
+    peak = []
+
+    class SlowClient(ScriptedClient):
+        async def _acompletion(self, **request):
+            in_flight.append(1)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+            return _completion_response()
+
+    client = SlowClient([], model="limited/model", max_concurrency=2)
+
+    async def main():
+        prompt = Prompt(messages=[{"role": "user", "content": "hi"}])
+        await asyncio.gather(*[client.agenerate(prompt) for _ in range(6)])
+
+    asyncio.run(main())
+    assert max(peak) == 2
+
+
+def test_async_clients_close_with_their_loop():
+    """Test each loop gets one pooled client, closed when the loop shuts down"""
+    client = LLMClient(model="openai/gpt-4o", api_key="test-key")
+
+    async def two_clients():
+        return await client._async_client(), await client._async_client()
+
+    first, again = asyncio.run(two_clients())
+    assert first is again and first.is_closed()
+
+    shared = run_sync(client._async_client())
+    assert run_sync(client._async_client()) is shared and not shared.is_closed()
+
+
+def test_limiter_hands_slots_between_threads_and_loops():
+    """Test a released slot wakes the next waiter, and cancelled waiters give theirs back"""
+    limiter = ProviderLimiter(1)
+    limiter.__enter__()
+    order = []
+
+    async def waiter(name):
+        async with limiter:
+            order.append(name)
+
+    async def main():
+        cancelled = asyncio.ensure_future(waiter("cancelled"))
+        first = asyncio.ensure_future(waiter("first"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        # Released from another thread, as a sync caller would
+        threading.Thread(target=limiter.release).start()
+        await first
+        assert cancelled.cancelled()
+
+    asyncio.run(main())
+    assert order == ["first"]
+    with limiter:
+        assert limiter._available == 0
+    assert limiter._available == 1 and not limiter._waiters
@@ -28,3 +28,61 @@ def test_clear_agent_memories(memory_broker):
     
     memories = memory_broker.get_shared_memories("agent_1")
     assert len(memories) == 0
+
+
+def test_read_since_cursor_is_ordered_and_bounded():
+    """Test cursors return only newer memories across agents and rings drop the oldest"""
+    broker = MemoryBroker(capacity=3)
+    for i in range(4):
+        broker.share_memory("agent_1", {"content": f"a{i}"})
+        broker.share_memory("agent_2", {"content": f"b{i}"})
+
+    entries, cursor = broker.read(0)
+    assert [e.memory["content"] for e in entries] == ["a1", "b1", "a2", "b2", "a3", "b3"]
+    assert [e.seq for e in entries] == sorted(e.seq for e in entries) and cursor == broker.cursor == 8
+
+    seq = broker.share_memory("agent_2", {"content": "b4"})
+    entries, cursor = broker.read(cursor)
+    assert [(e.seq, e.agent_id) for e in entries] == [(seq, "agent_2")] and cursor == seq
+    assert broker.read(cursor) == ([], cursor)
+    assert [e.memory["content"] for e in broker.read(0, "agent_1", limit=2)[0]] == ["a1", "a2"]
+
+
+def test_subscriptions_receive_memories_from_many_threads():
+    """Test every memory shared concurrently is stored once and pushed to subscribers"""
+    import threading
+
+    broker = MemoryBroker(capacity=10000)
+    received, agent_2 = [], []
+    with broker.subscribe(received.append), broker.subscribe(agent_2.append, agent_id="agent_2"):
+        threads = [
+            threading.Thread(target=lambda n=n: [broker.share_memory(f"agent_{n}", {"i": i}) for i in range(500)])
+            for n in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    broker.share_memory("agent_2", {"i": "after unsubscribe"})
+
+    assert sorted(e.seq for e in received) == list(range(1, 2001))
+    assert len(agent_2) == 500 and {e.agent_id for e in agent_2} == {"agent_2"}
+    assert len(broker.get_shared_memories()) == 2001
+
+
+@pytest.mark.asyncio
+async def test_listen_yields_backlog_then_live_memories():
+    """Test an async listener catches up from a cursor and then follows new memories"""
+    import asyncio
+    import threading
+
+    broker = MemoryBroker()
+    broker.share_memory("agent_1", {"content": "before"})
+    listener = broker.listen(cursor=0)
+    assert (await listener.__anext__()).memory["content"] == "before"
+
+    threading.Thread(target=broker.share_memory, args=("agent_2", {"content": "live"})).start()
+    entry = await asyncio.wait_for(listener.__anext__(), timeout=1)
+    assert (entry.seq, entry.memory["content"]) == (2, "live")
+    await listener.aclose()
+    assert broker._subscribers == []
@@ -0,0 +1,129 @@
+"""Tests for MemoryItem records and the incremental formatted-message cache"""
+
+import json
+
+from core.language import AgentFunctionCallingActionLanguage
+from core.memory import Memory, MemoryItem
+
+
+def test_memory_item_reads_like_the_dict_it_came_from():
+    """Test the mapping view matches the original dict, extra keys included"""
+    source = {"type": "environment", "content": "result", "deadline_exceeded": True}
+    memory = Memory()
+    memory.add_memory(source)
+    item = memory.get_last_memory()
+
+    assert isinstance(item, MemoryItem)
+    assert item == source and {**item} == source
+    assert item["type"] == "environment" and item.get("missing") is None
+    assert "deadline_exceeded" in item and item.role == "assistant"
+    assert item.size == len("result") and item.timestamp > 0
+    assert json.loads(json.dumps(dict(item))) == source
+
+    item["content"] = "longer result"
+    assert item.size == len("longer result")
+    assert not hasattr(item, "__dict__")
+
+
+def test_formatted_view_only_formats_new_items():
+    """Test each item is formatted once and the cache resets when items are replaced"""
+    calls = []
+
+    def format_item(item):
+        calls.append(item["content"])
+        return {"role": item.role, "content": item["content"]}
+
+    memory = Memory()
+    for i in range(3):
+        memory.add_memory({"type": "user", "content": f"m{i}"})
+    assert [m["content"] for m in memory.formatted(format_item)] == ["m0", "m1", "m2"]
+
+    memory.add_memory({"type": "assistant", "content": "m3"})
+    assert len(memory.formatted(format_item)) == 4
+    assert calls == ["m0", "m1", "m2", "m3"]
+
+    memory.items = memory.items[:1]
+    assert memory.formatted(format_item) == [{"role": "user", "content": "m0"}]
+    assert calls[-1] == "m0"
+
+
+def test_changing_an_item_refreshes_its_formatted_message():
+    """Test an item changed in place is formatted again instead of served from the cache"""
+    def format_item(item):
+        return {"role": item.role, "content": item["content"]}
+
+    memory = Memory()
+    memory.add_memory({"type": "user", "content": "task"})
+    memory.add_memory({"type": "environment", "content": "partial"})
+    memory.formatted(format_item)
+
+    memory.items[0]["content"] = "revised task"
+    assert [m["content"] for m in memory.formatted(format_item)] == ["revised task", "partial"]
+
+
+def test_keys_set_to_none_keep_dict_semantics():
+    """Test a core key explicitly set to None is still a key, unlike one never set"""
+    item = MemoryItem.from_dict({"type": "assistant", "content": None})
+    assert item["content"] is None and "content" in item
+    assert item.get("content", "default") is None
+    assert item == {"type": "assistant", "content": None}
+    assert "tool" not in item and item.get("tool", "default") == "default"
+
+    item["tool"] = None
+    assert item["tool"] is None
+    item["content"] = "done"
+    assert item.to_dict() == {"type": "assistant", "content": "done", "tool": None}
+
+
+def test_language_formats_memory_incrementally():
+    """Test format_memory matches format_items and reuses earlier messages"""
+    language = AgentFunctionCallingActionLanguage()
+    memory = Memory()
+    memory.add_memory({"type": "user", "content": "task"})
+    memory.add_memory({"type": "assistant", "content": "call"})
+    memory.add_memory({"type": "environment", "content": ""})
+
+    first = language.format_memory(memory)
+    assert first == language.format_items(memory.get_memories())
+    assert json.loads(first[-1]["content"]) == {"type": "environment", "content": ""}
+
+    memory.add_memory({"type": "environment", "content": "result"})
+    second = language.format_memory(memory)
+    assert second[:3] == first[:3] and second[-1] == {"role": "assistant", "content": "result"}
+
+
+def test_retention_policy_prompts_reuse_cached_messages():
+    """Test prompts built through a retention policy only format new or truncated items"""
+    from memory.policy import TokenBudgetRetentionPolicy
+    from memory.tokens import TokenCounter, approximate_tokens
+
+    calls = []
+
+    class CountingLanguage(AgentFunctionCallingActionLanguage):
+        def format_item(self, item):
+            calls.append(item["content"])
+            return super().format_item(item)
+
+    policy = TokenBudgetRetentionPolicy(max_tokens=10000, counter=TokenCounter(tokenizer=approximate_tokens))
+    language = CountingLanguage(retention_policy=policy)
+    prefix = language.compile_prefix([], [])
+    memory = Memory()
+    for i in range(50):
+        memory.add_memory({"type": "user" if i == 0 else "environment", "content": f"m{i}"})
+
+    first = language.construct_prompt([], None, [], memory, prefix=prefix)
+    assert len(calls) == 50
+    memory.add_memory({"type": "environment", "content": "m50"})
+    second = language.construct_prompt([], None, [], memory, prefix=prefix)
+    assert calls[50:] == ["m50"]
+    assert second.messages[:-1] == first.messages
+    assert second.messages[1:] == language.format_items(memory.get_memories())
+
+    # Truncated copies are not memory items, so they are formatted on the spot
+    policy.max_tool_tokens = 1
+    memory.add_memory({"type": "environment", "content": "x" * 400})
+    memory.add_memory({"type": "environment", "content": "latest"})
+    calls.clear()
+    prompt = language.construct_prompt([], None, [], memory, prefix=prefix)
+    assert calls[:2] == ["x" * 400, "latest"] and len(calls) == 3
+    assert prompt.messages[-2]["content"] == calls[-1] == "\n...[truncated 400 characters]"
@@ -0,0 +1,95 @@
+"""Tests for token-budgeted memory retention"""
+
+from core.language import AgentFunctionCallingActionLanguage, Goal
+from core.memory import Memory
+from memory.policy import TokenBudgetRetentionPolicy
+from memory.tokens import TokenCounter, approximate_tokens
+
+
+def _policy(max_tokens, **kwargs):
+    return TokenBudgetRetentionPolicy(max_tokens, counter=TokenCounter(tokenizer=approximate_tokens), **kwargs)
+
+
+def _memories(turns, result_size=40):
+    memories = [{"type": "user", "content": "the task"}]
+    for i in range(turns):
+        memories.append({"type": "assistant", "content": f"call {i}"})
+        memories.append({"type": "environment", "content": f"result {i} " + "x" * result_size})
+    return memories
+
+
+def test_everything_is_kept_within_budget():
+    """Test a small history passes through unchanged"""
+    memories = _memories(2)
+    assert _policy(1000).apply(memories) == memories
+
+
+def test_task_and_recent_turns_are_kept():
+    """Test the task is always sent and older turns are dropped first"""
+    memories = _memories(20)
+    kept = _policy(100).apply(memories)
+    assert kept[0]["content"] == "the task"
+    assert kept[-1] == memories[-1]
+    assert len(kept) < len(memories)
+    assert sum(approximate_tokens(m["content"]) + 4 for m in kept) <= 100
+
+
+def test_oversized_tool_output_is_truncated():
+    """Test one huge result is cut down instead of blowing the budget"""
+    memories = _memories(1, result_size=100000)
+    kept = _policy(500).apply(memories)
+    assert len(kept) == 3
+    assert "[truncated" in kept[-1]["content"]
+    assert approximate_tokens(kept[-1]["content"]) < 500
+    assert len(memories[-1]["content"]) > 100000
+
+
+def test_older_tool_output_is_capped():
+    """Test max_tool_tokens caps every result except the latest"""
+    memories = _memories(3, result_size=2000)
+    kept = _policy(100000, max_tool_tokens=50).apply(memories)
+    assert "[truncated" in kept[2]["content"]
+    assert "[truncated" in kept[4]["content"]
+    assert kept[6] == memories[6]
+
+
+def test_counter_tokenizes_each_text_once():
+    """Test counts are remembered between iterations"""
+    seen = []
+    counter = TokenCounter(tokenizer=lambda text: seen.append(text) or len(text))
+    for _ in range(3):
+        counter.count("same text")
+    assert seen == ["same text"]
+
+
+def test_prompt_size_stays_bounded():
+    """Test construct_prompt respects the budget however long the run gets"""
+    policy = _policy(300)
+    language = AgentFunctionCallingActionLanguage(retention_policy=policy)
+    goals = [Goal(priority=1, name="Test", description="Test goal")]
+    memory = Memory()
+    for item in _memories(200, result_size=400):
+        memory.add_memory(item)
+
+    prompt = language.construct_prompt(actions=[], environment=None, goals=goals, memory=memory)
+    total = sum(approximate_tokens(m["content"]) + 4 for m in prompt.messages)
+    assert total <= 300
+    assert prompt.messages[1]["content"] == "the task"
+    assert len(memory.items) == 401
+
+
+def test_latest_task_is_kept_when_memory_spans_runs():
+    """Test a reused Memory pins the current task, in order, not the first run's"""
+    memories = _memories(20) + [{"type": "user", "content": "the new task"}]
+    memories += [{"type": "assistant", "content": "call again"}]
+    kept = _policy(100).apply(memories)
+    assert [m["content"] for m in kept[-2:]] == ["the new task", "call again"]
+    assert all(m["content"] != "the task" for m in kept)
+
+
+def test_no_item_cap_by_default():
+    """Test only the token budget limits how many memories are sent"""
+    memories = [{"type": "user", "content": "the task"}]
+    memories += [{"type": "assistant", "content": "ok"} for _ in range(300)]
+    assert len(_policy(100000).apply(memories)) == 301
+    assert len(_policy(100000, max_items=10).apply(memories)) == 11
@@ -0,0 +1,76 @@
+"""Tests for the fast/strong model cascade"""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from src.core.cascade import ModelCascade
+from src.core.language import Prompt
+from src.testing.fake_llm import tool_call
+
+TOOLS = [{"type": "function", "function": {"name": name, "parameters": {}}}
+         for name in ("read_txt_file", "terminate")]
+
+
+class StubClient:
+    def __init__(self, model, response):
+        self.model = model
+        self.response = response
+        self.prompts = []
+
+    def generate(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return self.response
+
+    async def agenerate(self, prompt, **kwargs):
+        return self.generate(prompt, **kwargs)
+
+
+def _cascade(fast_response, **kwargs):
+    fast = StubClient("fast", fast_response)
+    strong = StubClient("strong", tool_call("terminate", message="strong answer"))
+    return ModelCascade(fast, strong, **kwargs), fast, strong
+
+
+def test_tool_pick_stays_on_fast_tier():
+    """Test a valid, non-final tool call is served by the fast model"""
+    cascade, fast, strong = _cascade(tool_call("read_txt_file", file_name="a.txt"))
+    response = cascade.generate(Prompt(messages=[], tools=TOOLS))
+    assert json.loads(response)["tool"] == "read_txt_file"
+    assert strong.prompts == []
+    assert cascade.stats()["fast"]["calls"] == 1
+
+
+def test_escalates_on_parse_failure_unknown_tool_and_final_turn():
+    """Test each escalation trigger re-asks the strong model"""
+    for fast_response, reason in [
+        ("not json", "parse_failure"),
+        (tool_call("delete_everything"), "unknown_tool"),
+        (tool_call("terminate", message="weak answer"), "final_turn"),
+    ]:
+        cascade, _, strong = _cascade(fast_response)
+        response = cascade.generate(Prompt(messages=[], tools=TOOLS))
+        assert json.loads(response)["args"]["message"] == "strong answer"
+        assert len(strong.prompts) == 1
+        assert cascade.stats()["escalations"] == {reason: 1}
+
+
+def test_escalate_tools_are_configurable():
+    """Test a synthesis tool can be marked as needing the strong model"""
+    cascade, _, strong = _cascade(tool_call("read_txt_file"), escalate_tools=["read_txt_file"])
+    asyncio.run(cascade.agenerate(Prompt(messages=[], tools=TOOLS)))
+    assert len(strong.prompts) == 1
+    stats = cascade.stats()
+    assert stats["fast"]["calls"] == 1 and stats["strong"]["calls"] == 1
+    assert stats["strong"]["p50_ms"] is not None
+
+
+def test_counters_add_up_across_threads():
+    """Test concurrent turns are all counted"""
+    cascade, _, _ = _cascade(tool_call("terminate", message="weak answer"))
+    prompt = Prompt(messages=[], tools=TOOLS)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: cascade.generate(prompt), range(400)))
+    stats = cascade.stats()
+    assert stats["fast"]["calls"] == stats["strong"]["calls"] == 400
+    assert stats["escalations"] == {"final_turn": 400}
@@ -0,0 +1,68 @@
+"""Tests for multi-call decisions and parallel tool execution"""
+
+import json
+import threading
+
+from core.action import Action, ActionRegistry
+from core.agent import Agent
+from core.environment import Environment
+from core.language import AgentFunctionCallingActionLanguage, Goal
+
+
+def _overlapping_actions():
+    """Tools where first only returns once second has finished, so they must overlap"""
+    second_done = threading.Event()
+
+    def first(value: str) -> str:
+        if not second_done.wait(timeout=5):
+            return "first ran alone"
+        return f"first:{value}"
+
+    def second(value: str) -> str:
+        second_done.set()
+        return f"second:{value}"
+
+    return [Action(name=tool.__name__, function=tool, description="", parameters={})
+            for tool in (first, second)]
+
+
+def test_parse_invocations_multi_call():
+    """Test multi-call responses expand into one invocation per call"""
+    language = AgentFunctionCallingActionLanguage()
+    response = json.dumps({"tool_calls": [
+        {"tool": "a", "args": {}},
+        {"tool": "b", "args": {"x": 1}},
+    ]})
+
+    invocations = language.parse_invocations(response)
+    assert [i["tool"] for i in invocations] == ["a", "b"]
+    assert language.parse_invocations('{"tool": "a", "args": {}}') == [{"tool": "a", "args": {}}]
+
+
+def test_agent_runs_calls_in_parallel_and_keeps_order():
+    """Test independent calls overlap and results are written in call order"""
+    registry = ActionRegistry()
+    for action in _overlapping_actions():
+        registry.register(action)
+    registry.register(Action(name="terminate", function=lambda message: message,
+                             description="", parameters={}, terminal=True))
+    replies = iter([
+        json.dumps({"tool_calls": [
+            {"tool": "first", "args": {"value": "1"}},
+            {"tool": "second", "args": {"value": "2"}},
+        ]}),
+        json.dumps({"tool": "terminate", "args": {"message": "done"}}),
+    ])
+    agent = Agent(
+        goals=[Goal(priority=1, name="Test", description="Test goal")],
+        agent_language=AgentFunctionCallingActionLanguage(),
+        action_registry=registry,
+        generate_response=lambda prompt: next(replies),
+        environment=Environment(max_workers=2),
+    )
+
+    memory = agent.run("task")
+
+    # second finishes before first, yet the results stay in call order
+    results = [json.loads(m["content"]).get("result") for m in memory.items[2:4]]
+    assert results == ["first:1", "second:2"]
@@ -0,0 +1,102 @@
+"""Tests for per-tool execution modes and the shared worker-process pool"""
+
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from src.core.action import ActionContext
+from src.core.deadline import Deadline
+from src.core.environment import Environment
+from src.tools.process import get_process_pool, shutdown_process_pool
+from src.tools.registry import PythonActionRegistry, register_tool
+
+
+@register_tool(tool_name="process_test_sum", tags=["process_test"], execution="process")
+def sum_squares(n: int) -> dict:
+    return {"pid": os.getpid(), "total": sum(i * i for i in range(n))}
+
+
+@register_tool(tool_name="process_test_crash", tags=["process_test"], execution="process")
+def crash() -> str:
+    os._exit(1)
+
+
+@register_tool(tool_name="process_test_sleep", tags=["process_test"], execution="process")
+def sleep(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+@register_tool(tool_name="process_test_inline", tags=["process_test"], execution="inline")
+def current_thread() -> int:
+    return threading.get_ident()
+
+
+@pytest.fixture(scope="module")
+def actions():
+    yield PythonActionRegistry(tags=["process_test"])
+    shutdown_process_pool()
+
+
+def test_process_tool_runs_in_a_worker_process(actions):
+    """Test a process tool runs in another process and its result is unpickled here"""
+    environment = Environment()
+    action = actions.get_action("process_test_sum")
+    assert action.execution == "process"
+
+    async def run():
+        return await asyncio.gather(*[environment.aexecute_action(action, {"n": n}) for n in (10, 1000)])
+
+    results = asyncio.run(run())
+    assert [r["result"]["total"] for r in results] == [285, 332833500]
+    assert all(r["result"]["pid"] != os.getpid() for r in results)
+
+
+def test_worker_crash_is_isolated(actions):
+    """Test a crashing worker becomes a tool error and the pool recovers"""
+    environment = Environment()
+    result = environment.execute_action(actions.get_action("process_test_crash"), {})
+    assert result["tool_executed"] is False
+    assert "worker process crashed" in result["error"]
+
+    result = environment.execute_action(actions.get_action("process_test_sum"), {"n": 3})
+    assert result["tool_executed"] and result["result"]["total"] == 5
+
+
+def test_overrunning_process_tool_retires_the_pool(actions):
+    """Test a process tool past its deadline frees its thread and later calls get fresh workers"""
+    environment = Environment()
+    pool = get_process_pool()
+    context = ActionContext({"deadline": Deadline.after(0.5)})
+
+    started = time.monotonic()
+    result = environment.execute_action(actions.get_action("process_test_sleep"), {"seconds": 3}, context)
+    assert result.get("deadline_exceeded") and time.monotonic() - started < 2
+
+    assert get_process_pool() is not pool
+    result = environment.execute_action(actions.get_action("process_test_sum"), {"n": 3})
+    assert result["tool_executed"] and result["result"]["total"] == 5
+
+
+def test_inline_tool_runs_on_the_event_loop(actions):
+    """Test inline tools skip the thread pool"""
+    async def run():
+        result = await Environment().aexecute_action(actions.get_action("process_test_inline"), {})
+        return result["result"], threading.get_ident()
+
+    tool_thread, loop_thread = asyncio.run(run())
+    assert tool_thread == loop_thread
+
+
+def test_process_tools_reject_unpicklable_shapes():
+    """Test process mode refuses closures and action_context tools at registration"""
+    with pytest.raises(ValueError):
+        @register_tool(tool_name="process_test_local", execution="process")
+        def local(value: str) -> str:
+            return value
+
+    with pytest.raises(ValueError):
+        register_tool(execution="gpu")
@@ -0,0 +1,82 @@
+"""Tests for indexed tool lookup and frozen registry snapshots"""
+
+import pytest
+
+from src.tools.registry import PythonActionRegistry, register_tool, unregister_tool
+
+
+def test_tag_lookup_selects_only_tagged_tools():
+    """Test tag and name filters combine and keep registration order"""
+    @register_tool(tool_name="snapshot_test_first", tags=["snapshot_test"])
+    def first(value: str) -> str:
+        return value
+
+    @register_tool(tool_name="snapshot_test_second", tags=["snapshot_test", "snapshot_other"])
+    def second(value: str, limit: int = 1) -> str:
+        return value
+
+    registry = PythonActionRegistry(tags=["snapshot_test"])
+    assert registry.get_action_names() == ["snapshot_test_first", "snapshot_test_second"]
+    assert registry.terminate_tool is not None
+
+    registry = PythonActionRegistry(tags=["snapshot_test"], tool_names=["snapshot_test_second"])
+    assert registry.get_action_names() == ["snapshot_test_second"]
+    assert registry.get_action("snapshot_test_second").parameters["required"] == ["value"]
+
+
+def test_snapshot_is_shared_and_frozen():
+    """Test snapshots are reused until a tool is registered and reject changes"""
+    @register_tool(tool_name="snapshot_test_shared", tags=["snapshot_shared"])
+    def shared() -> str:
+        return "ok"
+
+    snapshot = PythonActionRegistry.snapshot(tags=["snapshot_shared"])
+    assert PythonActionRegistry.snapshot(tags=["snapshot_shared"]) is snapshot
+    assert snapshot.get_action_names() == ["snapshot_test_shared", "terminate"]
+    assert snapshot.get_action("snapshot_test_shared").execute() == "ok"
+
+    with pytest.raises(RuntimeError):
+        snapshot.register(snapshot.get_action("terminate"))
+    with pytest.raises(TypeError):
+        snapshot.actions["other"] = None
+
+    @register_tool(tool_name="snapshot_test_added", tags=["snapshot_shared"])
+    def added() -> str:
+        return "new"
+
+    refreshed = PythonActionRegistry.snapshot(tags=["snapshot_shared"])
+    assert refreshed is not snapshot
+    assert "snapshot_test_added" in refreshed.get_action_names()
+    assert "snapshot_test_added" not in snapshot.get_action_names()
+
+
+def test_snapshot_actions_do_not_share_state_with_the_catalog():
+    """Test changing a snapshot's action leaves the catalog and other registries as they were"""
+    @register_tool(tool_name="snapshot_test_isolated", tags=["snapshot_isolated"])
+    def isolated(value: str) -> str:
+        return value
+
+    snapshot = PythonActionRegistry.snapshot(tags=["snapshot_isolated"])
+    action = snapshot.get_action("snapshot_test_isolated")
+    action.parameters["properties"]["value"]["type"] = "integer"
+    action.description = "changed"
+
+    fresh = PythonActionRegistry(tags=["snapshot_isolated"]).get_action("snapshot_test_isolated")
+    assert fresh.parameters["properties"]["value"]["type"] == "string"
+    assert fresh.description != "changed"
+
+
+def test_unregistered_tool_leaves_new_registries():
+    """Test an unregistered tool drops out of lookups and refreshes snapshots"""
+    @register_tool(tool_name="snapshot_test_removed", tags=["snapshot_removed"])
+    def removed() -> str:
+        return "gone"
+
+    snapshot = PythonActionRegistry.snapshot(tags=["snapshot_removed"])
+    unregister_tool("snapshot_test_removed")
+
+    assert PythonActionRegistry(tags=["snapshot_removed"]).get_action_names() == []
+    assert PythonActionRegistry.snapshot(tags=["snapshot_removed"]).get_action_names() == ["terminate"]
+    assert snapshot.get_action("snapshot_test_removed").execute() == "gone"
+    with pytest.raises(KeyError):
+        unregister_tool("snapshot_test_removed")
@@ -0,0 +1,120 @@
+"""Tests for the LLM response cache"""
+
+import asyncio
+
+from core.language import Prompt
+from core.response_cache import ResponseCache
+
+
+def _prompt(text="What is the population of Richmond?"):
+    return Prompt(messages=[{"role": "user", "content": text}], tools=[])
+
+
+def test_repeated_prompt_is_served_from_cache():
+    """Test identical prompts only reach the model once"""
+    calls = []
+    cache = ResponseCache()
+    generate = cache.wrap(lambda prompt: calls.append(prompt) or "answer", model="openai/gpt-4o")
+
+    assert generate(_prompt()) == "answer"
+    assert generate(_prompt()) == "answer"
+    assert generate(_prompt("different")) == "answer"
+    assert len(calls) == 2
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_model_is_part_of_the_key():
+    """Test the same prompt for another model is a miss"""
+    cache = ResponseCache()
+    cache.set(cache.key(_prompt(), model="a"), "from a")
+    assert cache.get(cache.key(_prompt(), model="b")) is None
+
+
+def test_expired_entries_are_dropped():
+    """Test TTL expiry"""
+    cache = ResponseCache(ttl=-1)
+    cache.set("k", "v")
+    assert cache.get("k") is None
+
+
+def test_sqlite_tier_survives_restart(tmp_path):
+    """Test responses persist across cache instances"""
+    path = str(tmp_path / "llm.sqlite")
+    ResponseCache(path).set("k", "persisted")
+
+    cache = ResponseCache(path)
+    assert cache.get("k") == "persisted"
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_async_wrapper():
+    """Test the async path shares the cache"""
+    cache = ResponseCache()
+    calls = []
+
+    async def agenerate(prompt):
+        calls.append(prompt)
+        return "answer"
+
+    generate = cache.wrap_async(agenerate)
+
+    async def main():
+        return [await generate(_prompt()) for _ in range(3)]
+
+    assert asyncio.run(main()) == ["answer"] * 3
+    assert len(calls) == 1
+
+
+def test_turns_after_a_delegation_hit_the_cache(monkeypatch):
+    """Test a prompt holding a nested call_agent result hashes the same on every run"""
+    import itertools
+    import json
+
+    import src.core.environment
+    from src.core.action import Action, ActionRegistry
+    from src.core.agent import Agent
+    from src.core.agent_registry import AgentRegistry
+    from src.core.environment import Environment
+    from src.core.language import AgentFunctionCallingActionLanguage, Goal
+    from src.core.response_cache import ResponseCache as SharedCache
+    from src.tools.agent_tools import call_agent
+
+    ticks = itertools.count()
+    monkeypatch.setattr(src.core.environment.time, "strftime", lambda fmt: f"T{next(ticks)}")
+    replies = {
+        "task": json.dumps({"tool": "delegate", "args": {}}),
+        "sub task": json.dumps({"tool": "terminate", "args": {"message": "sub done"}}),
+    }
+    calls = []
+
+    def generate(prompt):
+        calls.append(prompt)
+        last = prompt.messages[-1]["content"]
+        if "sub done" in last:
+            return json.dumps({"tool": "terminate", "args": {"message": "done"}})
+        return replies[last]
+
+    cache = SharedCache()
+    cached_generate = cache.wrap(generate)
+
+    def agent(name, extra_actions=()):
+        registry = ActionRegistry()
+        for action in extra_actions:
+            registry.register(action)
+        registry.register(Action(name="terminate", function=lambda message: message,
+                                 description="", parameters={}, terminal=True))
+        return Agent(goals=[Goal(priority=1, name=name, description="Test goal")],
+                     agent_language=AgentFunctionCallingActionLanguage(),
+                     action_registry=registry, generate_response=cached_generate,
+                     environment=Environment(), name=name)
+
+    delegate = Action(name="delegate", description="", parameters={}, accepts_action_context=True,
+                      function=lambda action_context: call_agent(action_context, "Child", "sub task"))
+    agents = AgentRegistry()
+    agents.register_agent("Child", agent("Child").run)
+    parent = agent("Parent", [delegate])
+
+    parent.run("task", action_context_props={"agent_registry": agents})
+    assert len(calls) == 3
+    parent.run("task", action_context_props={"agent_registry": agents})
+    assert len(calls) == 3 and cache.stats()["hits"] == 3
@@ -0,0 +1,95 @@
+"""Tests for coalescing identical in-flight LLM requests"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from core.language import Prompt
+from core.singleflight import SingleFlight
+
+
+def _prompt(text="same question"):
+    return Prompt(messages=[{"role": "user", "content": text}])
+
+
+def test_concurrent_threads_share_one_call():
+    """Test identical prompts from many threads hit the model once"""
+    group = SingleFlight()
+    calls = []
+
+    def generate(prompt):
+        calls.append(prompt)
+        time.sleep(0.05)
+        return "answer"
+
+    wrapped = group.wrap(generate, model="m")
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(wrapped(_prompt()))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["answer"] * 8
+    assert len(calls) == 1
+    assert group.stats() == {"calls": 1, "coalesced": 7, "in_flight": 0}
+
+
+def test_concurrent_tasks_share_one_call():
+    """Test asyncio callers coalesce, while different prompts do not"""
+    group = SingleFlight()
+    calls = []
+
+    async def agenerate(prompt):
+        calls.append(prompt.messages[0]["content"])
+        await asyncio.sleep(0.02)
+        return prompt.messages[0]["content"].upper()
+
+    wrapped = group.wrap_async(agenerate)
+
+    async def main():
+        return await asyncio.gather(*[wrapped(_prompt(text)) for text in ["a", "a", "a", "b"]])
+
+    assert asyncio.run(main()) == ["A", "A", "A", "B"]
+    assert sorted(calls) == ["a", "b"]
+
+
+def test_waiters_on_other_loops_receive_result():
+    """Test a waiter on a different thread's event loop gets the leader's result"""
+    group = SingleFlight()
+    started = threading.Event()
+
+    async def agenerate(prompt):
+        started.set()
+        await asyncio.sleep(0.05)
+        return "shared"
+
+    wrapped = group.wrap_async(agenerate)
+    results = []
+    leader = threading.Thread(target=lambda: results.append(asyncio.run(wrapped(_prompt()))))
+    leader.start()
+    started.wait()
+    results.append(asyncio.run(wrapped(_prompt())))
+    leader.join()
+
+    assert results == ["shared", "shared"]
+    assert group.stats()["calls"] == 1
+
+
+def test_errors_propagate_and_are_not_remembered():
+    """Test a failed call reaches every waiter and the next call retries"""
+    group = SingleFlight()
+    outcomes = [RuntimeError("rate limited"), "ok"]
+
+    def generate(prompt):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    wrapped = group.wrap(generate)
+    with pytest.raises(RuntimeError):
+        wrapped(_prompt())
+    assert wrapped(_prompt()) == "ok"
@@ -0,0 +1,135 @@
+"""Tests for speculative tool execution"""
+
+import json
+import time
+
+import pytest
+
+from core.action import Action, ActionRegistry
+from core.agent import Agent
+from core.environment import Environment
+from core.language import AgentFunctionCallingActionLanguage, Goal
+from src.testing.fake_llm import FakeLLM, tool_call
+from src.tools.registry import register_tool
+
+
+def _agent(script, calls, speculate=None, parameters=None, extra_actions=()):
+    def list_files(pattern: str = "*.txt") -> list:
+        calls.append(pattern)
+        time.sleep(0.2)
+        return ["a" + pattern[1:]]
+
+    registry = ActionRegistry()
+    registry.register(Action(name="list_files", function=list_files, description="",
+                             parameters=parameters or {},
+                             idempotent=True, speculate=[{}] if speculate is None else speculate))
+    for action in extra_actions:
+        registry.register(action)
+    registry.register(Action(name="terminate", function=lambda message: message,
+                             description="", parameters={}, terminal=True))
+    llm = FakeLLM(script, latency=0.2)
+    return Agent(
+        goals=[Goal(priority=1, name="Test", description="Test goal")],
+        agent_language=AgentFunctionCallingActionLanguage(),
+        action_registry=registry,
+        generate_response=llm,
+        agenerate_response=llm.agenerate,
+        environment=Environment(),
+        speculate=True,
+    )
+
+
+def test_speculated_result_overlaps_llm_call():
+    """Test a predicted call runs during the LLM call and its result is reused"""
+    calls = []
+    agent = _agent([tool_call("list_files"), tool_call("terminate", message="done")], calls)
+
+    start = time.perf_counter()
+    memory = agent.run("list the files")
+    elapsed = time.perf_counter() - start
+
+    assert len(calls) == 1
+    # Two 0.2s LLM calls plus a 0.2s tool that overlapped the first one
+    assert elapsed < 0.55
+    result = json.loads(memory.items[2]["content"])
+    assert result["result"] == ["a.txt"]
+
+
+def test_unused_speculation_is_discarded():
+    """Test a prediction the model does not pick never reaches memory"""
+    calls = []
+    agent = _agent([tool_call("terminate", message="done")], calls)
+    memory = agent.run("just stop")
+    assert [item["type"] for item in memory.items] == ["user", "assistant", "environment"]
+    assert "a.txt" not in memory.items[-1]["content"]
+
+
+def test_different_args_are_executed_normally():
+    """Test a call whose args differ from the prediction runs on its own"""
+    calls = []
+    agent = _agent([tool_call("list_files"), tool_call("terminate", message="done")], calls,
+                   speculate=[{"pattern": "*.md"}])
+    memory = agent.run("list the files")
+    assert sorted(calls) == ["*.md", "*.txt"]
+    assert json.loads(memory.items[2]["content"])["result"] == ["a.txt"]
+
+
+def test_only_idempotent_tools_can_be_speculated():
+    """Test register_tool rejects speculation of non-idempotent tools"""
+    with pytest.raises(ValueError):
+        register_tool(tool_name="unsafe_speculation", speculate=[{}])
+
+
+def test_explicit_default_args_match_the_speculated_call():
+    """Test a call spelling out the schema defaults reuses the speculated result"""
+    from core.speculation import invocation_key
+
+    calls = []
+    parameters = {
+        "type": "object", "properties": {"pattern": {"type": "string", "default": "*.txt"}}, "required": []
+    }
+    agent = _agent([tool_call("list_files", pattern="*.txt"), tool_call("terminate", message="done")], calls,
+                   parameters=parameters)
+    agent.run("list the files")
+    assert calls == ["*.txt"]
+
+    action = agent.actions.get_action("list_files")
+    assert invocation_key(action, {}) == invocation_key(action, {"pattern": "*.txt"})
+    assert invocation_key(action, {}) != invocation_key(action, {"pattern": "*.md"})
+
+
+def test_speculation_is_dropped_after_a_side_effect():
+    """Test a prediction made before a non-idempotent call is not reused after it"""
+    calls = []
+    touch = Action(name="touch", function=lambda: calls.append("touch") or "ok", description="",
+                   parameters={})
+    agent = _agent([tool_call("touch"), tool_call("list_files"), tool_call("terminate", message="done")],
+                   calls, extra_actions=[touch])
+    memory = agent.run("write, then list the files")
+    # Reusing the listing speculated at the start would leave touch as the last call
+    assert calls[-2:] == ["touch", "*.txt"]
+    assert json.loads(memory.items[4]["content"])["result"] == ["a.txt"]
+
+
+def test_configured_agents_reuse_speculated_results():
+    """Test the file agent speculates list_txt_files and the model's pick reuses it"""
+    from src.agents.file_management.agent import create_file_management_agent
+    from src.core.tracing import InMemoryCollector, Tracer, get_tracer, set_tracer
+
+    agent = create_file_management_agent()
+    assert agent.speculate
+    llm = FakeLLM([tool_call("list_txt_files"), tool_call("terminate", message="done")])
+    agent.generate_response, agent.agenerate_response = llm, llm.agenerate
+
+    collector = InMemoryCollector()
+    previous = get_tracer()
+    set_tracer(Tracer([collector]))
+    try:
+        memory = agent.run("list the files")
+    finally:
+        set_tracer(previous)
+
+    stats = collector.get_spans("agent.run")[0].attributes["speculation"]
+    assert stats["hits"] == 1
+    assert json.loads(memory.items[2]["content"])["tool_executed"]
+    assert "list_txt_files" not in [span.attributes["tool"] for span in collector.get_spans("tool.execute")]
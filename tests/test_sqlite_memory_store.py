@@ -0,0 +1,107 @@
+"""Tests for the SQLite/FTS5 memory store"""
+
+import time
+
+from memory.stores.sqlite import SQLiteMemoryStore
+
+
+def test_store_retrieve_and_persist_across_restarts(tmp_path):
+    """Test values round-trip as JSON and survive reopening the file"""
+    path = str(tmp_path / "memories.db")
+    with SQLiteMemoryStore(path, agent="worker", session="s1") as store:
+        store.store("task", {"type": "user", "content": "Summarize the quarterly report"})
+        store.store("note", "remember the budget")
+        assert store.retrieve("note") == "remember the budget"
+
+    reopened = SQLiteMemoryStore(path, agent="worker", session="s1")
+    assert reopened.retrieve("task") == {"type": "user", "content": "Summarize the quarterly report"}
+    assert reopened.search("quarterly") == [{"task": {"type": "user", "content": "Summarize the quarterly report"}}]
+    reopened.close()
+
+
+def test_search_is_ranked_and_namespaced():
+    """Test results are ordered by relevance and scoped to agent and session"""
+    store = SQLiteMemoryStore(agent="worker", session="s1", batch_size=2)
+    store.store("weak", "The weather in Richmond was mild.")
+    store.store("strong", "Richmond, Richmond: the capital of Virginia is Richmond.")
+    store.store("other", "Nothing relevant here.")
+    other_session = store.scoped(session="s2")
+    other_session.store("strong", "Richmond is elsewhere in this session")
+
+    assert [list(r) for r in store.search("richmond")] == [["strong"], ["weak"]]
+    assert store.search("capital Virginia") == [{"strong": "Richmond, Richmond: the capital of Virginia is Richmond."}]
+    assert store.search('"unbalanced (query*') == []
+    assert store.search("...") == []
+    assert other_session.count() == 1 and store.count() == 3
+
+
+def test_overwrite_and_delete_update_the_index():
+    """Test replaced and deleted entries stop matching old text"""
+    store = SQLiteMemoryStore()
+    store.store("k", "alpha")
+    store.store("k", "beta")
+    assert store.search("alpha") == [] and store.search("beta") == [{"k": "beta"}]
+    store.delete("k")
+    assert store.retrieve("k") is None and store.search("beta") == []
+
+
+def test_search_scales_with_the_index():
+    """Test a match among many entries is found without scanning them"""
+    store = SQLiteMemoryStore(batch_size=1000)
+    for i in range(20000):
+        store.store(f"m{i}", f"routine log line number {i}")
+    store.store("needle", "the zebra escaped")
+    store.flush()
+
+    start = time.perf_counter()
+    assert store.search("zebra") == [{"needle": "the zebra escaped"}]
+    assert time.perf_counter() - start < 0.5
+
+
+def test_buffered_writes_survive_a_normal_exit_without_close(tmp_path):
+    """Test rows still in the write buffer are committed when the process exits"""
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    path = str(tmp_path / "memories.db")
+    script = (
+        "import sys; sys.path.insert(0, 'src')\n"
+        "from memory.stores.sqlite import SQLiteMemoryStore\n"
+        f"store = SQLiteMemoryStore({path!r})\n"
+        "for i in range(10):\n"
+        "    store.store(f'k{i}', f'value {i}')\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True, cwd=Path(__file__).parent.parent)
+
+    with SQLiteMemoryStore(path) as store:
+        assert store.count() == 10
+
+
+def test_buffered_writes_are_committed_after_the_flush_interval(tmp_path):
+    """Test a small batch reaches the file on its own once flush_interval passes"""
+    import sqlite3
+
+    path = str(tmp_path / "memories.db")
+    store = SQLiteMemoryStore(path, flush_interval=0.05)
+    store.store("k", "value")
+
+    reader = sqlite3.connect(path)
+    try:
+        deadline = time.monotonic() + 5
+        while reader.execute("SELECT COUNT(*) FROM memories").fetchone()[0] == 0:
+            assert time.monotonic() < deadline, "buffered row was never flushed"
+            time.sleep(0.02)
+    finally:
+        reader.close()
+        store.close()
+
+
+def test_memory_items_are_stored_as_objects():
+    """Test a MemoryItem is indexed by its content and retrieved as its fields"""
+    from core.memory import MemoryItem
+
+    store = SQLiteMemoryStore()
+    store.store("m", MemoryItem("environment", "fetched the census table", tool="fetch"))
+    assert store.retrieve("m") == {"type": "environment", "content": "fetched the census table", "tool": "fetch"}
+    assert list(store.search("census")[0]) == ["m"]
@@ -0,0 +1,60 @@
+"""Tests for import-time cost and manifest-based tool discovery"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Creating every agent must stay well under the cost of importing litellm
+IMPORT_BUDGET_S = 1.0
+HEAVY_MODULES = ["litellm", "openai", "httpx", "requests", "bs4", "tiktoken"]
+
+STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from src.agents.orchestrator.agent import create_orchestrator_agent
+from src.agents.file_management.agent import create_file_management_agent
+from src.agents.retrieval_worker.agent import create_retrieval_worker_agent
+agents = [create_orchestrator_agent(), create_file_management_agent(), create_retrieval_worker_agent()]
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "elapsed": elapsed,
+    "heavy": [m for m in %r if m in sys.modules],
+    "tool_modules": sorted(m for m in sys.modules if m.startswith("src.agents.") and m.endswith(("actions", "action"))),
+    "tools": {a.name: a.actions.get_action_names() for a in agents},
+}))
+""" % HEAVY_MODULES
+
+
+def _run(*args):
+    return subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True, timeout=120)
+
+
+def test_agent_startup_stays_within_import_budget():
+    """Test building the agents imports no LLM/HTTP stack and no tool modules"""
+    completed = _run("-c", STARTUP_SCRIPT)
+    assert completed.returncode == 0, completed.stderr
+    report = json.loads(completed.stdout.strip().splitlines()[-1])
+    assert report["heavy"] == []
+    assert report["tool_modules"] == []
+    assert report["elapsed"] < IMPORT_BUDGET_S
+    assert "read_txt_file" in report["tools"]["FileManagementAgent"]
+    assert "fetch_from_web" in report["tools"]["RetrievalWorker"]
+
+
+def test_manifest_is_up_to_date():
+    """Test manifest.json matches the registered tools (regenerate with python -m src.tools.manifest)"""
+    completed = _run("-m", "src.tools.manifest", "--check")
+    assert completed.returncode == 0, completed.stdout + completed.stderr
+
+
+def test_lazy_tool_imports_module_on_first_call():
+    """Test a manifest tool resolves to the registered function when executed"""
+    from src.tools.manifest import lazy_function, load_manifest
+
+    entry = load_manifest()["list_txt_files"]
+    function = lazy_function(entry)
+    assert function(action_context=None) == sorted(p.name for p in (ROOT / "data").glob("*.txt"))
+    assert function.load().cache.stats()["entries"] >= 1
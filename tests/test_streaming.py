@@ -0,0 +1,68 @@
+"""Tests for streaming responses with early tool dispatch"""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+from core.action import Action, ActionRegistry
+from core.agent import Agent
+from core.environment import Environment
+from core.language import AgentFunctionCallingActionLanguage, Goal
+from src.core.llm import ToolCallAssembler
+
+
+def _delta(index, name=None, arguments=None):
+    return SimpleNamespace(index=index, function=SimpleNamespace(name=name, arguments=arguments))
+
+
+def test_assembler_reports_call_once_arguments_complete():
+    """Test a call is dispatched as soon as its arguments form valid JSON"""
+    seen = []
+    assembler = ToolCallAssembler(lambda index, call: seen.append((index, call)))
+
+    assembler.feed([_delta(0, name="read_txt_file", arguments='{"filename": ')])
+    assert seen == []
+    assembler.feed([_delta(0, arguments='"a.txt"}')])
+    assert seen == [(0, {"tool": "read_txt_file", "args": {"filename": "a.txt"}})]
+
+    assembler.feed([_delta(1, name="list_txt_files")])
+    calls = assembler.finish()
+    assert [c["tool"] for c in calls] == ["read_txt_file", "list_txt_files"]
+    assert seen[-1] == (1, {"tool": "list_txt_files", "args": {}})
+
+
+def test_agent_dispatches_tool_before_stream_ends():
+    """Test the tool runs while the rest of the stream is still arriving"""
+    events = []
+
+    def tool(message: str) -> str:
+        events.append(("tool", time.perf_counter()))
+        return message
+
+    registry = ActionRegistry()
+    registry.register(Action(name="terminate", function=tool, description="", parameters={}, terminal=True))
+    invocation = {"tool": "terminate", "args": {"message": "done"}}
+
+    async def stream(prompt, on_text=None, on_tool_call=None):
+        on_text("thinking")
+        on_tool_call(0, invocation)
+        await asyncio.sleep(0.1)
+        events.append(("stream_end", time.perf_counter()))
+        return json.dumps(invocation)
+
+    texts = []
+    agent = Agent(
+        goals=[Goal(priority=1, name="Test", description="Test goal")],
+        agent_language=AgentFunctionCallingActionLanguage(),
+        action_registry=registry,
+        generate_response=None,
+        environment=Environment(),
+        stream_response=stream,
+        on_text=texts.append,
+    )
+    memory = agent.run("task")
+
+    assert texts == ["thinking"]
+    assert [name for name, _ in events] == ["tool", "stream_end"]
+    assert len(memory.items) == 3
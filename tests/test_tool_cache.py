@@ -0,0 +1,96 @@
+"""Tests for declarative tool result caching"""
+
+import asyncio
+import os
+import threading
+
+from src.tools.cache import ToolResultCache, file_mtime
+from src.tools.registry import PythonActionRegistry, register_tool, tools
+
+
+def test_cacheable_tool_runs_once_per_args():
+    """Test repeated calls are served from the cache and defaults share an entry"""
+    calls = []
+
+    @register_tool(tool_name="cache_test_lookup", tags=["cache_test"], cacheable=True)
+    def lookup(action_context, query: str, limit: int = 10) -> str:
+        calls.append((query, limit))
+        return f"{query}:{limit}"
+
+    registry = PythonActionRegistry(tool_names=["cache_test_lookup"])
+    tools.pop("cache_test_lookup")
+    action = registry.get_action("cache_test_lookup")
+    assert action.accepts_action_context
+    assert action.parameters["required"] == ["query"]
+
+    assert action.execute(action_context=None, query="a") == "a:10"
+    assert action.execute(action_context=object(), query="a", limit=10) == "a:10"
+    assert action.execute(action_context=None, query="b") == "b:10"
+    assert calls == [("a", 10), ("b", 10)]
+    assert registry.cache_stats() == {
+        "cache_test_lookup": {"hits": 1, "misses": 2, "invalidations": 0, "entries": 2}
+    }
+
+
+def test_invalidate_hook_discards_stale_results(tmp_path):
+    """Test a changed file mtime forces the tool to run again"""
+    path = tmp_path / "notes.txt"
+    path.write_text("v1")
+
+    def read(name: str) -> str:
+        return path.read_text()
+
+    cached = ToolResultCache(read, version=lambda name: file_mtime(path)).wrap()
+    assert cached("notes") == "v1"
+    path.write_text("version two")
+    os.utime(path, ns=(0, file_mtime(path) + 1_000_000))
+    assert cached("notes") == "version two"
+    assert cached.cache.stats()["invalidations"] == 1
+
+
+def test_lru_eviction_ttl_and_errors():
+    """Test the cache is bounded, expires entries and never stores failures"""
+    calls = []
+
+    def tool(x: int) -> int:
+        calls.append(x)
+        if x < 0:
+            raise ValueError("negative")
+        return x * 2
+
+    cached = ToolResultCache(tool, max_entries=2).wrap()
+    for x in (1, 2, 3, 1):
+        cached(x)
+    assert calls == [1, 2, 3, 1]
+    assert cached.cache.stats()["entries"] == 2
+
+    for _ in range(2):
+        try:
+            cached(-1)
+        except ValueError:
+            pass
+    assert calls.count(-1) == 2
+
+    expiring = ToolResultCache(tool, ttl=-1).wrap()
+    expiring(5)
+    expiring(5)
+    assert calls.count(5) == 2
+
+
+def test_async_tools_and_threads():
+    """Test coroutine tools stay coroutines and the cache is safe across threads"""
+    async def fetch(url: str = None) -> str:
+        return f"page:{url}"
+
+    cached = ToolResultCache(fetch, key=lambda url: url or "default").wrap()
+    assert asyncio.run(cached()) == "page:None"
+    assert asyncio.run(cached(url=None)) == "page:None"
+    assert cached.cache.stats()["hits"] == 1
+
+    counter = ToolResultCache(lambda x: x, max_entries=8).wrap()
+    threads = [threading.Thread(target=lambda: [counter(i % 16) for i in range(500)]) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert counter.cache.stats()["entries"] == 8
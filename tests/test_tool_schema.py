@@ -0,0 +1,81 @@
+"""Tests for type-hint schemas and compiled argument validation"""
+
+import asyncio
+from typing import Annotated, Dict, List, Literal, Optional, Tuple
+
+import pytest
+
+from src.core.environment import Environment
+from src.core.schema import ArgumentError, compile_validator, json_schema
+from src.tools.registry import PythonActionRegistry, register_tool
+
+
+def test_json_schema_from_typing_hints():
+    """Test generic, optional, literal and annotated hints map to accurate schemas"""
+    assert json_schema(List[str]) == {"type": "array", "items": {"type": "string"}}
+    assert json_schema(Optional[int]) == {"type": ["integer", "null"]}
+    assert json_schema(Dict[str, float]) == {"type": "object", "additionalProperties": {"type": "number"}}
+    assert json_schema(Tuple[int, ...]) == {"type": "array", "items": {"type": "integer"}}
+    assert json_schema(Literal["asc", "desc"]) == {"type": "string", "enum": ["asc", "desc"]}
+    assert json_schema(Optional[Literal["a"]]) == {"type": ["string", "null"], "enum": ["a", None]}
+    assert json_schema(Annotated[int, "Page size"]) == {"type": "integer", "description": "Page size"}
+    assert json_schema(list) == {"type": "array"}
+    assert json_schema(object) == {"type": "string"}
+
+
+def test_validator_coerces_and_reports_every_problem():
+    """Test unambiguous values are coerced and all failures come back together"""
+    validate = compile_validator("search", {
+        "type": "object",
+        "properties": {
+            "query": {"type": "string"},
+            "limit": {"type": "integer"},
+            "tags": {"type": "array", "items": {"type": "string"}},
+            "order": {"type": "string", "enum": ["asc", "desc"]},
+            "exact": {"type": ["boolean", "null"]},
+        },
+        "required": ["query"],
+    })
+
+    assert validate({"query": "x", "limit": "5", "tags": '["a", "b"]', "exact": "true"}) == {
+        "query": "x", "limit": 5, "tags": ["a", "b"], "exact": True
+    }
+    assert validate({"query": 7, "exact": None}) == {"query": "7", "exact": None}
+
+    with pytest.raises(ArgumentError) as excinfo:
+        validate({"limit": "many", "tags": ["a", 3.5, {}], "order": "up", "page": 2})
+    assert excinfo.value.errors == {
+        "limit": "expected integer, got 'many'",
+        "tags[2]": "expected string, got {}",
+        "order": 'expected one of "asc", "desc", got \'up\'',
+        "page": "unexpected argument",
+        "query": "missing required argument",
+    }
+
+
+def test_environment_returns_structured_argument_errors():
+    """Test invalid calls skip the tool and return a compact error without a traceback"""
+    calls = []
+
+    @register_tool(tool_name="schema_test_page", tags=["schema_test"])
+    def page(items: List[str], size: int = 10, order: Literal["asc", "desc"] = "asc") -> str:
+        calls.append((items, size, order))
+        return f"{len(items)}:{size}:{order}"
+
+    action = PythonActionRegistry(tool_names=["schema_test_page"]).get_action("schema_test_page")
+    assert action.parameters["properties"]["order"] == {"type": "string", "enum": ["asc", "desc"], "default": "asc"}
+    environment = Environment()
+
+    result = environment.execute_action(action, {"items": ["a", "b"], "size": "3"})
+    assert result["tool_executed"] and result["result"] == "2:3:asc"
+
+    result = asyncio.run(environment.aexecute_action(action, {"items": "a", "order": "random"}))
+    assert result == {
+        "tool_executed": False,
+        "error": "Invalid arguments for schema_test_page",
+        "invalid_arguments": {
+            "items": "expected array, got 'a'",
+            "order": 'expected one of "asc", "desc", got \'random\'',
+        },
+    }
+    assert calls == [(["a", "b"], 3, "asc")]
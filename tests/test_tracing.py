@@ -0,0 +1,71 @@
+"""Tests for agent tracing"""
+
+import json
+
+from src.core.action import Action, ActionRegistry
+from src.core.agent import Agent
+from src.core.agent_registry import AgentRegistry
+from src.core.environment import Environment
+from src.core.language import AgentFunctionCallingActionLanguage, Goal
+from src.core.tracing import InMemoryCollector, JsonlExporter, Tracer, get_tracer, set_tracer, preview
+from src.tools.agent_tools import call_agent
+
+
+def _agent(name, responses, extra_actions=()):
+    registry = ActionRegistry()
+    for action in extra_actions:
+        registry.register(action)
+    registry.register(Action(name="terminate", function=lambda message: message,
+                             description="", parameters={}, terminal=True))
+    replies = iter(responses)
+    return Agent(
+        goals=[Goal(priority=1, name="Test", description="Test goal")],
+        agent_language=AgentFunctionCallingActionLanguage(),
+        action_registry=registry,
+        generate_response=lambda prompt: next(replies),
+        environment=Environment(),
+        name=name,
+    )
+
+
+def test_sub_agent_spans_nest_under_call_agent(tmp_path):
+    """Test a delegated run appears as a child of the parent's tool span"""
+    collector = InMemoryCollector()
+    previous = get_tracer()
+    exporter = JsonlExporter(str(tmp_path / "trace.jsonl"))
+    set_tracer(Tracer([collector, exporter]))
+    try:
+        done = json.dumps({"tool": "terminate", "args": {"message": "ok"}})
+        child = _agent("Child", [done])
+        delegate = Action(
+            name="delegate",
+            function=lambda action_context: call_agent(action_context, "Child", "sub task"),
+            description="", parameters={}, accepts_action_context=True,
+        )
+        parent = _agent("Parent", [json.dumps({"tool": "delegate", "args": {}}), done], [delegate])
+        agents = AgentRegistry()
+        agents.register_agent("Child", child.run)
+
+        parent.run("task", action_context_props={"agent_registry": agents})
+    finally:
+        set_tracer(previous)
+        exporter.close()
+
+    spans = {s.span_id: s for s in collector.get_spans()}
+    child_run = next(s for s in collector.get_spans("agent.run") if s.attributes["agent"] == "Child")
+    call_span = spans[child_run.parent_id]
+    tool_span = spans[call_span.parent_id]
+    assert call_span.name == "call_agent"
+    assert tool_span.name == "tool.execute" and tool_span.attributes["tool"] == "delegate"
+    assert len({s.trace_id for s in spans.values()}) == 1
+    names = {s.name for s in spans.values()}
+    assert {"prompt.construct", "llm.call", "response.parse", "memory.update"} <= names
+
+    lines = (tmp_path / "trace.jsonl").read_text().splitlines()
+    assert len(lines) == len(spans)
+
+
+def test_preview_is_bounded():
+    """Test previews never exceed the limit"""
+    assert len(preview("x" * 10000)) == 200
+    assert len(preview({"result": "x" * 10000, "items": list(range(1000))})) <= 200
@@ -0,0 +1,168 @@
+"""Tests for the vector memory store and relevance-based retention"""
+
+import time
+
+import numpy as np
+
+from memory.embeddings import HashingEmbedder
+from memory.policy import RelevanceRetentionPolicy
+from memory.stores.vector import VectorMemoryStore
+
+
+def test_hashing_embedder_is_deterministic_and_unit_scaled():
+    """Test identical text embeds identically and stored rows have unit length"""
+    embedder = HashingEmbedder(dim=64)
+    first, second = embedder.embed(["Rainfall in Seattle", "rainfall in seattle"])
+    assert np.array_equal(first, second)
+
+    store = VectorMemoryStore(embedder, capacity=1)
+    store.store_many([("a", "rainfall in Seattle"), ("b", {"type": "user", "content": "stock prices"})])
+    assert store.vectors.shape == (2, 64)
+    assert np.allclose(np.linalg.norm(store.vectors, axis=1), 1.0)
+
+
+def test_top_k_ranks_by_similarity_and_tracks_updates():
+    """Test results are ordered by cosine score and follow overwrites and deletes"""
+    store = VectorMemoryStore(HashingEmbedder(dim=512))
+    store.store("weather", "Seattle weather forecast: rain all week")
+    store.store("stocks", "Stock prices fell sharply on Monday")
+    store.store("travel", "Flights to Seattle are delayed by rain")
+
+    assert [key for key, _, _ in store.top_k("rain in Seattle", k=2)] == ["weather", "travel"]
+    assert store.search("stock prices")[0] == {"stocks": "Stock prices fell sharply on Monday"}
+
+    store.store("stocks", "Seattle rain record")
+    store.delete("weather")
+    assert store.retrieve("weather") is None and len(store) == 2
+    assert {key for key, _, _ in store.top_k("Seattle rain", k=5)} == {"stocks", "travel"}
+    batched = store.search_many(["Seattle rain", "flights delayed"], k=1)
+    assert [results[0][0] for results in batched] == ["stocks", "travel"]
+
+
+def test_save_and_reopen_memory_mapped(tmp_path):
+    """Test a saved index reopens as a read-only map and accepts new writes"""
+    store = VectorMemoryStore(HashingEmbedder(dim=32), path=str(tmp_path))
+    store.store_many((f"k{i}", f"note number {i}") for i in range(10))
+    store.save()
+
+    reopened = VectorMemoryStore(HashingEmbedder(dim=32), path=str(tmp_path))
+    assert isinstance(reopened._vectors, np.memmap) and len(reopened) == 10
+    assert reopened.retrieve("k3") == "note number 3"
+    assert np.array_equal(reopened.vectors, store.vectors)
+    reopened.store("k10", "note number 10")
+    assert len(reopened) == 11 and not isinstance(reopened._vectors, np.memmap)
+
+
+def test_interrupted_save_keeps_the_previous_save(tmp_path, monkeypatch):
+    """Test a save that dies before its manifest is written leaves the last save readable"""
+    import os
+
+    store = VectorMemoryStore(HashingEmbedder(dim=32), path=str(tmp_path))
+    store.store_many((f"k{i}", f"note number {i}") for i in range(3))
+    store.save()
+    store.store_many((f"k{i}", f"note number {i}") for i in range(3, 6))
+
+    def crash(src, dst):
+        raise OSError("disk full")
+    monkeypatch.setattr(os, "replace", crash)
+    try:
+        store.save()
+    except OSError:
+        pass
+    monkeypatch.undo()
+
+    reopened = VectorMemoryStore(HashingEmbedder(dim=32), path=str(tmp_path))
+    assert len(reopened) == 3 and reopened.retrieve("k2") == "note number 2"
+
+    store.save()
+    assert len(VectorMemoryStore(HashingEmbedder(dim=32), path=str(tmp_path))) == 6
+    assert len(list(tmp_path.glob("vectors-*.npy"))) == 1 and not list(tmp_path.glob("manifest-*"))
+
+
+def test_search_over_many_items_is_vectorized():
+    """Test a top-k query over 100k stored vectors stays fast"""
+    store = VectorMemoryStore(HashingEmbedder(dim=128), capacity=100_000)
+    rng = np.random.default_rng(0)
+    store._vectors[:] = rng.standard_normal((100_000, 128), dtype=np.float32)
+    store._keys = [str(i) for i in range(100_000)]
+    store._values = list(store._keys)
+    store._rows = {key: i for i, key in enumerate(store._keys)}
+
+    start = time.perf_counter()
+    results = store.top_k("anything at all", k=10)
+    assert time.perf_counter() - start < 0.5
+    scores = [score for _, _, score in results]
+    assert len(results) == 10 and scores == sorted(scores, reverse=True)
+
+
+def test_relevance_policy_keeps_task_recent_and_relevant_items():
+    """Test only the k most relevant older memories are sent, in order"""
+    from core.memory import Memory, MemoryItem
+
+    memory = Memory()
+    memory.add_memory({"type": "user", "content": "Find the population of Richmond"})
+    for i in range(20):
+        memory.add_memory({"type": "environment", "content": f"unrelated result {i}"})
+    memory.items.insert(5, MemoryItem("environment", "Richmond population is 226,610"))
+    memory.add_memory({"type": "assistant", "content": "Checking the population"})
+    memories = memory.get_memories()
+
+    policy = RelevanceRetentionPolicy(k=1, recent=2, embedder=HashingEmbedder(dim=512))
+    selected = policy.apply(memories, memory=memory)
+    assert selected == [memories[0], memories[5], memories[-2], memories[-1]]
+    assert policy.apply(list(memories)) == selected
+
+    memory.add_memory({"type": "environment", "content": "done"})
+    assert policy.apply(memories, memory=memory)[1] == memories[5]
+    assert len(policy._indexes[memory].indexed) == len(memories)
+
+
+def test_relevance_policy_keeps_one_index_per_conversation():
+    """Test concurrent conversations sharing a policy never mix their indexes"""
+    import threading
+    from core.memory import Memory
+
+    policy = RelevanceRetentionPolicy(k=1, recent=1, embedder=HashingEmbedder(dim=4096))
+    conversations, failures = [], []
+    for topic in ["weather", "stocks", "flights", "census"]:
+        memory = Memory()
+        memory.add_memory({"type": "user", "content": f"Report on {topic}"})
+        for _ in range(30):
+            memory.add_memory({"type": "environment", "content": "unrelated filler"})
+        conversations.append((topic, memory))
+
+    def run(topic, memory):
+        for i in range(10):
+            memory.add_memory({"type": "environment", "content": f"{topic} detail {i}"})
+            selected = policy.apply(memory.get_memories(), memory=memory)
+            if (selected[0]["content"] != f"Report on {topic}" or len(selected) != min(i + 2, 3)
+                    or not all(topic in m["content"] for m in selected)):
+                failures.append((topic, i, [m["content"] for m in selected]))
+
+    threads = [threading.Thread(target=run, args=conversation) for conversation in conversations]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert failures == []
+    assert len(policy._indexes) == 4
+    for topic, memory in conversations:
+        assert policy._indexes[memory].indexed == memory.get_memories()
+    del conversations, memory
+    import gc
+    gc.collect()
+    assert len(policy._indexes) == 0
+
+
+def test_memory_items_are_indexed_and_saved_as_objects(tmp_path):
+    """Test a MemoryItem is embedded by its content and persisted as its fields"""
+    from core.memory import MemoryItem
+
+    store = VectorMemoryStore(HashingEmbedder(dim=64), path=str(tmp_path))
+    store.store("m", MemoryItem("user", "census table for Richmond"))
+    assert store.top_k("census table for Richmond", k=1)[0][2] > 0.99
+    store.save()
+    assert VectorMemoryStore(HashingEmbedder(dim=64), path=str(tmp_path)).retrieve("m") == {
+        "type": "user", "content": "census table for Richmond"
+    }